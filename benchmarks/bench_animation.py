@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+# type: ignore
+# benchmarks/bench_animation.py
+"""Cost of putting enemy animation frames on their Actors.
+
+"by name" is the old Enemy._sync_actor. It picks the frame name with an
+if-chain over the enemy state, compares ``(name, direction)`` with the
+last one shown, and then assigns ``actor.image = name`` (a loader lookup
+plus an anchor recompute) or looks the name up in the flip cache.
+"clips" is the current path: a shared AnimationClip picks the frame and
+``show_frame`` assigns its pre-resolved surface and position, past
+``Actor.__setattr__`` (where the old path spends most of its time).
+
+The enemies patrol, chase and die under the real EnemyPool.update. Every
+tick, both paths must put the same surface at the same place on every
+enemy.
+
+    python benchmarks/bench_animation.py
+"""
+import random
+import time
+
+from common import setup_headless
+
+setup_headless()
+
+from pgzero.builtins import Actor
+
+from modules.Animation import show_frame
+from modules.EnemyPool import CHASE, EnemyPool
+from modules.Hero import Hero
+from modules.Sprite import SpriteManager
+
+COUNTS = [10, 100, 1000]
+TICKS = 300
+DT = 1 / 60
+
+
+class Immortal(Hero):
+    """Hero that ignores damage, so it stays alive and in place."""
+
+    __slots__ = ()
+
+    def take_damage(self, amount):
+        pass
+
+
+def legacy_frame_name(pool, i):
+    frame = int(pool.frame_index[i])
+    if pool.is_dead[i]:
+        return pool.DEATH_FRAMES[min(frame, len(pool.DEATH_FRAMES) - 1)]
+    if pool.is_attacking[i]:
+        return pool.ATTACK_FRAMES[min(frame, len(pool.ATTACK_FRAMES) - 1)]
+    if pool.state[i] == CHASE:
+        return pool.RUN_FRAMES[frame % len(pool.RUN_FRAMES)]
+    return pool.IDLE_FRAMES[frame % len(pool.IDLE_FRAMES)]
+
+
+def legacy_sync(pool, i, actor, shown):
+    key = (legacy_frame_name(pool, i), int(pool.direction[i]))
+    if key != shown[i]:
+        shown[i] = key
+        name, direction = key
+        if direction == -1:
+            actor._surf = SpriteManager.flip_image_horizontal(name)
+        else:
+            actor.image = name
+    actor.pos = (float(pool.x[i]), float(pool.y[i]))
+
+
+def clip_sync(pool, i, actor):
+    clip, index = pool.frame(i)
+    show_frame(actor, clip, index, pool.direction.item(i), (pool.x.item(i), pool.y.item(i)))
+
+
+def main():
+    hero = Immortal(800, 522)
+    print("%8s %14s %14s %10s" % ("enemies", "by name ms", "clips ms", "speedup"))
+    for count in COUNTS:
+        rng = random.Random(count)
+        pool = EnemyPool(capacity=count, seed=count)
+        for _ in range(count):
+            i = pool.spawn(rng.uniform(0, 1600), 522, patrol_width=140)
+            pool.detection_radius[i] = 150
+            pool.attack_range[i] = 30
+        old_actors = [Actor("enemy_idle1") for _ in range(count)]
+        new_actors = [Actor("enemy_idle1") for _ in range(count)]
+        shown = [("enemy_idle1", 1)] * count
+
+        old_time = new_time = 0.0
+        for tick in range(TICKS):
+            if tick % 30 == 0:
+                pool.take_damage(rng.randrange(count), 50)
+            pool.update(DT, hero)
+
+            start = time.perf_counter()
+            for i in range(count):
+                legacy_sync(pool, i, old_actors[i], shown)
+            old_time += time.perf_counter() - start
+
+            start = time.perf_counter()
+            for i in range(count):
+                clip_sync(pool, i, new_actors[i])
+            new_time += time.perf_counter() - start
+
+            for i in range(count):
+                old, new = old_actors[i], new_actors[i]
+                same = old._surf is new._surf and old.pos == new.pos
+                assert same, "tick %d enemy %d" % (tick, i)
+        print("%8d %14.3f %14.3f %9.2fx" % (
+            count, old_time / TICKS * 1000, new_time / TICKS * 1000, old_time / new_time))
+    print("both paths showed the same frame at the same place on every enemy, every tick")
+
+
+if __name__ == "__main__":
+    main()
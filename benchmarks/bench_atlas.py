@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+# type: ignore
+# benchmarks/bench_atlas.py
+"""Report pixel allocations and resident memory with and without the atlas.
+
+"separate" loads every frame as its own surface and flips it (the old
+path); "atlas" serves all frames as subsurfaces of the packed sheets. Each
+mode runs in a fresh interpreter. The atlas must show the same pixels and
+hold no more pixel bytes than the loose frames, or the script fails.
+
+"heap delta" is what malloc handed out for the frames (glibc mallinfo2,
+blank elsewhere), and must not grow either. The RSS delta is shown too,
+but it undercounts the loose frames: their small surfaces reuse heap pages
+freed during startup, while the atlas sheets are fresh pages.
+
+    python benchmarks/bench_atlas.py
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from common import ROOT
+
+CHILD = r"""
+import ctypes, json, os, sys, zlib
+sys.path.insert(0, %(bench)r)
+from common import setup_headless
+setup_headless()
+
+import pygame
+from pgzero.builtins import images
+from modules.Sprite import SpriteManager
+
+class MallInfo2(ctypes.Structure):
+    _fields_ = [(name, ctypes.c_size_t) for name in (
+        "arena", "ordblks", "smblks", "hblks", "hblkhd", "usmblks", "fsmblks",
+        "uordblks", "fordblks", "keepcost")]
+
+def heap():
+    try:
+        mallinfo2 = ctypes.CDLL(None).mallinfo2
+    except (OSError, AttributeError):
+        return None
+    mallinfo2.restype = MallInfo2
+    info = mallinfo2()
+    return info.uordblks + info.hblkhd  # in use: heap chunks + mmapped blocks
+
+def rss():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+names = sorted(os.path.splitext(f)[0] for f in os.listdir("images") if f.endswith(".png"))
+before, heap_before = rss(), heap()
+if %(atlas)r:
+    SpriteManager.load_disk_cache(%(cache_path)r)
+    allocations = list(SpriteManager.atlas.sheets)
+else:
+    allocations = [images.load(name) for name in names]
+    allocations += list(SpriteManager.preload_flipped_frames(names).values())
+
+frames = [images.load(n) for n in names] + [SpriteManager._flipped_cache[n] for n in names]
+print(json.dumps({
+    "frames": len(frames),
+    "allocations": len(allocations),
+    "pixel_bytes": sum(s.get_width() * s.get_height() * 4 for s in allocations),
+    "rss_delta": rss() - before,
+    "heap_delta": None if heap_before is None else heap() - heap_before,
+    "checksum": sum(zlib.crc32(pygame.image.tobytes(s, "RGBA")) for s in frames),
+}))
+"""
+
+
+def run_child(atlas, cache_path):
+    code = CHILD % {
+        "bench": os.path.dirname(os.path.abspath(__file__)),
+        "atlas": atlas,
+        "cache_path": cache_path,
+    }
+    out = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT,
+        capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_path = os.path.join(tmp, "sprites.bin")
+        separate = run_child(False, cache_path)
+        run_child(True, cache_path)  # build the cache file
+        atlas = run_child(True, cache_path)
+
+    assert separate["checksum"] == atlas["checksum"], "atlas frames differ from the PNGs"
+    assert atlas["pixel_bytes"] <= separate["pixel_bytes"], "atlas sheets hold slack pixels"
+    if atlas["heap_delta"] is not None:
+        assert atlas["heap_delta"] <= separate["heap_delta"], "atlas allocates more than the PNGs"
+    print("%-10s %8s %12s %14s %12s %12s" % (
+        "", "frames", "allocations", "pixel bytes", "heap delta", "RSS delta"))
+    for label, row in (("separate", separate), ("atlas", atlas)):
+        heap = "" if row["heap_delta"] is None else row["heap_delta"]
+        print("%-10s %8d %12d %14d %12s %12d" % (
+            label, row["frames"], row["allocations"], row["pixel_bytes"], heap, row["rss_delta"],
+        ))
+
+
+if __name__ == "__main__":
+    main()
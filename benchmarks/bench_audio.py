@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+# type: ignore
+# benchmarks/bench_audio.py
+"""Sound effect triggering: queued AudioEngine vs calling Sound.play in the frame.
+
+Reported:
+
+* game-thread cost per trigger: ``AudioEngine.play`` (a queue put) vs
+  ``Sound.play`` on Pygame Zero's default mixer;
+* trigger-to-submit latency on the audio thread, over 120 frames with a
+  burst of effects each, plus how many requests were rate limited,
+  stole a voice or were dropped;
+* mixer buffer latency (buffer / frequency) of both mixer setups;
+* voice stealing: with every channel busy, a higher priority effect must
+  take a channel and a lower priority one must be dropped.
+
+Uses the dummy SDL audio driver, so it runs anywhere; on real hardware,
+add the device's own output latency.
+
+    python benchmarks/bench_audio.py
+"""
+import os
+import time
+
+from common import ROOT, setup_headless
+
+setup_headless()
+
+import pygame
+
+from modules.Audio import AudioEngine
+
+TRIGGERS = 2000
+FRAMES = 120
+PGZERO_MIXER = (22050, 512)  # Pygame Zero's pre_init frequency, SDL's default buffer
+
+
+def direct_cost():
+    pygame.mixer.quit()
+    pygame.mixer.init(PGZERO_MIXER[0], -16, 2, PGZERO_MIXER[1])
+    sound = pygame.mixer.Sound(os.path.join(ROOT, "sounds", "attack.wav"))
+    total = 0.0
+    for _ in range(TRIGGERS):
+        pygame.mixer.stop()  # a free channel each time, as in the game
+        start = time.perf_counter()
+        sound.play()
+        total += time.perf_counter() - start
+    return total / TRIGGERS
+
+
+def main():
+    direct = direct_cost()
+
+    audio = AudioEngine(channels=8, buffer=256).start()
+    audio.wait_loaded()
+    assert audio.enabled, "no mixer"
+    start = time.perf_counter()
+    for _ in range(TRIGGERS):
+        audio.play("attack")
+    queued = (time.perf_counter() - start) / TRIGGERS
+    time.sleep(0.2)  # let the audio thread drain the queue
+
+    print("game-thread cost per trigger: Sound.play %.2f us, AudioEngine.play %.2f us" % (
+        direct * 1e6, queued * 1e6))
+    print("mixer buffer latency: default %.1f ms, engine %.1f ms" % (
+        PGZERO_MIXER[1] / PGZERO_MIXER[0] * 1000, audio.buffer / audio.frequency * 1000))
+
+    # a game-like pattern: a few effects per frame, sometimes a burst
+    audio.latencies.clear()
+    audio.played = audio.rate_limited = audio.stolen = audio.dropped = 0
+    for frame in range(FRAMES):
+        for _ in range(20 if frame % 30 == 0 else 2):
+            audio.play("attack" if frame % 2 else "jump")
+        time.sleep(1 / 60)
+    time.sleep(0.1)
+    mean, p99, peak = audio.latency_stats()
+    print("trigger -> submit: mean %.3f ms, p99 %.3f ms, max %.3f ms" % (mean, p99, peak))
+    print("played %d, rate limited %d, stolen %d, dropped %d" % (
+        audio.played, audio.rate_limited, audio.stolen, audio.dropped))
+    audio.stop()
+
+    # voice stealing: fill every channel with low priority voices
+    table = {"jump": (1, 0.0, 1.0), "attack": (2, 0.0, 1.0)}
+    audio = AudioEngine(channels=4, buffer=256, effects=table).start()
+    audio.wait_loaded()
+    for _ in range(4):
+        audio._submit("jump", time.perf_counter())
+    audio._submit("attack", time.perf_counter())
+    assert audio.stolen == 1 and audio.played == 5, "attack did not steal a jump voice"
+    for _ in range(3):
+        audio._submit("attack", time.perf_counter())  # every channel now plays an attack
+    audio._submit("jump", time.perf_counter())
+    assert audio.dropped == 1, "jump should not steal an attack voice"
+    audio.stop()
+    print("voice stealing: higher priority steals, lower priority is dropped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+# type: ignore
+# benchmarks/bench_batch.py
+"""Batch runner throughput: warm workers vs a fresh process per game.
+
+The same games (hunt policy, a few balancing parameter sets) are played in
+two ways:
+
+* "warm": modules.Batch's BatchRunner, where each worker loads pygame, the
+  sprites and the level once and then plays game after game;
+* "cold": a pool whose workers exit after one game
+  (``maxtasksperchild=1``), so every game pays the startup again.
+
+Both must produce the same outcome, frame count and damage for every
+game, because a game depends only on its seed and parameters.
+
+    python benchmarks/bench_batch.py
+"""
+import multiprocessing
+import sys
+import time
+
+from common import ROOT
+
+sys.path.insert(0, ROOT)  # pygame itself is only loaded in the workers
+
+from modules.Batch import BatchRunner, make_tasks, parameter_sets, simulate, warm_up
+
+RUNS = 6
+FRAMES = 3600
+
+
+def key(result):
+    return (tuple(sorted(result["params"].items())), result["seed"])
+
+
+def cold(tasks, workers):
+    start = time.perf_counter()
+    with multiprocessing.Pool(workers, initializer=warm_up, maxtasksperchild=1) as pool:
+        results = pool.map(simulate, tasks, chunksize=1)
+        pool.close()
+        pool.join()
+    return results, time.perf_counter() - start
+
+
+def main():
+    sets = parameter_sets(["enemy_attack_damage=5,10", "hero_jump_strength=-800,-900"])
+    tasks = make_tasks(sets, RUNS, "hunt", FRAMES)
+    runner = BatchRunner()
+    wall = runner.run(tasks)
+    frames = sum(r["frames"] for r in runner.results)
+    overall, per_core = runner.throughput(wall)
+    startup = sum(r["worker_startup"] for r in runner.results) / len(runner.results)
+
+    cold_results, cold_wall = cold(tasks, runner.workers)
+    print("%d games, %d frames, %d workers (warm-up %.2f s each)" % (
+        len(tasks), frames, runner.workers, startup))
+    print("%-6s %10s %14s %18s" % ("pool", "wall s", "games/s", "frames/s overall"))
+    print("%-6s %10.2f %14.1f %18.0f" % ("warm", wall, len(tasks) / wall, overall))
+    print("%-6s %10.2f %14.1f %18.0f" % ("cold", cold_wall, len(tasks) / cold_wall,
+                                         frames / cold_wall))
+    print("simulated frames/s per core (task CPU time): %.0f" % per_core)
+
+    fields = ("outcome", "frames", "score", "damage_taken")
+    warm = {key(r): tuple(r[f] for f in fields) for r in runner.results}
+    mismatches = [key(r) for r in cold_results if warm[key(r)] != tuple(r[f] for f in fields)]
+    assert not mismatches, "games differ between the warm and cold pools: %s" % (mismatches,)
+    print("same result for every game in both pools")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+# type: ignore
+# benchmarks/bench_blits.py
+"""Sprite drawing: one call per sprite vs one ``blits`` per layer.
+
+N enemies and N / 4 projectiles are on screen, with the hero, while the
+enemies patrol, chase and attack. Every frame is drawn in two ways, in the
+same layer order (enemies, hero, projectiles):
+
+* "per sprite": ``Enemy.draw`` (Actor.draw), the hero's
+  ``draw_interpolated`` and ``Projectile.draw`` (``filled_rect``) for each
+  one, as draw_game did;
+* "batched": ``EnemyPool.sprites``, ``Hero.queue`` and ``Renderer.flush``,
+  as draw_game does now.
+
+Frames are drawn between two ticks (alpha 0.5) with a camera offset, and
+both screens must be pixel-identical after every frame.
+
+    python benchmarks/bench_blits.py
+"""
+import random
+import time
+
+from common import setup_headless
+
+setup_headless()
+
+import pygame
+from pgzero import game
+from pgzero.screen import Screen
+
+from modules.Enemy import Enemy
+from modules.EnemyPool import EnemyPool
+from modules.Hero import Hero
+from modules.Renderer import Renderer
+from modules.Scheduler import draw_interpolated
+
+WIDTH, HEIGHT = 800, 600
+COUNTS = [10, 100, 1000]
+FRAMES = 200
+ALPHA = 0.5
+OFFSET = (-37, 0)  # world to screen: the camera is 37 px into the level
+BACKGROUND = (40, 30, 60)
+
+
+class Immortal(Hero):
+    """Hero that ignores damage, so it stays alive and in place."""
+
+    __slots__ = ()
+
+    def take_damage(self, amount):
+        pass
+
+
+def make_scene(count):
+    rng = random.Random(count)
+    pool = EnemyPool(capacity=count, seed=count)
+    enemies = [Enemy(rng.uniform(0, WIDTH), rng.choice([522, 462, 402]), patrol_width=160, pool=pool)
+               for _ in range(count)]
+    for i in range(count):
+        pool.detection_radius[i] = 150
+        pool.attack_range[i] = 30
+    hero = Immortal(WIDTH // 2, 522)
+    hero.projectiles = type(hero.projectiles)(capacity=max(1, count // 4))
+    for _ in range(count // 4):
+        hero.projectiles.spawn(rng.uniform(0, WIDTH), rng.uniform(380, 520), rng.choice([-1, 1]))
+    return pool, enemies, hero
+
+
+def tick(pool, hero, dt=1 / 60):
+    pool.update(dt, hero)
+    hero.prev_pos = hero.actor.pos
+    hero.actor.x += 2
+    for proj in hero.projectiles:
+        proj.prev_x = proj.x
+        proj.x = (proj.x + 10 * proj.direction) % WIDTH
+        proj.rect.x = round(proj.x)
+
+
+def per_sprite(screen, renderer, enemies, hero):
+    renderer.begin(screen.surface)
+    for enemy in enemies:
+        if not enemy.is_dead:
+            renderer.mark(enemy.draw(ALPHA, OFFSET))
+    renderer.mark(draw_interpolated(hero.actor, hero.prev_pos, ALPHA, OFFSET))
+    for proj in hero.projectiles:
+        renderer.mark(proj.draw(screen, ALPHA, OFFSET))
+    renderer.end()
+
+
+def batched(screen, renderer, pool, hero):
+    renderer.begin(screen.surface)
+    renderer.queue_many("enemies", pool.sprites(range(pool.count), ALPHA, OFFSET))
+    hero.queue(renderer, ALPHA, OFFSET)
+    renderer.flush(screen.surface)
+    renderer.end()
+
+
+def main():
+    pygame.display.set_mode((WIDTH, HEIGHT))
+    static = pygame.Surface((WIDTH, HEIGHT)).convert()
+    static.fill(BACKGROUND)
+    print("%8s %12s %16s %12s %9s" % ("enemies", "projectiles", "per sprite ms", "batched ms",
+                                      "speedup"))
+    for count in COUNTS:
+        pool, enemies, hero = make_scene(count)
+        screens, renderers = [], []
+        for _ in range(2):
+            screens.append(Screen(pygame.Surface((WIDTH, HEIGHT)).convert()))
+            renderer = Renderer((WIDTH, HEIGHT))
+            renderer.set_static(static, (0, 0), [], BACKGROUND)
+            renderers.append(renderer)
+        slow = fast = 0.0
+        for frame in range(FRAMES):
+            tick(pool, hero)
+
+            game.screen = screens[0]
+            start = time.perf_counter()
+            per_sprite(screens[0], renderers[0], enemies, hero)
+            slow += time.perf_counter() - start
+
+            game.screen = screens[1]
+            start = time.perf_counter()
+            batched(screens[1], renderers[1], pool, hero)
+            fast += time.perf_counter() - start
+
+            assert (pygame.image.tobytes(screens[0].surface, "RGB")
+                    == pygame.image.tobytes(screens[1].surface, "RGB")), \
+                "%d enemies: frame %d differs" % (count, frame)
+        print("%8d %12d %16.3f %12.3f %8.1fx" % (
+            count, len(hero.projectiles), slow / FRAMES * 1000, fast / FRAMES * 1000, slow / fast))
+    print("every frame pixel-identical")
+
+
+if __name__ == "__main__":
+    main()
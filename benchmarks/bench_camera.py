@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+# type: ignore
+# benchmarks/bench_camera.py
+"""Frame cost vs level length: camera culling and enemy sleeping.
+
+Random levels of growing length are loaded whole (every chunk active, so
+the world holds the entire level). The hero starts mid-level and runs,
+jumps and shoots under scripted input while a Camera follows it. Per
+frame, ``World.step`` plus drawing is timed in two modes:
+
+* "everything": every enemy is awake and the renderer is given every
+  platform and enemy, as draw_game did before the camera;
+* "culled": enemies far from the hero sleep and only platforms and
+  enemies in the camera area are drawn (what main.py does).
+
+With culling the frame cost stays flat as the level grows. After every
+culled frame the screen must match a full repaint of everything at the
+same camera position, so culling never drops something visible.
+
+    python benchmarks/bench_camera.py
+"""
+import os
+import tempfile
+import time
+
+from common import setup_headless
+
+setup_headless()
+
+import pygame
+from pgzero import game
+from pgzero.builtins import Actor
+from pgzero.screen import Screen
+from pygame import Rect
+
+from modules.Camera import Camera
+from modules.Input import Controls
+from modules.Level import generate_level
+from modules.Renderer import Renderer
+from modules.Scheduler import lerp
+from modules.World import World
+
+WIDTH, HEIGHT = 800, 600
+COLOR = (109, 83, 166)
+SCREENS = (1, 30, 150)
+FRAMES = 600
+
+
+def script(frame):
+    phase = (frame // 120) % 4
+    return Controls(left=phase == 2, right=phase != 2, jump=frame % 70 == 0,
+                    attack=frame % 45 == 0)
+
+
+def draw_everything(world, screen, camera, renderer, sky, ground):
+    offset = camera.offset
+    static = [camera.to_screen(ground)] + [camera.to_screen(rect) for rect in world.platforms]
+    renderer.set_static(sky._surf, sky.topleft, static, COLOR)
+    renderer.begin(screen.surface)
+    drawn = 0
+    for rect in world.hero.draw(screen, 1.0, offset):
+        renderer.mark(rect)
+    for enemy in world.enemies:
+        if not enemy.is_dead:
+            renderer.mark(enemy.draw(1.0, offset))
+            drawn += 1
+    renderer.end()
+    return drawn
+
+
+def draw_culled(world, screen, camera, renderer, sky, ground):
+    area = camera.area
+    offset = camera.offset
+    static = [camera.to_screen(ground.clip(area))]
+    static += [camera.to_screen(rect) for rect in world.platform_grid.query(area)]
+    renderer.set_static(sky._surf, sky.topleft, static, COLOR)
+    renderer.begin(screen.surface)
+    drawn = 0
+    for rect in world.hero.draw(screen, 1.0, offset):
+        renderer.mark(rect)
+    for enemy in world.enemy_grid.query(area):
+        if not enemy.is_dead:
+            renderer.mark(enemy.draw(1.0, offset))
+            drawn += 1
+    renderer.end()
+    return drawn
+
+
+def run(path, screens, culled, screen, sky):
+    World.ACTIVE_RADIUS = screens  # the whole level is in the world
+    world = World(level_path=path)
+    if not culled:
+        world.enemy_pool.wake_distance = None
+    world.game_state = "playing"
+    hero = world.hero
+    hero.health = 10 ** 9
+    world.score_to_win = 10 ** 9
+    hero.actor.x = world.width // 2
+    hero.prev_pos = hero.actor.pos
+    ground = Rect(0, world.ground_y, world.width, HEIGHT - world.ground_y)
+    camera = Camera((WIDTH, HEIGHT), world.width)
+    renderer = Renderer((WIDTH, HEIGHT))
+    draw = draw_culled if culled else draw_everything
+    reference = Renderer((WIDTH, HEIGHT))
+
+    times, drawn, awake, mismatches = [], 0, 0, 0
+    for i in range(FRAMES):
+        start = time.perf_counter()
+        world.step(script(i))
+        camera.follow(lerp(hero.prev_pos[0], hero.actor.x, 1.0))
+        drawn = max(drawn, draw(world, screen, camera, renderer, sky, ground))
+        times.append(time.perf_counter() - start)
+
+        pool = world.enemy_pool
+        awake = max(awake, int((abs(pool.x[:pool.count] - hero.actor.x)
+                                <= (pool.wake_distance or float("inf"))).sum()))
+        if culled:
+            shown = screen.surface.copy()
+            reference.invalidate()
+            draw_everything(world, screen, camera, reference, sky, ground)
+            if pygame.image.tobytes(shown, "RGB") != pygame.image.tobytes(screen.surface, "RGB"):
+                mismatches += 1
+            screen.surface.blit(shown, (0, 0))
+    times.sort()
+    return (sum(times) / len(times), times[int(len(times) * 0.99)], len(world.enemies),
+            drawn, awake, mismatches)
+
+
+def main():
+    surface = pygame.display.set_mode((WIDTH, HEIGHT))
+    screen = Screen(surface)
+    game.screen = screen
+    sky = Actor("background", (WIDTH // 2, HEIGHT // 2))
+    default_radius = World.ACTIVE_RADIUS
+    print("%-8s %-11s %10s %10s %8s %7s %6s" % (
+        "screens", "mode", "mean ms", "p99 ms", "enemies", "drawn", "awake"))
+    with tempfile.TemporaryDirectory() as tmp:
+        for screens in SCREENS:
+            path = os.path.join(tmp, "level%d.lvl" % screens)
+            generate_level(path, screens, seed=1)
+            for label, culled in (("everything", False), ("culled", True)):
+                mean, p99, enemies, drawn, awake, mismatches = run(path, screens, culled, screen, sky)
+                print("%-8d %-11s %10.3f %10.3f %8d %7d %6d" % (
+                    screens, label, mean * 1000, p99 * 1000, enemies, drawn, awake))
+                assert not mismatches, "%d screens, %s: %d frames differ from a full repaint" % (
+                    screens, label, mismatches)
+    World.ACTIVE_RADIUS = default_radius
+    print("culled frames match a full repaint")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+# type: ignore
+# benchmarks/bench_collisions.py
+"""Projectile/enemy collision cost: brute force vs the SpatialHash broad phase.
+
+Enemies and projectiles are scattered over a level that grows with the
+enemy count (about 5 enemies per 800 px screen, like the shipped level).
+Each frame every enemy moves a little, the grid is updated incrementally
+and every projectile is tested against its candidates. Both methods must
+find the same hits.
+
+    python benchmarks/bench_collisions.py
+"""
+import random
+
+from common import setup_headless, timeit
+
+setup_headless()
+
+from modules.Enemy import Enemy
+from modules.EnemyPool import EnemyPool
+from modules.Projectile import Projectile
+from modules.SpatialHash import SpatialHash
+
+SIZES = [(5, 5), (100, 100), (1000, 1000), (5000, 2000)]
+
+
+def make_scene(n_enemies, n_projectiles, seed=0):
+    rng = random.Random(seed)
+    width = 800 * max(1, n_enemies // 5)
+    pool = EnemyPool(capacity=n_enemies)
+    enemies = [Enemy(rng.uniform(0, width), rng.uniform(100, 515), pool=pool)
+               for _ in range(n_enemies)]
+    projectiles = [
+        Projectile(rng.uniform(0, width), rng.uniform(100, 515), rng.choice([-1, 1]))
+        for _ in range(n_projectiles)
+    ]
+    return enemies, projectiles
+
+
+def jitter(enemies, frame):
+    step = 3 if frame % 2 else -3
+    for enemy in enemies:
+        enemy.x += step
+
+
+def brute_force(enemies, projectiles):
+    hits = 0
+    for proj in projectiles:
+        for enemy in enemies:
+            if enemy.actor.colliderect(proj.rect):
+                hits += 1
+    return hits
+
+
+def broad_phase(grid, enemies, projectiles):
+    for enemy in enemies:
+        grid.update(enemy, enemy.actor)
+    hits = 0
+    for proj in projectiles:
+        for enemy in grid.query(proj.rect):
+            if enemy.actor.colliderect(proj.rect):
+                hits += 1
+    return hits
+
+
+def main():
+    print("%8s %12s %14s %14s %16s" % (
+        "enemies", "projectiles", "brute ms/frame", "grid ms/frame", "grid us/entity"))
+    for n_enemies, n_projectiles in SIZES:
+        enemies, projectiles = make_scene(n_enemies, n_projectiles)
+        grid = SpatialHash()
+        for enemy in enemies:
+            grid.insert(enemy, enemy.actor)
+
+        frame = [0]
+
+        def run(method):
+            def go():
+                frame[0] += 1
+                jitter(enemies, frame[0])
+                if method is brute_force:
+                    return brute_force(enemies, projectiles)
+                return broad_phase(grid, enemies, projectiles)
+            return go
+
+        assert brute_force(enemies, projectiles) == broad_phase(grid, enemies, projectiles)
+
+        repeat = 1 if n_enemies * n_projectiles > 10 ** 6 else 5
+        brute = timeit(run(brute_force), repeat)
+        broad = timeit(run(broad_phase), 5)
+        per_entity = broad * 1e6 / (n_enemies + n_projectiles)
+        print("%8d %12d %14.3f %14.3f %16.2f" % (
+            n_enemies, n_projectiles, brute * 1000, broad * 1000, per_entity))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+# type: ignore
+# benchmarks/bench_enemies.py
+"""Enemy update cost: one vectorized EnemyPool step vs a per-enemy loop.
+
+The per-enemy loop is a scalar port of the original Enemy.update working on
+the same pool arrays. Both run from identical copies of a level and must
+end in the same state before timings are reported.
+
+    python benchmarks/bench_enemies.py
+"""
+import random
+
+import numpy as np
+
+from common import setup_headless, timeit
+
+setup_headless()
+
+from modules.EnemyPool import ATTACK, CHASE, PATROL, EnemyPool
+from modules.Hero import Hero
+
+COUNTS = [10, 100, 1000, 10000, 100000]
+DT = 1 / 60
+
+
+def scalar_update(pool, i, dt, hero):
+    """The original Enemy.update, one enemy at a time."""
+    pool.prev_x[i], pool.prev_y[i] = pool.x[i], pool.y[i]
+    if pool.is_dead[i]:
+        pool.anim_timer[i] += dt
+        if pool.frame_index[i] < len(pool.DEATH_FRAMES) - 1 and pool.anim_timer[i] >= pool.frame_delay:
+            pool.anim_timer[i] = 0
+            pool.frame_index[i] += 1
+        return
+
+    pool.since_attack[i] += dt
+    pool.vel_y[i] += pool.gravity * dt
+    pool.y[i] += pool.vel_y[i] * dt
+    if pool.y[i] >= pool.ground_y[i]:
+        pool.y[i] = pool.ground_y[i]
+        pool.vel_y[i] = 0
+        pool.on_ground[i] = True
+    else:
+        pool.on_ground[i] = False
+
+    dist_to_hero = abs(pool.x[i] - hero.actor.x)
+    dist_y = abs(pool.y[i] - hero.actor.y)
+    same_height = dist_y <= 20
+
+    def loop(length):
+        pool.anim_timer[i] += dt
+        if pool.anim_timer[i] >= pool.frame_delay:
+            pool.anim_timer[i] = 0
+            pool.frame_index[i] = (pool.frame_index[i] + 1) % length
+
+    if pool.is_attacking[i]:
+        pool.anim_timer[i] += dt
+        if pool.anim_timer[i] >= pool.frame_delay:
+            pool.anim_timer[i] = 0
+            pool.frame_index[i] += 1
+            if pool.frame_index[i] >= len(pool.ATTACK_FRAMES):
+                pool.is_attacking[i] = False
+                pool.state[i] = PATROL
+                pool.frame_index[i] = 0
+                return
+        if not pool.has_damaged[i] and 2 < pool.frame_index[i] < 4:
+            if dist_to_hero <= pool.attack_range[i] and dist_y < 50:
+                hero.take_damage(int(pool.attack_damage[i]))
+                pool.has_damaged[i] = True
+        return
+
+    if dist_to_hero <= pool.attack_range[i] and same_height and not hero.is_dead:
+        pool.state[i] = ATTACK
+        if pool.since_attack[i] >= pool.attack_cooldown[i]:
+            pool.since_attack[i] = 0
+            pool.is_attacking[i] = True
+            pool.has_damaged[i] = False
+            pool.frame_index[i] = 0
+            pool.anim_timer[i] = 0
+    elif dist_to_hero <= pool.detection_radius[i] and same_height and not hero.is_dead:
+        pool.state[i] = CHASE
+        pool.direction[i] = -1 if hero.actor.x < pool.x[i] else 1
+        pool.x[i] += pool.direction[i] * pool.speed[i] * 1.2 * dt
+        loop(len(pool.RUN_FRAMES))
+    else:
+        pool.state[i] = PATROL
+        pool.x[i] += pool.direction[i] * pool.speed[i] * dt
+        if pool.x[i] < pool.patrol_min_x[i]:
+            pool.x[i] = pool.patrol_min_x[i]
+            pool.direction[i] = 1
+        elif pool.x[i] > pool.patrol_max_x[i]:
+            pool.x[i] = pool.patrol_max_x[i]
+            pool.direction[i] = -1
+        loop(len(pool.IDLE_FRAMES))
+
+
+def make_pool(count, seed=0):
+    rng = random.Random(seed)
+    pool = EnemyPool(capacity=count, seed=seed)
+    for _ in range(count):
+        pool.spawn(rng.uniform(0, 1600), 522 + rng.choice([0, 0, 0, -60]), patrol_width=140)
+        pool.detection_radius[pool.count - 1] = 150
+        pool.attack_range[pool.count - 1] = 30
+    return pool
+
+
+class Dummy:
+    """Stand-in hero that never dies, so the check is independent of order."""
+
+    def __init__(self, hero):
+        self.actor = hero.actor
+        self.is_dead = False
+        self.hits = 0
+
+    def take_damage(self, amount):
+        self.hits += amount
+
+
+def main():
+    hero = Dummy(Hero(800, 522))
+
+    # same end state after 300 ticks
+    vec, ref = make_pool(500), make_pool(500)
+    for _ in range(300):
+        vec.update(DT, hero)
+        for i in range(ref.count):
+            scalar_update(ref, i, DT, hero)
+    for name in EnemyPool.FIELDS:
+        a, b = getattr(vec, name)[:vec.count], getattr(ref, name)[:ref.count]
+        assert np.allclose(a, b), "vectorized update differs from the scalar one in %s" % name
+    print("equivalence: 500 enemies x 300 ticks identical")
+
+    print("%8s %16s %16s %14s" % ("enemies", "per-enemy ms", "vectorized ms", "us/enemy"))
+    for count in COUNTS:
+        pool = make_pool(count)
+        vectorized = timeit(lambda: pool.update(DT, hero))
+        if count <= 10000:
+            loop_pool = make_pool(count)
+            per_enemy = timeit(lambda: [scalar_update(loop_pool, i, DT, hero)
+                                        for i in range(loop_pool.count)], repeat=2)
+            per_enemy = "%16.3f" % (per_enemy * 1000)
+        else:
+            per_enemy = "%16s" % "-"
+        print("%8d %s %16.3f %14.3f" % (count, per_enemy, vectorized * 1000,
+                                         vectorized * 1e6 / count))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+# type: ignore
+# benchmarks/bench_flip.py
+"""Time the native sprite flip against the old per-pixel loop.
+
+Every shipped hero_*/enemy_* frame is flipped with both implementations.
+That both give the same pixels is checked in tests/test_sprite.py.
+
+    python benchmarks/bench_flip.py
+"""
+import glob
+import os
+
+from common import ROOT, setup_headless, timeit
+
+setup_headless()
+
+from pgzero.builtins import images
+from modules.Sprite import SpriteManager
+
+
+def legacy_flip(surface):
+    """The original SpriteManager loop: one get_at/set_at per pixel."""
+    width = surface.get_width()
+    height = surface.get_height()
+    flipped_surface = surface.copy()
+    for x in range(width):
+        for y in range(height):
+            mirrored_x = width - 1 - x
+            color = surface.get_at((mirrored_x, y))
+            flipped_surface.set_at((x, y), color)
+    return flipped_surface
+
+
+def frame_names():
+    paths = glob.glob(os.path.join(ROOT, "images", "hero_*.png"))
+    paths += glob.glob(os.path.join(ROOT, "images", "enemy_*.png"))
+    return sorted(os.path.splitext(os.path.basename(p))[0] for p in paths)
+
+
+def main():
+    frames = frame_names()
+    surfaces = [images.load(name) for name in frames]
+
+    def run_legacy():
+        for surface in surfaces:
+            legacy_flip(surface)
+
+    def run_batch():
+        SpriteManager._flipped_cache.clear()
+        SpriteManager.preload_flipped_frames(frames)
+
+    legacy = timeit(run_legacy, repeat=3)
+    batch = timeit(run_batch)
+    print("per-pixel loop : %8.2f ms" % (legacy * 1000))
+    print("batched flip   : %8.2f ms" % (batch * 1000))
+    print("speedup        : %8.0fx" % (legacy / batch))
+
+
+if __name__ == "__main__":
+    main()
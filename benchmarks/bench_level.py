@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+# type: ignore
+# benchmarks/bench_level.py
+"""Streaming a long level: memory and frame cost vs loading it whole.
+
+A random level SCREENS screens wide is written to a temporary file. The
+hero is moved FAST px per tick from one end to the other (a fast scan, so
+every chunk is streamed in and out). "streamed" is the World default
+(active chunks around the hero, the next ones read ahead on a thread);
+"whole level" makes every chunk active at once, like a loader without
+chunks. Reported: time to build the World, p99 and mean tick, entities
+in the world, and traced heap at the end of the scan (from a second,
+traced run, so tracing does not skew the timings).
+
+    python benchmarks/bench_level.py
+"""
+import os
+import tempfile
+import time
+import tracemalloc
+
+from common import setup_headless
+
+setup_headless()
+
+from modules.Input import NO_INPUT
+from modules.Level import generate_level
+from modules.World import World
+
+SCREENS = 300
+FAST = 40
+
+
+def scan(path, radius, trace=False):
+    if trace:
+        tracemalloc.start()
+    start = time.perf_counter()
+    World.ACTIVE_RADIUS = radius
+    world = World(level_path=path)
+    build = time.perf_counter() - start
+    world.game_state = "playing"
+    world.hero.health = 10 ** 9
+    world.score_to_win = 10 ** 9
+
+    ticks = []
+    entities = 0
+    x = 40
+    while x < world.width - 40:
+        x += FAST
+        world.hero.actor.x = x
+        start = time.perf_counter()
+        world.step(NO_INPUT)
+        ticks.append(time.perf_counter() - start)
+        entities = max(entities, len(world.enemies) + len(world.platforms))
+    heap = 0
+    if trace:
+        heap = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+    ticks.sort()
+    return build, ticks[int(len(ticks) * 0.99)], sum(ticks) / len(ticks), entities, heap
+
+
+def main():
+    default_radius = World.ACTIVE_RADIUS
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "long.lvl")
+        generate_level(path, SCREENS, seed=1)
+        print("%d screens, %d bytes on disk" % (SCREENS, os.path.getsize(path)))
+        print("%-12s %10s %12s %12s %9s %10s" % (
+            "", "build ms", "p99 tick", "mean tick", "entities", "heap KiB"))
+        for label, radius in (("streamed", default_radius), ("whole level", SCREENS)):
+            build, p99, mean, entities, _ = scan(path, radius)
+            heap = scan(path, radius, trace=True)[-1]
+            print("%-12s %10.2f %9.3f ms %9.3f ms %9d %10d" % (
+                label, build * 1000, p99 * 1000, mean * 1000, entities, heap // 1024))
+    World.ACTIVE_RADIUS = default_radius
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+# type: ignore
+# benchmarks/bench_memory.py
+"""Memory per enemy and per hero, before and after compact entities.
+
+Bytes are measured with tracemalloc around the creation of N entities:
+
+* enemies, in one EnemyPool: "before" is the previous Enemy layout (an
+  instance ``__dict__`` and an Actor made and synced for every enemy),
+  "after" is Enemy as it is now (``__slots__``, Actor made on first use).
+  The pool's arrays are the same for both and are reported apart;
+* heroes, as VecEnv makes one per instance: "before" is a hero with an
+  instance ``__dict__`` and all 64 projectile slots made up front, "after"
+  is Hero as it is now (``__slots__``, projectiles made on demand).
+
+Use the per-enemy totals to size spawn-heavy levels.
+
+    python benchmarks/bench_memory.py
+"""
+import gc
+import random
+import tracemalloc
+from types import SimpleNamespace
+
+from common import setup_headless
+
+setup_headless()
+
+from pgzero.builtins import Actor
+
+from modules.Animation import show_frame
+from modules.Enemy import Enemy
+from modules.EnemyPool import EnemyPool
+from modules.Hero import Hero
+from modules.ProjectilePool import ProjectilePool
+
+ENEMY_COUNTS = [10000, 100000]
+HERO_COUNT = 1000
+
+
+class LegacyEnemy:
+    """Enemy before __slots__: the same fields in a __dict__, and an Actor each."""
+
+    def __init__(self, x, y, patrol_width=200, pool=None, owner=0):
+        self.pool = pool
+        self.index = pool.spawn(x, y, patrol_width, owner)
+        pool.views.append(self)
+        self.spawn = None
+        self._actor = Actor("enemy_idle1", (x, y))
+        clip, index = pool.frame(self.index)
+        show_frame(self._actor, clip, index, int(pool.direction[self.index]))
+        self._actor.pos = (float(pool.x[self.index]), float(pool.y[self.index]))
+
+
+def legacy_hero(x, y):
+    """A hero with its state in a __dict__ and every projectile slot made up front."""
+    hero = Hero(x, y)
+    legacy = SimpleNamespace(**{name: getattr(hero, name) for name in Hero.__slots__})
+    legacy.projectiles = projectiles = ProjectilePool()
+    for _ in range(projectiles.capacity):
+        projectiles.spawn(0, 0, 1)
+    projectiles.clear()
+    return legacy
+
+
+def measure(make):
+    """Bytes still allocated after ``make()``, and what it returned."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    made = make()
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return used, made
+
+
+def enemies(cls, count):
+    def make():
+        rng = random.Random(count)
+        pool = EnemyPool(capacity=count, seed=count)
+        views = [cls(rng.uniform(0, 800), 522, 140, pool) for _ in range(count)]
+        return pool, views
+    return make
+
+
+def main():
+    Enemy(0, 522)  # load the frames and the clips once, outside the measurements
+    LegacyEnemy(0, 522, pool=EnemyPool(capacity=1))
+
+    print("%8s %12s %14s %14s %14s %14s" % (
+        "enemies", "arrays B", "before B/obj", "after B/obj", "before total", "after total"))
+    for count in ENEMY_COUNTS:
+        before, (pool, _) = measure(enemies(LegacyEnemy, count))
+        arrays = sum(getattr(pool, name).nbytes for name in pool.FIELDS) + pool._grid_cells.nbytes
+        del pool, _
+        after, made = measure(enemies(Enemy, count))
+        del made
+        print("%8d %12.0f %14.0f %14.0f %14.0f %14.0f" % (
+            count, arrays / count, (before - arrays) / count, (after - arrays) / count,
+            before / count, after / count))
+
+    before, made = measure(lambda: [legacy_hero(40, 400) for _ in range(HERO_COUNT)])
+    del made
+    after, made = measure(lambda: [Hero(40, 400) for _ in range(HERO_COUNT)])
+    del made
+    print("%8s %12s %14s %14s" % ("heroes", "", "before B/obj", "after B/obj"))
+    print("%8d %12s %14.0f %14.0f" % (HERO_COUNT, "", before / HERO_COUNT, after / HERO_COUNT))
+
+
+if __name__ == "__main__":
+    main()
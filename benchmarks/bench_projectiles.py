@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+# type: ignore
+# benchmarks/bench_projectiles.py
+"""Allocation and GC pressure of projectile storage at a high fire rate.
+
+"list" is the old scheme: a new Projectile per shot and a rebuilt list
+every frame. "pool" is ProjectilePool. Each frame fires ``rate`` shots
+from random points; projectiles cross the 800 px screen in about 1.3 s,
+so up to a few thousand are in flight at once. Both run a warm-up first,
+then the same measured window:
+
+* ms/frame: wall time, measured without tracing;
+* gc growth/frame: net growth of the GC generation-0 counter per frame,
+  i.e. GC-tracked objects allocated and not yet freed;
+* churn KB: traced heap growth above the starting point during the window.
+
+    python benchmarks/bench_projectiles.py
+"""
+import gc
+import random
+import time
+import tracemalloc
+
+from common import setup_headless
+
+setup_headless()
+
+from modules.Projectile import Projectile
+from modules.ProjectilePool import ProjectilePool
+
+DT = 1 / 60
+WARMUP = 300
+FRAMES = 600
+RATES = [1, 10, 50]
+
+
+class ListStore:
+    def __init__(self, rate):
+        self.projectiles = []
+
+    def frame(self, shots):
+        for x, y, direction in shots:
+            self.projectiles.append(Projectile(x, y, direction))
+        for proj in self.projectiles:
+            proj.update(800, DT)
+        self.projectiles = [p for p in self.projectiles if p.alive]
+
+    def __len__(self):
+        return len(self.projectiles)
+
+
+class PoolStore:
+    def __init__(self, rate):
+        self.pool = ProjectilePool(capacity=rate * 100)
+
+    def frame(self, shots):
+        pool = self.pool
+        for x, y, direction in shots:
+            pool.spawn(x, y, direction)
+        pool.update(DT, 800)
+
+    def __len__(self):
+        return len(self.pool)
+
+
+def make_shots(rate, frames, seed=1):
+    rng = random.Random(seed)
+    return [
+        [(rng.uniform(0, 800), rng.uniform(0, 600), rng.choice((-1, 1))) for _ in range(rate)]
+        for _ in range(frames)
+    ]
+
+
+def run(store, shots):
+    for frame_shots in shots:
+        store.frame(frame_shots)
+
+
+def measure(store_class, rate):
+    warmup, window = make_shots(rate, WARMUP, 1), make_shots(rate, FRAMES, 2)
+
+    store = store_class(rate)
+    run(store, warmup)
+    start = time.perf_counter()
+    run(store, window)
+    ms = (time.perf_counter() - start) / FRAMES * 1000
+
+    store = store_class(rate)
+    run(store, warmup)
+    gc.collect()
+    gc.disable()
+    before = gc.get_count()[0]
+    tracemalloc.start()
+    base, _ = tracemalloc.get_traced_memory()
+    created = 0
+    for frame_shots in window:
+        count = gc.get_count()[0]
+        store.frame(frame_shots)
+        # objects still alive after the frame plus everything freed during it
+        created += max(0, gc.get_count()[0] - count)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    gc.enable()
+
+    return len(store), ms, created / FRAMES, (peak - base) / 1024
+
+
+def main():
+    print("%5s %6s %10s %10s %16s %10s" % (
+        "rate", "store", "in flight", "ms/frame", "gc growth/frame", "churn KB"))
+    for rate in RATES:
+        for label, store_class in (("list", ListStore), ("pool", PoolStore)):
+            in_flight, ms, created, churn = measure(store_class, rate)
+            print("%5d %6s %10d %10.3f %16.1f %10.1f" % (
+                rate, label, in_flight, ms, created, churn))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+# type: ignore
+# benchmarks/bench_render.py
+"""Playing-screen render cost: full redraw vs the cached static layer.
+
+"full" is the old draw_game: clear, background, actors, then the ground
+and every platform twice. "layered" is modules.Renderer restoring only
+last frame's dirty areas. A scripted hero runs and shoots across the
+level. After every frame the layered screen must match a full repaint
+in the same order (static world first, actors on top; the old order drew
+platforms over the actors). The HUD text is left out of both, since it
+costs the same either way.
+
+    python benchmarks/bench_render.py
+"""
+import time
+
+from common import setup_headless
+
+setup_headless()
+
+import pygame
+from pgzero import game
+from pgzero.builtins import Actor
+from pgzero.screen import Screen
+from pygame import Rect
+
+from modules.Input import Controls
+from modules.Renderer import Renderer
+from modules.World import World
+
+WIDTH, HEIGHT = 800, 600
+COLOR = (109, 83, 166)
+GROUND = Rect(0, 550, 800, 50)
+FRAMES = 600
+
+
+def draw_actors(world, screen):
+    drawn = list(world.hero.draw(screen))
+    for enemy in world.enemies:
+        if not enemy.is_dead:
+            drawn.append(enemy.draw())
+    return drawn
+
+
+def full_redraw(world, screen, sky):
+    screen.fill((0, 0, 0))
+    sky.draw()
+    draw_actors(world, screen)
+    screen.draw.filled_rect(GROUND, COLOR)
+    for plat in world.platforms:
+        screen.draw.filled_rect(plat, COLOR)
+        screen.draw.rect(plat, COLOR)
+
+
+def reference(world, screen, renderer):
+    screen.blit(renderer.static, (0, 0))
+    draw_actors(world, screen)
+
+
+def layered(world, screen, sky, renderer):
+    renderer.set_static(sky._surf, sky.topleft, [GROUND] + world.platforms, COLOR)
+    renderer.begin(screen.surface)
+    for rect in draw_actors(world, screen):
+        renderer.mark(rect)
+    renderer.end()
+
+
+def script(frame):
+    phase = (frame // 90) % 4
+    return Controls(left=phase == 2, right=phase == 0, jump=frame % 70 == 0,
+                    attack=frame % 45 == 0)
+
+
+def main():
+    pygame.display.set_mode((WIDTH, HEIGHT))
+    sky = Actor("background", (WIDTH // 2, HEIGHT // 2))
+    world = World()
+    world.game_state = "playing"
+    renderer = Renderer((WIDTH, HEIGHT))
+
+    full_screen = Screen(pygame.Surface((WIDTH, HEIGHT)).convert())
+    layered_screen = Screen(pygame.Surface((WIDTH, HEIGHT)).convert())
+    reference_screen = Screen(pygame.Surface((WIDTH, HEIGHT)).convert())
+    full_time = layered_time = 0.0
+    dirty = 0
+
+    for frame in range(FRAMES):
+        world.step(script(frame))
+
+        game.screen = full_screen
+        start = time.perf_counter()
+        full_redraw(world, full_screen, sky)
+        full_time += time.perf_counter() - start
+
+        game.screen = layered_screen
+        start = time.perf_counter()
+        layered(world, layered_screen, sky, renderer)
+        layered_time += time.perf_counter() - start
+        dirty += renderer.dirty_area()
+
+        game.screen = reference_screen
+        reference(world, reference_screen, renderer)
+        assert (pygame.image.tobytes(reference_screen.surface, "RGB")
+                == pygame.image.tobytes(layered_screen.surface, "RGB")), "frame %d differs" % frame
+
+    print("%d frames pixel-identical" % FRAMES)
+    print("full redraw : %7.3f ms/frame, %7d px/frame" % (full_time / FRAMES * 1000, WIDTH * HEIGHT))
+    print("layered     : %7.3f ms/frame, %7d px/frame" % (layered_time / FRAMES * 1000, dirty // FRAMES))
+
+
+if __name__ == "__main__":
+    main()
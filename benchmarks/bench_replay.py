@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+# type: ignore
+# benchmarks/bench_replay.py
+"""Record/replay: determinism, file size and replay speed.
+
+For each input policy, a seeded session is recorded with InputRecorder
+and saved. Then it is replayed twice, each time on a fresh World. Every
+replay must end with the recorded state hash. A world with a different
+seed fed the same input must not, since that would mean the seed has no
+effect on the outcome.
+
+Reported: bytes per tick of the file, live run vs replay speed.
+
+    python benchmarks/bench_replay.py
+"""
+import os
+import tempfile
+import time
+
+from common import setup_headless
+
+setup_headless()
+
+from modules.Headless import random_policy
+from modules.Input import Controls
+from modules.Replay import InputRecorder, Replay
+from modules.World import World
+
+FRAMES = 6000
+SEED = 7
+
+
+def held_policy(world):
+    """Keys held for a while, as a player would (runs, jumps, shoots)."""
+    frame = world.frame
+    phase = (frame // 120) % 4
+    return Controls(left=phase == 2, right=phase in (0, 1), jump=frame % 90 < 10,
+                    attack=frame % 150 < 20)
+
+
+def record(policy, path):
+    world = World(seed=SEED)
+    recorder = InputRecorder(world)
+    world.command("start")
+    recorder.command("start")
+    start = time.perf_counter()
+    for frame in range(FRAMES):
+        controls = policy(world)
+        recorder.record(controls)
+        world.step(controls)
+        if world.game_state in ("gameover", "win") and frame % 200 == 0:
+            world.command("menu")
+            recorder.command("menu")
+            world.command("start")
+            recorder.command("start")
+    elapsed = time.perf_counter() - start
+    recorder.save(path)
+    return elapsed, world.state_hash()
+
+
+def main():
+    print("%-8s %10s %8s %10s %10s" % ("policy", "bytes", "B/tick", "live fps", "replay fps"))
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, policy in (("held", held_policy), ("random", random_policy(SEED))):
+            path = os.path.join(tmp, name + ".rpl")
+            live, expected = record(policy, path)
+            recording = Replay.load(path)
+            assert recording.state_hash == expected and recording.frames == FRAMES
+
+            best = float("inf")
+            for _ in range(2):
+                start = time.perf_counter()
+                matches, world = recording.verify()
+                best = min(best, time.perf_counter() - start)
+                assert matches, "%s: replay ended in %s, recorded %s" % (
+                    name, world.state_hash(), expected)
+
+            other = World(recording.timestep, recording.level_path, SEED + 1)
+            assert recording.play(other).state_hash() != expected, \
+                "%s: the seed made no difference" % name
+
+            size = os.path.getsize(path)
+            print("%-8s %10d %8.2f %10.0f %10.0f" % (
+                name, size, size / FRAMES, FRAMES / live, FRAMES / best))
+    print("every replay matched its recording")
+
+
+if __name__ == "__main__":
+    main()
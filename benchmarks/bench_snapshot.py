@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+# type: ignore
+# benchmarks/bench_snapshot.py
+"""World snapshots: size, cost, resets, and rollback determinism.
+
+On levels with N enemies in the first chunks, a world plays a while
+(enemies move, some die, projectiles fly), then:
+
+* snapshot / restore: bytes of a snapshot and the time to take and to
+  restore one;
+* reset: ``World.reset`` as it was (``reset_hero`` and
+  ``spawn_all_enemies``, making every enemy again) vs as it is now
+  (restoring the checkpoint in place). Reported: time, peak bytes
+  allocated, and enemies made;
+* win screen: one tick while "win" is shown, as it was (every enemy
+  revived and the hero reset, once per enemy, every tick) vs now (done
+  once, on the way in).
+
+Then, on the game's own level, rollback must be exact: a world restored
+to a snapshot and fed the same input again must end with the same state
+hash, both for a short rollback and for one back across level chunks and
+kills. A reset world must also match a fresh one, tick for tick. The
+script fails on the first case that does not.
+
+    python benchmarks/bench_snapshot.py
+"""
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from common import setup_headless, timeit
+
+setup_headless()
+
+from modules.Input import Controls
+from modules.Level import LevelFile
+from modules.World import World
+
+COUNTS = [10, 100, 1000]
+WARMUP = 300  # ticks played before measuring
+REPS = 20
+SEED = 3
+
+
+def held_policy(world):
+    """Keys held for a while, as a player would (runs, jumps, shoots)."""
+    frame = world.frame
+    phase = (frame // 120) % 4
+    return Controls(left=phase == 2, right=phase in (0, 1), jump=frame % 90 < 10,
+                    attack=frame % 150 < 20)
+
+
+def make_level(path, count):
+    """A 10-screen level with ``count`` enemies over its first two screens."""
+    rng = random.Random(count)
+    spawns = []
+    for _ in range(count):
+        x = rng.randrange(100, 1500)
+        spawns.append((x, 522, x - 70, x + 70))
+    platforms = [(300, 420, 200, 20), (900, 360, 200, 20)]
+    LevelFile.write(path, 8000, 522, platforms, spawns)
+
+
+def played(path):
+    world = World(level_path=path, seed=SEED)
+    world.command("start")
+    for _ in range(WARMUP):
+        world.step(held_policy(world))
+    return world
+
+
+def legacy_reset(world):
+    """World.reset before snapshots: every enemy made again."""
+    world.reset_hero()
+    world.hero.is_attacking = False
+    world.hero._has_shot = False
+    world.hero.projectiles.clear()
+    world.spawn_all_enemies()
+    world.score = 0
+    world.gameover_timer = 0
+    world.game_state = "playing"
+
+
+def legacy_win_tick(world):
+    """A "win" tick of World.begin_step before snapshots."""
+    world.frame += 1
+    world.hero.sound_events.clear()
+    for enemy in world.enemies:
+        enemy.health = 100
+        enemy.is_dead = False
+        world.reset_hero()
+
+
+def measure(world, reset):
+    """Seconds, peak bytes allocated and enemies made by one ``reset(world)``."""
+    before = list(world.enemy_pool.views)  # held, so their ids are not reused
+    known = {id(view) for view in before}
+    tracemalloc.start()
+    reset(world)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    made = sum(id(view) not in known for view in world.enemy_pool.views)
+
+    def run():
+        for _ in range(REPS):
+            reset(world)
+    return timeit(run) / REPS, peak, made
+
+
+def rollback(ticks_before, ticks_after):
+    """True if a restored world replays ``ticks_after`` ticks to the same state."""
+    world = World(seed=SEED)
+    world.command("start")
+    for _ in range(ticks_before):
+        world.step(held_policy(world))
+    saved = world.snapshot()
+    for _ in range(ticks_after):
+        world.step(held_policy(world))
+    expected = world.state_hash()
+    world.restore(saved)
+    for _ in range(ticks_after):
+        world.step(held_policy(world))
+    return world.state_hash() == expected
+
+
+def reset_matches_fresh(ticks):
+    """True if a played-then-reset world steps like a fresh one."""
+    world = World(seed=SEED)
+    world.command("start")
+    for _ in range(ticks):
+        world.step(held_policy(world))
+    world.reset()
+    fresh = World(seed=SEED)
+    fresh.command("start")
+    for _ in range(ticks):
+        if world.state_hash() != fresh.state_hash():
+            return False
+        world.step(held_policy(world))
+        fresh.step(held_policy(fresh))
+    return world.state_hash() == fresh.state_hash()
+
+
+def main():
+    print("%8s %9s %9s %9s %12s %12s %11s %11s %9s %9s %11s %11s" % (
+        "enemies", "bytes", "take us", "back us", "old reset", "new reset", "old peak",
+        "new peak", "old made", "new made", "old win us", "new win us"))
+    with tempfile.TemporaryDirectory() as folder:
+        for count in COUNTS:
+            path = os.path.join(folder, "%d.lvl" % count)
+            make_level(path, count)
+            world = played(path)
+            data = world.snapshot()
+            take = timeit(lambda: [world.snapshot() for _ in range(REPS)]) / REPS
+            back = timeit(lambda: [world.restore(data) for _ in range(REPS)]) / REPS
+
+            old = measure(played(path), legacy_reset)
+            new = measure(played(path), World.reset)
+
+            world = played(path)
+            world.game_state = "win"
+            start = time.perf_counter()
+            for _ in range(REPS):
+                legacy_win_tick(world)
+            old_win = (time.perf_counter() - start) / REPS
+            idle = Controls()
+            start = time.perf_counter()
+            for _ in range(REPS):
+                world.step(idle)
+            new_win = (time.perf_counter() - start) / REPS
+
+            print("%8d %9d %9.1f %9.1f %10.3fms %10.3fms %10.0fB %10.0fB %9d %9d %11.1f %11.1f" % (
+                count, len(data), take * 1e6, back * 1e6, old[0] * 1000, new[0] * 1000,
+                old[1], new[1], old[2], new[2], old_win * 1e6, new_win * 1e6))
+
+    cases = [
+        ("rollback 60 ticks", lambda: rollback(300, 60)),
+        ("rollback across chunks", lambda: rollback(0, 3000)),
+        ("reset vs fresh world", lambda: reset_matches_fresh(1200)),
+    ]
+    for name, check in cases:
+        assert check(), "%s: the restored world ended in a different state" % name
+        print("%-24s same state" % name)
+    print("every restore matched")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+# type: ignore
+# benchmarks/bench_startup.py
+"""Startup cost: sprite loading, and time to the first menu frame.
+
+Each measurement runs in a fresh interpreter so no in-memory cache
+survives between runs.
+
+Sprites: "no cache" is the old path (decode and flip every frame); "warm
+cache" reads the prebuilt cache file.
+
+First menu frame: main.py is copied, with its assets, to an empty folder
+(a fresh checkout, so a cold sprite cache) and run up to the end of its
+first draw() on a headless display. "all assets" is when the background
+loader has installed everything. Both are timed from the start of main.py,
+after pygame itself is initialised, in a cold run and then a warm run.
+``--root`` measures another checkout the same way (e.g. a git worktree of
+an older commit) for comparison.
+
+    python benchmarks/bench_startup.py [--root PATH]
+"""
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+from common import ROOT
+
+CHILD = r"""
+import sys, time
+sys.path.insert(0, %(bench)r)
+from common import setup_headless
+setup_headless()
+
+from modules.Sprite import SpriteManager
+from modules.Hero import Hero
+from modules.Enemy import Enemy
+
+start = time.perf_counter()
+if %(use_cache)r:
+    SpriteManager.load_disk_cache(%(cache_path)r)
+Hero(40, 400)
+for _ in range(5):
+    Enemy(500, 515)
+print(time.perf_counter() - start)
+"""
+
+
+def run_child(use_cache, cache_path, runs=5):
+    code = CHILD % {
+        "bench": os.path.dirname(os.path.abspath(__file__)),
+        "use_cache": use_cache,
+        "cache_path": cache_path,
+    }
+    times = []
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", code], cwd=ROOT,
+            capture_output=True, text=True, check=True,
+        ).stdout
+        times.append(float(out.strip().splitlines()[-1]))
+    return min(times)
+
+
+FIRST_FRAME = r"""
+import os, sys, time, types
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+os.environ["SDL_AUDIODRIVER"] = "dummy"
+sys._pgzrun = True
+sys.path.insert(0, os.getcwd())
+import pygame
+from pgzero import builtins, game, loaders
+from pgzero.screen import Screen
+
+pygame.init()
+surface = pygame.display.set_mode((800, 600))
+loaders.set_root(os.getcwd())
+main = types.ModuleType("main")
+main.__file__ = "main.py"
+main.__dict__.update(builtins.__dict__)
+main.screen = game.screen = Screen(surface)
+
+start = time.perf_counter()
+with open("main.py") as f:
+    exec(compile(f.read(), "main.py", "exec"), main.__dict__)
+main.draw()
+first = time.perf_counter() - start
+
+assets = main.__dict__.get("assets")
+if assets is not None:
+    while not assets.done:
+        main.update(1 / 60)
+        main.draw()
+print(first, time.perf_counter() - start)
+"""
+
+
+def first_frame(root, runs=5):
+    """Return (cold first frame, cold all assets, warm first frame, warm all assets)."""
+    cold, warm = [], []
+    for _ in range(runs):
+        with tempfile.TemporaryDirectory() as tmp:
+            for folder in ("images", "sounds", "music", "levels", "modules"):
+                shutil.copytree(os.path.join(root, folder), os.path.join(tmp, folder),
+                                ignore=shutil.ignore_patterns("__pycache__"))
+            shutil.copy(os.path.join(root, "main.py"), tmp)
+            subprocess.run([sys.executable, "-m", "compileall", "-q", "modules"], cwd=tmp, check=True)
+            for results in (cold, warm):  # the first run writes the sprite cache
+                out = subprocess.run(
+                    [sys.executable, "-c", FIRST_FRAME], cwd=tmp,
+                    capture_output=True, text=True, check=True,
+                ).stdout
+                results.append([float(v) for v in out.strip().splitlines()[-1].split()])
+    best = lambda samples, i: min(sample[i] for sample in samples)
+    return best(cold, 0), best(cold, 1), best(warm, 0), best(warm, 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--root", default=ROOT, help="checkout to measure the first frame of")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_path = os.path.join(tmp, "sprites.bin")
+        no_cache = run_child(False, cache_path)
+        build = run_child(True, cache_path, runs=1)  # first run writes the file
+        warm = run_child(True, cache_path)
+
+    print("no cache        : %7.2f ms" % (no_cache * 1000))
+    print("building cache  : %7.2f ms" % (build * 1000))
+    print("warm cache      : %7.2f ms" % (warm * 1000))
+
+    cold_first, cold_all, warm_first, warm_all = first_frame(args.root)
+    print("first menu frame, cold : %7.2f ms (all assets %7.2f ms)" % (cold_first * 1000, cold_all * 1000))
+    print("first menu frame, warm : %7.2f ms (all assets %7.2f ms)" % (warm_first * 1000, warm_all * 1000))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,355 @@
+# -*- coding: utf-8 -*-
+# type: ignore
+# benchmarks/bench_suite.py
+"""Frame-time and startup benchmark suite, with JSON output.
+
+Sweeps the entity counts of the simulation and measures, per point:
+
+* mean / p95 / p99 frame time of ``World.step`` under scripted input;
+* allocations per frame: peak traced heap above the frame's start
+  (tracemalloc, on a separate pass so it does not skew the timings) and
+  net growth of allocated blocks;
+* peak RSS of the process.
+
+Sweeps: enemies 5 -> 10,000, projectiles 0 -> 5,000, platforms
+4 -> 2,000, plus "main", which runs main.py's own ``update`` and ``draw``
+on a headless screen. Startup is measured on its own: module import,
+sprite cache load, ``Hero()`` and ``World.spawn_all_enemies()``.
+
+Every point runs in a fresh interpreter so peak RSS and caches belong to
+that point alone.
+
+    python benchmarks/bench_suite.py --out results.json
+    python benchmarks/bench_suite.py --quick --baseline results.json
+
+With ``--baseline``, points whose p95 frame time (or startup median) got
+slower by more than ``--tolerance`` are listed and the exit code is 1.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from common import ROOT
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+SWEEPS = {
+    "enemies": [5, 50, 500, 2000, 10000],
+    "projectiles": [0, 50, 500, 5000],
+    "platforms": [4, 50, 500, 2000],
+    "main": [3],
+}
+QUICK_SWEEPS = {
+    "enemies": [5, 500],
+    "projectiles": [0, 500],
+    "platforms": [4, 500],
+    "main": [3],
+}
+WIDTH, HEIGHT = 800, 600
+
+
+def script(frame):
+    """Scripted input: run right, then stop, left, stop; jump and shoot now and then."""
+    phase = (frame // 90) % 4
+    return (phase == 2, phase == 0, frame % 70 == 0, frame % 240 == 0)
+
+
+def percentile(sorted_values, q):
+    index = min(len(sorted_values) - 1, int(round(q / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def peak_rss_kib():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak  # bytes on macOS
+
+
+# -------------------------------
+# SCENARIOS (run in the child process)
+# -------------------------------
+def build_world(kind, count, seed):
+    """Return ``(frame, prepare)`` for a World populated for this sweep point."""
+    from modules.Input import Controls
+    from modules.Platform import Platform
+    from modules.ProjectilePool import ProjectilePool
+    from modules.World import World
+
+    rng = random.Random(seed)
+    world = World(seed=seed)
+    world.game_state = "playing"
+    hero = world.hero
+    hero.health = 10 ** 9  # keep the hero alive for the whole run
+    world.score_to_win = 10 ** 9  # and the level from ending
+
+    if kind == "enemies":
+        for _ in range(count - len(world.enemies)):
+            world.spawn_enemy(rng.uniform(0, WIDTH), 515, patrol_width=200)
+    elif kind == "platforms":
+        for _ in range(count - len(world.platforms)):
+            plat = Platform(rng.randrange(0, WIDTH - 60), rng.randrange(100, 540), 60, 12)
+            world.platform_data.append(plat)
+            world.platforms.append(plat.rect)
+            world.platform_grid.insert(plat.rect, plat.rect)
+    elif kind == "projectiles":
+        hero.projectiles = ProjectilePool(capacity=max(count, 1))
+
+    def prepare():
+        # keep the projectile count steady (outside the timed step)
+        pool = hero.projectiles
+        for _ in range(count - len(pool) if kind == "projectiles" else 0):
+            pool.spawn(rng.uniform(0, WIDTH), rng.uniform(100, 540), rng.choice((-1, 1)))
+
+    def frame(i):
+        world.step(Controls(*script(i)))
+
+    return frame, prepare
+
+
+def build_main():
+    """Load main.py as a module on a headless screen; return ``(frame, prepare)``."""
+    import types
+
+    import pygame
+    from pgzero import builtins, game
+    from pgzero.keyboard import keyboard
+    from pgzero.screen import Screen
+
+    surface = pygame.display.set_mode((WIDTH, HEIGHT))
+    screen = Screen(surface)
+    game.screen = screen
+    path = os.path.join(ROOT, "main.py")
+    main = types.ModuleType("main")
+    main.__file__ = path
+    main.__dict__.update(builtins.__dict__)
+    main.screen = screen
+    with open(path) as f:
+        exec(compile(f.read(), path, "exec"), main.__dict__)
+    main.on_key_down(builtins.keys.RETURN)  # menu -> playing
+    main.hero.health = 10 ** 9
+    main.world.score_to_win = 10 ** 9
+    key_codes = (pygame.K_LEFT, pygame.K_RIGHT, pygame.K_SPACE, pygame.K_z)
+
+    def prepare():
+        pass
+
+    def frame(i):
+        for code, pressed in zip(key_codes, script(i)):
+            if pressed:
+                keyboard._press(code)
+            else:
+                keyboard._release(code)
+        main.update(1 / 60)
+        main.draw()
+
+    return frame, prepare
+
+
+def run_point(kind, count, frames, warmup, seed):
+    """Measure one sweep point in this process and return a result dict."""
+    if kind == "main":
+        frame, prepare = build_main()
+    else:
+        frame, prepare = build_world(kind, count, seed)
+
+    for i in range(warmup):
+        prepare()
+        frame(i)
+
+    # timing pass
+    times = []
+    blocks = sys.getallocatedblocks()
+    for i in range(warmup, warmup + frames):
+        prepare()
+        start = time.perf_counter()
+        frame(i)
+        times.append(time.perf_counter() - start)
+    blocks = sys.getallocatedblocks() - blocks
+
+    # allocation pass
+    alloc = []
+    tracemalloc.start()
+    for i in range(warmup + frames, warmup + frames + min(frames, 120)):
+        prepare()
+        gc.collect()
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        frame(i)
+        alloc.append(tracemalloc.get_traced_memory()[1] - before)
+    tracemalloc.stop()
+
+    times.sort()
+    return {
+        "kind": kind,
+        "count": count,
+        "frames": frames,
+        "mean_ms": sum(times) / len(times) * 1000,
+        "p95_ms": percentile(times, 95) * 1000,
+        "p99_ms": percentile(times, 99) * 1000,
+        "max_ms": times[-1] * 1000,
+        "alloc_bytes_per_frame": sum(alloc) / len(alloc),
+        "net_blocks_per_frame": blocks / frames,
+        "peak_rss_kib": peak_rss_kib(),
+    }
+
+
+def run_startup():
+    """Time each startup stage once in this (fresh) process."""
+    from common import setup_headless
+
+    stages = {}
+    start = time.perf_counter()
+    setup_headless()
+    stages["pygame_setup_ms"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    from modules.Hero import Hero
+    from modules.Sprite import SpriteManager
+    from modules.World import World
+    stages["import_ms"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    SpriteManager.load_disk_cache()
+    stages["sprite_cache_ms"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    Hero(40, 400)
+    stages["hero_ms"] = time.perf_counter() - start
+
+    world = World()
+    start = time.perf_counter()
+    world.spawn_all_enemies()
+    stages["spawn_all_enemies_ms"] = time.perf_counter() - start
+
+    result = {name: seconds * 1000 for name, seconds in stages.items()}
+    result["peak_rss_kib"] = peak_rss_kib()
+    return result
+
+
+# -------------------------------
+# DRIVER
+# -------------------------------
+def child(args):
+    """Run ``args`` of this script in a fresh interpreter and parse its JSON."""
+    out = subprocess.run(
+        [sys.executable, os.path.abspath(__file__)] + args, cwd=ROOT,
+        capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def startup_stats(runs):
+    samples = [child(["--startup"]) for _ in range(runs)]
+    result = {}
+    for name in samples[0]:
+        values = sorted(sample[name] for sample in samples if sample[name] is not None)
+        if values:
+            result[name] = values[len(values) // 2]  # median
+    return result
+
+
+def environment():
+    import numpy
+    import pygame
+    return {
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "numpy": numpy.__version__,
+        "machine": platform.machine(),
+        "system": platform.system(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Return a list of regressions of ``results`` against ``baseline``."""
+    regressions = []
+    old_points = {(p["kind"], p["count"]): p for p in baseline.get("sweeps", [])}
+    for point in results["sweeps"]:
+        old = old_points.get((point["kind"], point["count"]))
+        if old and point["p95_ms"] > old["p95_ms"] * (1 + tolerance):
+            regressions.append("%s=%d p95 %.3f -> %.3f ms" % (
+                point["kind"], point["count"], old["p95_ms"], point["p95_ms"]))
+    old_startup = baseline.get("startup", {})
+    for name, value in results["startup"].items():
+        old = old_startup.get(name)
+        if name.endswith("_ms") and old and value > old * (1 + tolerance):
+            regressions.append("startup %s %.2f -> %.2f ms" % (name, old, value))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=300, help="measured frames per point")
+    parser.add_argument("--warmup", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--startup-runs", type=int, default=5)
+    parser.add_argument("--quick", action="store_true", help="small sweep, for CI")
+    parser.add_argument("--only", choices=sorted(SWEEPS), action="append",
+                        help="run only these sweeps (repeatable)")
+    parser.add_argument("--out", help="write the JSON results to this file")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="allowed slowdown against the baseline (0.2 = 20%%)")
+    parser.add_argument("--point", nargs=2, metavar=("KIND", "COUNT"), help=argparse.SUPPRESS)
+    parser.add_argument("--startup", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.startup:
+        print(json.dumps(run_startup()))
+        return 0
+    if args.point:
+        from common import setup_headless
+        setup_headless()
+        kind, count = args.point[0], int(args.point[1])
+        print(json.dumps(run_point(kind, count, args.frames, args.warmup, args.seed)))
+        return 0
+
+    sweeps = QUICK_SWEEPS if args.quick else SWEEPS
+    results = {"environment": environment(), "sweeps": []}
+    print("%-12s %7s %9s %9s %9s %12s %10s" % (
+        "sweep", "count", "mean ms", "p95 ms", "p99 ms", "alloc B/frm", "rss KiB"), file=sys.stderr)
+    for kind, counts in sweeps.items():
+        if args.only and kind not in args.only:
+            continue
+        for count in counts:
+            point = child(["--point", kind, str(count), "--frames", str(args.frames),
+                           "--warmup", str(args.warmup), "--seed", str(args.seed)])
+            results["sweeps"].append(point)
+            print("%-12s %7d %9.3f %9.3f %9.3f %12.0f %10s" % (
+                kind, count, point["mean_ms"], point["p95_ms"], point["p99_ms"],
+                point["alloc_bytes_per_frame"], point["peak_rss_kib"]), file=sys.stderr)
+
+    results["startup"] = startup_stats(args.startup_runs)
+    for name, value in results["startup"].items():
+        print("startup %-22s %10.2f" % (name, value), file=sys.stderr)
+
+    text = json.dumps(results, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for line in regressions:
+            print("REGRESSION " + line, file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+# type: ignore
+# benchmarks/bench_sweep.py
+"""Swept collisions vs end-of-tick overlap tests, across speeds and tick rates.
+
+Three cases are played at tick rates from 240 down to 10 per second:
+
+* landing: the hero falls from a height with a starting downward speed
+  onto a 20 px platform and must stop on its top;
+* head bump: the hero jumps from under a platform with a given upward
+  speed and must stop under it;
+* projectile: a projectile of a given speed flies at an enemy and must
+  hit it.
+
+Each case runs twice: with the discrete checks the game used before
+(the end-of-tick heuristics of ``Hero.apply_gravity`` and ``colliderect``
+on the projectile's end position) and with modules.Sweep. Reported: how
+many of the speed x tick rate combinations go wrong in each, and the cost
+of one check. The swept version must get every combination right, or
+the script fails naming the combinations that went wrong
+(tests/test_sweep.py runs the same cases under pytest, one per
+combination).
+
+    python benchmarks/bench_sweep.py
+"""
+from pygame import Rect
+
+from common import setup_headless, timeit
+
+setup_headless()
+
+from modules.Hero import Hero
+from modules.World import World
+
+TICK_RATES = [240, 120, 60, 30, 20, 15, 10]
+FALL_SPEEDS = [0, 600, 1200, 2400, 4800]  # px/s, downward
+JUMP_SPEEDS = [600, 900, 1500, 2400, 4800]  # px/s, upward
+PROJECTILE_SPEEDS = [300, 600, 1200, 2400, 4800, 9600]  # px/s
+PLATFORM = Rect(0, 300, 400, 20)
+
+
+def discrete_gravity(hero, platforms, dt):
+    """Hero.apply_gravity as it was: overlap at the end of the tick, plus heuristics."""
+    hero.vel_y += hero.gravity * dt
+    hero.actor.y += hero.vel_y * dt
+    hero.on_ground = False
+    if hero.actor.y >= hero.ground_y:
+        hero.actor.y = hero.ground_y
+        hero.vel_y = 0
+        hero.on_ground = True
+    for p in platforms:
+        if hero.actor.colliderect(p):
+            if hero.vel_y > 0:
+                if hero.actor.bottom - hero.vel_y * dt <= p.top + 5:
+                    hero.actor.bottom = p.top
+                    hero.vel_y = 0
+                    hero.on_ground = True
+            elif hero.vel_y < 0:
+                if hero.actor.top >= p.bottom - 10:
+                    hero.actor.top = p.bottom
+                    hero.vel_y = 0
+
+
+def swept_gravity(hero, platforms, dt):
+    hero.apply_gravity(platforms, dt)
+
+
+def landing(gravity, speed, rate):
+    """True if the hero falling at ``speed`` stops on the platform."""
+    hero = Hero(200, 0)
+    hero.actor.bottom = PLATFORM.top - 150
+    hero.vel_y = speed
+    for _ in range(rate * 3):
+        gravity(hero, [PLATFORM], 1 / rate)
+        if hero.on_ground:
+            break
+    return hero.actor.bottom == PLATFORM.top
+
+
+def head_bump(gravity, speed, rate):
+    """True if the hero jumping at ``speed`` from under the platform never gets above it."""
+    hero = Hero(200, 0)
+    hero.actor.top = PLATFORM.bottom + 40
+    hero.vel_y = -speed
+    for _ in range(rate * 3):
+        gravity(hero, [PLATFORM], 1 / rate)
+        if hero.actor.bottom <= PLATFORM.top:
+            return False
+        if hero.on_ground:
+            break
+    return True
+
+
+def discrete_hit(world, proj):
+    for enemy in world.enemy_grid.query(proj.rect):
+        if not enemy.is_dead and enemy.actor.colliderect(proj.rect):
+            return enemy
+    return None
+
+
+def projectile(world, hit, speed, rate):
+    """True if a projectile flying at ``speed`` hits the first enemy."""
+    enemy = world.enemies[0]
+    x, y = enemy.x, enemy.y
+    proj = world.hero.projectiles.spawn(x - 300, y, 1, speed)
+    try:
+        for _ in range(rate * 3):
+            proj.update(x + 600, 1 / rate, x - 600)
+            if not proj.alive:
+                return False
+            if hit(world, proj) is enemy:
+                return True
+        return False
+    finally:
+        world.hero.projectiles.clear()
+
+
+def wrong(check, args, speeds):
+    """``(speed, rate)`` combinations where ``check`` fails."""
+    return [(speed, rate) for speed in speeds for rate in TICK_RATES if not check(*args, speed, rate)]
+
+
+def main():
+    world = World(seed=0)
+    enemy = world.enemies[0]
+    world.enemy_pool.prev_x[enemy.index] = enemy.x  # standing still
+    world.enemy_pool.prev_y[enemy.index] = enemy.y
+
+    cases = [
+        ("landing", landing, FALL_SPEEDS, (discrete_gravity,), (swept_gravity,)),
+        ("head bump", head_bump, JUMP_SPEEDS, (discrete_gravity,), (swept_gravity,)),
+        ("projectile", projectile, PROJECTILE_SPEEDS, (world, discrete_hit),
+         (world, World.projectile_hit)),
+    ]
+    print("%-12s %9s %12s %12s" % ("case", "combos", "discrete", "swept"))
+    for name, check, speeds, discrete, swept in cases:
+        combos = len(speeds) * len(TICK_RATES)
+        wrong_discrete = wrong(check, discrete, speeds)
+        wrong_swept = wrong(check, swept, speeds)
+        print("%-12s %9d %9d bad %9d bad" % (name, combos, len(wrong_discrete), len(wrong_swept)))
+        assert not wrong_swept, "%s: swept check wrong at (px/s, ticks/s) %s" % (name, wrong_swept)
+
+    # cost of one check, on the game's own level
+    hero = world.hero
+    grid = world.platform_grid
+    hero.actor.pos = (world.enemies[0].x, 300)
+    proj = hero.projectiles.spawn(enemy.x - 300, enemy.y, 1)
+    reps = 10000
+
+    def gravity_with(gravity, candidates):
+        def run():
+            for _ in range(reps):
+                hero.actor.y = 300
+                hero.vel_y = 0
+                gravity(hero, candidates, 1 / 60)
+        return run
+
+    def hits_with(hit):
+        def run():
+            for _ in range(reps):
+                hit(world, proj)
+        return run
+
+    print("%-12s %12s %12s" % ("cost", "discrete us", "swept us"))
+    print("%-12s %12.2f %12.2f" % (
+        "hero", timeit(gravity_with(discrete_gravity, grid.query(hero.actor))) / reps * 1e6,
+        timeit(gravity_with(swept_gravity, grid)) / reps * 1e6))
+    print("%-12s %12.2f %12.2f" % (
+        "projectile", timeit(hits_with(discrete_hit)) / reps * 1e6,
+        timeit(hits_with(World.projectile_hit)) / reps * 1e6))
+    print("swept collisions right at every speed and tick rate")
+
+
+if __name__ == "__main__":
+    main()
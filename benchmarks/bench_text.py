@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+# type: ignore
+# benchmarks/bench_text.py
+"""HUD text cost: screen.draw.text vs modules.TextCache.
+
+Draws the three HUD lines for FRAMES frames while the counters change
+(lives tick down, the score climbs), which is the case ptext's own cache
+handles worst: every new value is a new string to rasterize. The cached
+HUD builds counters from per-digit glyphs, so after the first frames it
+only blits. The composed counters must match the whole string rendered
+by ptext to within a few pixels of width (glyph edges are rounded one by
+one instead of across the string).
+
+    python benchmarks/bench_text.py
+"""
+import time
+
+from common import setup_headless
+
+setup_headless()
+
+import pygame
+from pgzero import ptext
+from pgzero.screen import Screen
+
+from modules.TextCache import TextCache
+
+WIDTH, HEIGHT = 800, 600
+FRAMES = 600
+HUD = (
+    ("Lives: ", (10, 10), 30, (255, 255, 255)),
+    ("Score: ", (10, 50), 30, (255, 215, 0)),
+    ("Enemies: ", (WIDTH - 150, 10), 25, (255, 100, 100)),
+)
+
+
+def values(frame):
+    return (str(1000 - frame), "%d/%d" % (frame // 3, FRAMES), str(frame % 7))
+
+
+def draw_text(screen, frame):
+    for (label, pos, size, color), value in zip(HUD, values(frame)):
+        screen.draw.text(label + value, pos, fontsize=size, color=color)
+
+
+def draw_cached(cache, surface, frame):
+    for (label, pos, size, color), value in zip(HUD, values(frame)):
+        cache.draw_counter(surface, label, value, pos, size, color)
+
+
+def main():
+    pygame.display.set_mode((WIDTH, HEIGHT))
+    screen = Screen(pygame.Surface((WIDTH, HEIGHT)).convert())
+    cache = TextCache()
+
+    start = time.perf_counter()
+    for frame in range(FRAMES):
+        draw_text(screen, frame)
+    text_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for frame in range(10):
+        draw_cached(cache, screen.surface, frame)
+    warm = cache.stats()
+    for frame in range(10, FRAMES):
+        draw_cached(cache, screen.surface, frame)
+    cached_time = time.perf_counter() - start
+    stats = cache.stats()
+
+    # ptext's own cache now holds every whole string, so check afterwards
+    for frame in range(FRAMES):
+        for (label, pos, size, color), value in zip(HUD, values(frame)):
+            whole = ptext.getsurf(label + value, fontsize=size, color=color)
+            drawn = cache.draw_counter(screen.surface, label, value, pos, size, color)
+            w, h = whole.get_size()
+            assert drawn.height == h and abs(drawn.width - w) <= 4, (label + value, drawn, w)
+
+    print("%d frames, composed counters match ptext sizes" % FRAMES)
+    print("screen.draw.text : %7.3f ms/frame" % (text_time / FRAMES * 1000))
+    print("TextCache        : %7.3f ms/frame" % (cached_time / FRAMES * 1000))
+    print("misses after warm-up: %d, hit rate %.1f%%, %d entries, %d KiB"
+          % (stats["misses"] - warm["misses"], stats["hit_rate"] * 100,
+             stats["entries"], stats["bytes"] // 1024))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+# type: ignore
+# benchmarks/bench_vecenv.py
+"""VecEnv vs one Python game loop per instance.
+
+For N instances, the same random actions are fed to:
+
+* "separate": N independent Worlds, each with its own EnemyPool, stepped
+  one after the other with ``World.step``. Finished instances are reset
+  the same way VecEnv resets them;
+* "batched": one VecEnv, where every instance's enemies share one pool
+  and advance in a single vectorized update.
+
+Reported: milliseconds per lockstep step (all N instances) and the speedup.
+At the end, every instance must be in the same state in both runs
+(``World.state_hash``).
+
+    python benchmarks/bench_vecenv.py
+"""
+import time
+
+import numpy as np
+
+from common import setup_headless
+
+setup_headless()
+
+from modules.Input import BY_BITS
+from modules.VecEnv import VecEnv
+from modules.World import World
+
+COUNTS = [10, 100, 1000]
+STEPS = 200
+MAX_STEPS = 150  # short episodes, so resets are exercised too
+PRESS = [0.2, 0.4, 0.05, 0.1]  # chance of left, right, jump, attack per tick
+
+
+def separate(n, actions):
+    worlds = [World(seed=i) for i in range(n)]
+    for world in worlds:
+        world.reset()
+    steps = [0] * n
+    start = time.perf_counter()
+    for tick in actions:
+        bits = (tick * [1, 2, 4, 8]).sum(axis=1).tolist()
+        for i, world in enumerate(worlds):
+            world.step(BY_BITS[bits[i]])
+            steps[i] += 1
+            if world.hero.is_dead or world.game_state == "win" or steps[i] >= MAX_STEPS:
+                world.reset()
+                steps[i] = 0
+    return (time.perf_counter() - start) / len(actions), worlds
+
+
+def batched(n, actions):
+    env = VecEnv(n, seed=0, max_steps=MAX_STEPS)
+    env.reset()
+    start = time.perf_counter()
+    for tick in actions:
+        env.step(tick)
+    return (time.perf_counter() - start) / len(actions), env.worlds
+
+
+def main():
+    print("%10s %14s %14s %10s" % ("instances", "separate ms", "batched ms", "speedup"))
+    for n in COUNTS:
+        rng = np.random.default_rng(n)
+        actions = rng.random((STEPS, n, 4)) < PRESS
+        separate_time, reference = separate(n, actions)
+        batched_time, worlds = batched(n, actions)
+        differ = sum(a.state_hash() != b.state_hash() for a, b in zip(reference, worlds))
+        print("%10d %14.3f %14.3f %9.2fx" % (
+            n, separate_time * 1000, batched_time * 1000, separate_time / batched_time))
+        assert not differ, "%d of %d instances differ from their separate run" % (differ, n)
+    print("every instance matched its separate run")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+# type: ignore
+# benchmarks/common.py
+"""Shared helpers for the benchmark scripts in this folder."""
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def setup_headless():
+    """Prepare pygame and the loaders without a window (see modules.Headless)."""
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+    from modules.Headless import setup
+    setup(ROOT)
+
+
+def timeit(func, repeat=5):
+    """Return the best wall time in seconds over ``repeat`` calls of func."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
@@ -1,10 +1,20 @@
 # -*- coding: utf-8 -*-
 # type: ignore
+import atexit
+import os
 import pgzrun
 from pygame import Rect
-from modules.Hero import Hero
-from modules.Enemy import Enemy
-from modules.Platform import Platform
+from modules.Assets import AssetLoader
+from modules.Audio import AudioEngine
+from modules.Camera import Camera
+from modules.Input import Controls
+from modules.Profiler import profiler
+from modules.Renderer import Renderer
+from modules.Replay import InputRecorder
+from modules.Scheduler import FixedStepScheduler, lerp
+from modules.Sprite import SpriteManager
+from modules.TextCache import TextCache
+from modules.World import World
 
 # game constants
 WIDTH = 800
@@ -12,11 +22,11 @@ HEIGHT = 600
 TITLE = "Platformer - Test Project"
 
 # game variables
-score = 0  # System score
-SCORE_TO_WIN = 5  # Needed score to win
 music_on = True
-game_state = "menu" # menu, playing, gameover
-gameover_timer = 0   # Counter for game over delay
+last_drawn_state = None  # game_state rendered on the previous frame
+
+# Colors of the playing screen
+WORLD_COLOR = (109, 83, 166)
 
 # game UI elements
 start_button = Rect((WIDTH // 2 -125, HEIGHT // 2), (250, 50))
@@ -25,93 +35,94 @@ sound_button = Rect((WIDTH // 2 -125, HEIGHT // 2 + 70), (250, 50))
 exit_button = Rect((WIDTH // 2 -125, HEIGHT // 2 + 210) , (250, 50))
 
 # game objects
-sky = Actor("background", (WIDTH // 2, HEIGHT // 2))
-hero = Hero(40, 400)
-
-# Enemy list 
-enemies = [Enemy(500, 515, patrol_width=140) for _ in range(5)]
-
-# Reset hero position and state
-def reset_hero():
-    hero.actor.x = 40
-    hero.actor.y = 400
-    hero.vel_y = 0
-    hero.is_dead = False
-    hero.health = 100
-
-
-platform_data = [
-    Platform(100, 450, 150, 20, has_enemy=True),
-    Platform(350, 380, 200, 20, has_enemy=True),
-    Platform(600, 300, 150, 20, has_enemy=True),
-    Platform(200, 250, 120, 20, has_enemy=False),
-]
-
-platforms = [plat.rect for plat in platform_data]
+# Sound effects: small mixer buffer, fixed channel pool, decoded up front on
+# the audio thread; the game only queues requests (see modules.Audio).
+audio = AudioEngine(channels=8, buffer=256).start()
+
+# Warm start: every frame comes from the on-disk atlas. The rest (background,
+# and the PNGs when the atlas is stale) decodes on worker threads while the
+# menu is already up.
+atlas_loaded = SpriteManager.load_disk_cache(build=False)
+assets = AssetLoader().start(kinds=("image",))
+if not atlas_loaded:
+    assets.rebuild_sprite_cache(SpriteManager.sprite_cache(), SpriteManager.install_atlas)
+sky = None  # Actor of the background, created on first use
+
+# The simulation (hero, enemies, platforms, score, game state) lives in World
+# and runs without the screen; this file only feeds it input and draws it.
+world = World()
+hero = world.hero
+GROUND = Rect(0, world.ground_y, world.width, HEIGHT - world.ground_y)
+scheduler = FixedStepScheduler(world.timestep, max_steps=5)  # physics runs at its own rate
+renderer = Renderer((WIDTH, HEIGHT))  # static world cached, only moving parts redrawn
+camera = Camera((WIDTH, HEIGHT), world.width)  # follows the hero; only what it sees is drawn
+text_cache = TextCache()  # HUD and screen texts are rasterized once
+TRACE_PATH = "profile_trace.json"  # F4 writes a Chrome/Perfetto trace here
+TRACE_FRAMES = 300
+
+# PLATFORMER_RECORD=run.rpl records the session's input, saved on exit;
+# replay it with: python -m modules.Headless --replay run.rpl
+RECORD_PATH = os.environ.get("PLATFORMER_RECORD")
+recorder = None
+if RECORD_PATH:
+    recorder = InputRecorder(world)
+    atexit.register(recorder.save, RECORD_PATH)
 
 
-def spawn_all_enemies():
-    """Create enemies on all platforms that should have them."""
-    global enemies
-    enemies = []
-    
-    # Spawn enemies on platforms
-    for plat in platform_data:
-        enemy = plat.spawn_enemy()
-        if enemy:
-            enemies.append(enemy)
-
-spawn_all_enemies()
-SCORE_TO_WIN = len(enemies) # Update score to win based on number of enemies
-
 def update(dt):
     """
     Function called automatically to update the game state.
     'dt' is the time elapsed since the last call (in seconds).
     """
-    screen.fill((0, 0, 0)) # Clear screen with black
-    
-    global game_state, gameover_timer
-
-    if game_state == "menu":
-        draw_menu()
-    elif game_state == "playing":
-        draw_game()
-        hero.update(dt, platforms)
-        for enemy in enemies:
-            enemy.update(dt, hero)
-        
-        if  hero.is_dead:
-            gameover_timer += dt
-            if gameover_timer >= 1:  # 2s delay 
-                game_state = "gameover"
-
-        for proj in hero.projectiles:
-             for enemy in enemies:
-                if proj.alive and not enemy.is_dead and enemy.actor.colliderect(proj.rect):
-                    enemy.take_damage(10)
-                    proj.alive = False
-                    
-                    # Incrementa o score when enemy is dead
-                    if enemy.is_dead:
-                        global score
-                        score += 1
-                        
-                        # Verify if player won
-                        if score >= SCORE_TO_WIN:
-                            game_state = "win"
-                        
-
-    elif game_state == "gameover":
-        draw_gameover()
-        reset_hero()
-
-    elif game_state == "win":
+    profiler.next_frame()
+    assets.poll()
+    with profiler.scope("update"):
+        controls = Controls.from_keyboard(keyboard)
+        for _ in range(scheduler.advance(dt)):
+            if recorder is not None:
+                recorder.record(controls)
+            world.step(controls)
+            play_sounds(hero.sound_events)
+
+
+def draw():
+    """
+    Function called automatically to render the current world state.
+    """
+    global last_drawn_state
+    if world.game_state != last_drawn_state:
+        renderer.invalidate()  # another screen was shown: repaint everything
+        last_drawn_state = world.game_state
+
+    with profiler.scope("draw"):
+        if world.game_state != "playing":
+            screen.fill((0, 0, 0)) # Clear screen with black
+
+        if world.game_state == "menu":
+            draw_menu()
+        elif world.game_state == "playing":
+            with profiler.scope("draw_game"):
+                draw_game()
+        elif world.game_state == "gameover":
+            draw_gameover()
+        elif world.game_state == "win":
             draw_victory()
-            for enemy in enemies:
-                enemy.health = 100
-                enemy.is_dead = False 
-                reset_hero()
+
+    if world.game_state != "playing":
+        draw_profiler()  # the playing screen draws it inside its dirty rects
+
+
+def send(command):
+    """Apply a menu command to the world (and to the recording, if any)."""
+    world.command(command)
+    if recorder is not None:
+        recorder.command(command)
+
+
+def play_sounds(names):
+    """Queue the sound effects triggered during the last simulation step."""
+    for name in names:
+        audio.play(name)
 
 
 def draw_menu():
@@ -121,107 +132,111 @@ def draw_menu():
     screen.fill((56,24,76))
 
   # Title
-    screen.draw.text(
-        "PLATFORMER GAME",
-        center=(WIDTH/2, HEIGHT/2 - 100),
-        color=(255, 255, 255),
-        fontsize=60
-    )
+    text_cache.draw(screen.surface, "PLATFORMER GAME", (WIDTH/2, HEIGHT/2 - 100),
+                    fontsize=60, color=(255, 255, 255), anchor="center")
+
+    # Assets still decoding in the background
+    if not assets.done:
+        text_cache.draw_counter(screen.surface, "Loading ", f"{int(assets.progress * 100)}%",
+                                (WIDTH/2, HEIGHT/2 - 50), fontsize=25, color=(200, 200, 200),
+                                anchor="center")
 
     screen.draw.filled_rect(start_button, (50, 200, 50))
-    screen.draw.text("START GAME", center=start_button.center, fontsize=25, color=(255, 255, 255))
+    text_cache.draw(screen.surface, "START GAME", start_button.center,
+                    fontsize=25, color=(255, 255, 255), anchor="center")
     
     sound_color = (50, 200, 50) if music_on else (200, 50, 50)
     screen.draw.filled_rect(sound_button, sound_color)
-    screen.draw.text(f"SOUND: {'ON' if music_on else 'OFF'}", center=sound_button.center, fontsize=25, color=(255, 255, 255))
+    text_cache.draw(screen.surface, f"SOUND: {'ON' if music_on else 'OFF'}", sound_button.center,
+                    fontsize=25, color=(255, 255, 255), anchor="center")
     
     screen.draw.filled_rect(back_menu_button, (50, 200, 50))
-    screen.draw.text("Press M back to menu", center=back_menu_button.center, fontsize=25, color=(255, 255, 255))
+    text_cache.draw(screen.surface, "Press M back to menu", back_menu_button.center,
+                    fontsize=25, color=(255, 255, 255), anchor="center")
 
     screen.draw.filled_rect(exit_button, (200, 50, 50))
-    screen.draw.text("Exit", center=exit_button.center, fontsize=25, color=(255, 255, 255))
+    text_cache.draw(screen.surface, "Exit", exit_button.center,
+                    fontsize=25, color=(255, 255, 255), anchor="center")
 
 
 def draw_game():
     """
     Draws the main game screen.
     """
-    # background
-    sky.draw()
-    # Character
-    hero.draw(screen)
-    for enemy in enemies:
-        if not enemy.is_dead:
-            enemy.draw()
-
-
-    # Environment - Ground
-    screen.draw.filled_rect(Rect(0,550,800,50), (109, 83, 166))
-
-    # Platforms
-    for plat in platforms:
-            screen.draw.filled_rect(plat, (109, 83, 166))
-            screen.draw.rect(plat, (109, 83, 166))
+    # The camera follows the hero; only platforms and enemies near its view
+    # are looked at, so the cost does not grow with the level.
+    alpha = scheduler.alpha  # interpolate between the last two physics ticks
+    camera.follow(lerp(hero.prev_pos[0], hero.actor.x, alpha))
+    area = camera.area
+    offset = camera.offset
+
+    # Background, ground and platforms: one cached layer, rebuilt only
+    # when the level or the camera moves; otherwise only last frame's
+    # moving parts are restored.
+    global sky
+    if sky is None:
+        assets.require("background")
+        sky = Actor("background", (WIDTH // 2, HEIGHT // 2))
+    static = [camera.to_screen(GROUND.clip(area))]
+    static += [camera.to_screen(rect) for rect in world.platform_grid.query(area)]
+    renderer.set_static(sky._surf, sky.topleft, static, WORLD_COLOR)
+    renderer.begin(screen.surface)
+
+    # Characters: queued by layer and drawn with one blits call per layer
+    slots = [enemy.index for enemy in world.enemy_grid.query(area)]
+    renderer.queue_many("enemies", world.enemy_pool.sprites(slots, alpha, offset))
+    hero.queue(renderer, alpha, offset)
+    renderer.flush(screen.surface)
 
     # HUD
-    draw_hud()
+    with profiler.scope("draw_hud"):
+        for rect in draw_hud():
+            renderer.mark(rect)
+    renderer.mark(draw_profiler())
+    renderer.end()
 
 
 def draw_hud():
-    """Draw heads-up display information."""
-    screen.draw.text(f"Lives: {hero.health}", (10, 10), 
-                    fontsize=30, color=(255, 255, 255))
-    screen.draw.text(f"Score: {score}/{SCORE_TO_WIN}", (10, 50), 
-                    fontsize=30, color=(255, 215, 0))
-    
-    enemies_alive = sum(not enemy.is_dead for enemy in enemies)
-    screen.draw.text(f"Enemies: {enemies_alive}", (WIDTH - 150, 10), 
-                    fontsize=25, color=(255, 100, 100))
+    """Draw heads-up display information and return the drawn rects."""
+    target = screen.surface
+    enemies_alive = sum(not enemy.is_dead for enemy in world.enemies)
+    return [
+        text_cache.draw_counter(target, "Lives: ", str(hero.health), (10, 10),
+                                fontsize=30, color=(255, 255, 255)),
+        text_cache.draw_counter(target, "Score: ", f"{world.score}/{world.score_to_win}", (10, 50),
+                                fontsize=30, color=(255, 215, 0)),
+        text_cache.draw_counter(target, "Enemies: ", str(enemies_alive), (WIDTH - 150, 10),
+                                fontsize=25, color=(255, 100, 100)),
+    ]
+
+
+def draw_profiler():
+    """Draw the profiler overlay (F3) and return its rect, or None."""
+    if profiler.show_overlay:
+        return profiler.draw_overlay(screen.surface, text_cache)
+    return None
 
 
 def draw_gameover():
     """Game Over Screen."""
-    screen.draw.text(
-        "GAME OVER",
-        center=(WIDTH/2, HEIGHT/2 - 50),
-        color=(255, 0, 0),
-        fontsize=80
-    )
-    screen.draw.text(
-        f"Score: {score}",
-        center=(WIDTH/2, HEIGHT/2 + 20),
-        color=(255, 255, 255),
-        fontsize=40
-    )
-    screen.draw.text(
-        "Press ENTER to return to menu",
-        center=(WIDTH/2, HEIGHT/2 + 50),
-        color=(255, 255, 255),
-        fontsize=30
-    )
+    target = screen.surface
+    text_cache.draw(target, "GAME OVER", (WIDTH/2, HEIGHT/2 - 50),
+                    fontsize=80, color=(255, 0, 0), anchor="center")
+    text_cache.draw_counter(target, "Score: ", str(world.score), (WIDTH/2, HEIGHT/2 + 20),
+                            fontsize=40, color=(255, 255, 255), anchor="center")
+    text_cache.draw(target, "Press ENTER to return to menu", (WIDTH/2, HEIGHT/2 + 50),
+                    fontsize=30, color=(255, 255, 255), anchor="center")
 
 
 def draw_victory():
     """Victory Screen."""
-    global score
-    screen.draw.text(
-        "YOU WIN!",
-        center=(WIDTH/2, HEIGHT/2 - 50),
-        color=(0, 255, 0),
-        fontsize=80
-    )
-    screen.draw.text(
-        f"Score: {score}/{SCORE_TO_WIN}",
-        center=(WIDTH/2, HEIGHT/2 + 20),
-        color=(255, 215, 0),
-        fontsize=40
-    )
-    screen.draw.text(
-        "Press ENTER to return to menu",
-        center=(WIDTH/2, HEIGHT/2 + 50),
-        color=(255, 255, 255),
-        fontsize=30
-    )
+    target = screen.surface
+    text_cache.draw(target, "YOU WIN!", (WIDTH/2, HEIGHT/2 - 50),
+                    fontsize=80, color=(0, 255, 0), anchor="center")
+    text_cache.draw_counter(target, "Score: ", f"{world.score}/{world.score_to_win}", (WIDTH/2, HEIGHT/2 + 20),
+                            fontsize=40, color=(255, 215, 0), anchor="center")
+    text_cache.draw(target, "Press ENTER to return to menu", (WIDTH/2, HEIGHT/2 + 50),
+                    fontsize=30, color=(255, 255, 255), anchor="center")
 
 
 
@@ -230,30 +245,29 @@ def on_key_down(key):
     Function called automatically when a key is pressed.
     'key' is the key that was pressed.
     """
-    global game_state
-
-    if game_state == "menu":
+    # Profiler: F3 toggles the overlay, F4 records a trace of the next frames
+    if key == keys.F3:
+        profiler.show_overlay = not profiler.show_overlay
+        profiler.enabled = profiler.show_overlay or profiler.capturing
+        profiler.reset()
+        return
+    elif key == keys.F4 and not profiler.capturing:
+        profiler.capture(TRACE_FRAMES, TRACE_PATH)
+        return
+
+    if world.game_state == "menu":
         if key == keys.RETURN:
-            game_state = "playing"
+            send("start")
         elif key == keys.ESCAPE:
             exit() # Exit the game
             
-    elif game_state == "playing":
+    elif world.game_state == "playing":
         if key == keys.M:
-            game_state = "menu"
+            send("menu")
 
-    elif game_state == "gameover":
-        global gameover_timer
-        if key == keys.RETURN:
-            game_state = "menu"
-            hero.health = 100
-            hero.is_dead = False
-            gameover_timer = 0
-    elif game_state == "win":
+    elif world.game_state in ("gameover", "win"):
         if key == keys.RETURN:
-            global score
-            game_state = "menu"
-            score = 0
+            send("menu")  # also revives the hero / clears the score
 
 
 def on_mouse_down(pos):
@@ -268,8 +282,7 @@ def on_mouse_down(pos):
         start_music()
 
     elif start_button.collidepoint(pos):
-        global game_state
-        game_state = "playing"
+        send("start")
 
     elif exit_button.collidepoint(pos):
         exit()
@@ -278,13 +291,9 @@ def on_mouse_down(pos):
     
 def start_music():
     if music_on:
-        try:
-            music.play("background")
-            music.set_volume(0.6)
-        except Exception:
-            pass
+        audio.play_music("background", volume=0.6)
     else:
-        music.stop()
+        audio.stop_music()
 
 
 start_music()
@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+# type: ignore
+# modules/Animation.py
+import numpy as np
+from pgzero.builtins import images
+
+from modules.Sprite import SpriteManager
+
+# how a clip behaves after its last frame
+LOOP, HOLD, ONCE = range(3)  # start over / stay on it / end (and play ``next``)
+
+
+class AnimationClip:
+    """An animation shared by every entity that plays it.
+
+    A clip never changes after it is made. It holds frame names, the delay
+    between frames, and what happens after the last frame (``mode``).
+    The surfaces for both facings are resolved the first time the clip
+    is shown, as tuples indexed by frame. From then on, showing a frame is
+    a tuple lookup rather than an image lookup by name.
+
+    Attributes:
+        name (str): the clip's name within its AnimationSet.
+        names (tuple): image names of the frames.
+        delay (float): seconds per frame.
+        mode (int): LOOP, HOLD or ONCE.
+        next (str): clip played when a ONCE clip ends.
+        events (dict): frame index -> event name, reported by Animator.advance
+            when that frame is reached.
+    """
+
+    __slots__ = ("name", "names", "delay", "mode", "next", "events", "_right", "_left")
+
+    def __init__(self, name, names, delay, mode=LOOP, next=None, events=None):
+        self.name = name
+        self.names = tuple(names)
+        self.delay = delay
+        self.mode = mode
+        self.next = next
+        self.events = dict(events or {})
+        self._right = None
+        self._left = None
+
+    def __len__(self):
+        return len(self.names)
+
+    def index(self, frame):
+        """Frame shown for a frame counter (wraps for LOOP, stops at the end otherwise)."""
+        if self.mode == LOOP:
+            return frame % len(self.names)
+        return min(frame, len(self.names) - 1)
+
+    def surfaces(self, direction=1):
+        """Frame surfaces facing right (``direction`` 1) or left (-1)."""
+        if direction == -1:
+            if self._left is None:
+                self._left = tuple(SpriteManager.flip_image_horizontal(name) for name in self.names)
+            return self._left
+        if self._right is None:
+            self._right = tuple(images.load(name) for name in self.names)
+        return self._right
+
+
+class AnimationSet:
+    """The clips of one kind of entity, numbered for per-entity state.
+
+    Entities store just a clip id, a frame counter and a timer. ``advance``
+    steps any number of them in one vectorized pass over those arrays
+    (see EnemyPool); Animator does the same for a single entity.
+    """
+
+    def __init__(self, clips):
+        self.clips = tuple(clips)
+        self.ids = {clip.name: i for i, clip in enumerate(self.clips)}
+        self.delay = np.array([clip.delay for clip in self.clips], dtype=np.float64)
+        self.length = np.array([len(clip) for clip in self.clips], dtype=np.int64)
+        self.mode = np.array([clip.mode for clip in self.clips], dtype=np.int8)
+
+    def __getitem__(self, clip_id):
+        return self.clips[clip_id]
+
+    def id(self, name):
+        return self.ids[name]
+
+    def advance(self, clip, frame, timer, mask, dt):
+        """Step the masked entities' animations by ``dt`` seconds.
+
+        ``clip``, ``frame`` and ``timer`` are per-entity arrays (clip ids,
+        frame counters, seconds since the last frame), updated in place.
+        Returns the mask of entities whose ONCE clip just ended; what they
+        play next is up to the caller.
+        """
+        timer[mask] += dt
+        length = self.length[clip]
+        mode = self.mode[clip]
+        step = mask & (timer >= self.delay[clip]) & ((mode != HOLD) | (frame < length - 1))
+        timer[step] = 0.0
+        frame[step] += 1
+        loop = step & (mode == LOOP)
+        frame[loop] = frame[loop] % length[loop]
+        return step & (mode == ONCE) & (frame >= length)
+
+
+class Animator:
+    """Animation state of one entity: a clip of an AnimationSet, a frame, a timer."""
+
+    __slots__ = ("animations", "clip", "frame", "timer")
+
+    def __init__(self, animations, clip):
+        self.animations = animations
+        self.play(clip)
+
+    @property
+    def name(self):
+        return self.clip.name
+
+    def play(self, name):
+        """Start clip ``name`` from its first frame."""
+        self.clip = self.animations[self.animations.id(name)]
+        self.frame = 0
+        self.timer = 0.0
+
+    def advance(self, dt):
+        """Step by ``dt`` seconds; return the event of the frame reached, if any.
+
+        When a ONCE clip passes its last frame, its ``next`` clip starts and
+        "end" is returned.
+        """
+        clip = self.clip
+        self.timer += dt
+        if self.timer < clip.delay:
+            return None
+        if clip.mode == HOLD and self.frame >= len(clip) - 1:
+            return None
+        self.timer = 0.0
+        self.frame += 1
+        if self.frame >= len(clip):
+            if clip.mode == LOOP:
+                self.frame = 0
+            elif clip.mode == ONCE:
+                self.play(clip.next)
+                return "end"
+        return clip.events.get(self.frame)
+
+    def show(self, actor, direction=1):
+        """Put the current frame, facing ``direction``, on ``actor``."""
+        show_frame(actor, self.clip, self.clip.index(self.frame), direction)
+
+
+def show_frame(actor, clip, index, direction=1, pos=None):
+    """Put frame ``index`` of ``clip`` on ``actor``, and move its anchor to ``pos`` if given.
+
+    The surface is written straight into the Actor's ``__dict__``, past
+    ``Actor.__setattr__`` and ``actor.image`` (no lookup by name); the
+    anchor is recomputed only when the frame size changes.
+    """
+    surfaces = clip._left if direction == -1 else clip._right
+    if surfaces is None:
+        surfaces = clip.surfaces(direction)
+    surface = surfaces[index]
+    state = actor.__dict__
+    rect = state["_rect"]
+    if surface is not state["_surf"]:
+        state["_surf"] = state["_orig_surf"] = surface
+        state["_image_name"] = clip.names[index]
+        if surface.get_size() != (rect.w, rect.h):
+            actor._update_pos()
+    if pos is not None:
+        ax, ay = state["_anchor"]
+        rect.topleft = (pos[0] - ax, pos[1] - ay)
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+# type: ignore
+# modules/Assets.py
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pygame
+from pgzero import loaders
+from pgzero.builtins import images, sounds
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".gif")
+SOUND_EXTENSIONS = (".wav", ".ogg")
+
+
+def _decode_image(path):
+    return pygame.image.load(path)
+
+
+def _decode_sound(path):
+    if not pygame.mixer.get_init():
+        return None  # no audio device: play_sounds already copes without sounds
+    return pygame.mixer.Sound(path)
+
+
+class AssetLoader:
+    """Decodes the images/ and sounds/ folders on a thread pool.
+
+    ``start`` queues every file that is not loaded yet, and the game keeps
+    running (showing the menu) while worker threads decode them. The game
+    loop calls ``poll`` once per frame. It moves finished assets into the
+    Pygame Zero ``images`` and ``sounds`` caches. Surfaces are converted
+    to the display format there, on the main thread. ``require`` blocks on
+    one asset that is needed right now. Anything never queued still loads
+    the normal, synchronous way on first use.
+
+    With a stale sprite cache, ``rebuild_sprite_cache`` packs and writes
+    the atlas on a worker thread once every PNG has been decoded, so the
+    next start is warm.
+
+    Attributes:
+        loaded (int): assets installed so far.
+        total (int): assets queued.
+    """
+
+    def __init__(self, root=None, workers=4):
+        self.root = root or loaders.root
+        self.workers = workers
+        self.loaded = 0
+        self.total = 0
+        self._executor = None
+        self._pending = {}  # (kind, name) -> Future
+        self._decoded = {}  # image name -> decoded surface, for the sprite cache
+        self._sprite_cache = None
+        self._sprite_job = None
+        self.on_atlas = None  # called with the rebuilt TextureAtlas
+
+    # -------------------------------
+    # QUEUEING
+    # -------------------------------
+    def start(self, kinds=("image", "sound")):
+        """Queue every image and sound that is not in the loader caches yet.
+
+        ``kinds`` limits this to images or sounds (the game leaves its
+        sounds to the AudioEngine).
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="assets")
+        for kind, loader, folder, extensions, decode in (
+            ("image", images, "images", IMAGE_EXTENSIONS, _decode_image),
+            ("sound", sounds, "sounds", SOUND_EXTENSIONS, _decode_sound),
+        ):
+            if kind not in kinds:
+                continue
+            directory = os.path.join(self.root, folder)
+            if not os.path.isdir(directory):
+                continue
+            for filename in sorted(os.listdir(directory)):
+                name, ext = os.path.splitext(filename)
+                if ext.lower() not in extensions:
+                    continue
+                if loader.cache_key(name, (), {}) in loader.cache or (kind, name) in self._pending:
+                    continue
+                path = os.path.join(directory, filename)
+                self._pending[(kind, name)] = self._executor.submit(decode, path)
+                self.total += 1
+        return self
+
+    def rebuild_sprite_cache(self, sprite_cache, on_atlas=None):
+        """Rebuild ``sprite_cache`` in the background from the decoded PNGs.
+
+        ``on_atlas`` is called on the main thread, from ``poll``, with the
+        new TextureAtlas.
+        """
+        self._sprite_cache = sprite_cache
+        self.on_atlas = on_atlas
+        self.total += 1
+
+    # -------------------------------
+    # MAIN THREAD
+    # -------------------------------
+    @property
+    def progress(self):
+        """Fraction of the queued assets that are installed (1.0 when idle)."""
+        return self.loaded / self.total if self.total else 1.0
+
+    @property
+    def done(self):
+        return self.loaded == self.total
+
+    def poll(self):
+        """Install every asset that finished decoding; return ``progress``."""
+        if self.done:
+            return 1.0
+        for key, future in list(self._pending.items()):
+            if future.done():
+                self._install(key, future)
+
+        if self._sprite_cache is not None and self._sprite_job is None and not self._pending:
+            decoded, self._decoded = self._decoded, {}
+            self._sprite_job = self._executor.submit(self._sprite_cache.build, decoded)
+        if self._sprite_job is not None and self._sprite_job.done():
+            atlas = self._sprite_job.result()
+            self._sprite_cache = self._sprite_job = None
+            self.loaded += 1
+            if self.on_atlas is not None:
+                self.on_atlas(atlas)
+
+        if self.done:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        return self.progress
+
+    def require(self, name, kind="image"):
+        """Wait for one queued asset and install it now (no-op otherwise)."""
+        future = self._pending.get((kind, name))
+        if future is not None:
+            self._install((kind, name), future)
+
+    def wait(self):
+        """Block until every queued asset is installed."""
+        while not self.done:
+            for key, future in list(self._pending.items()):
+                self._install(key, future)
+            if self._sprite_job is not None:
+                self._sprite_job.result()
+            self.poll()
+
+    def _install(self, key, future):
+        kind, name = key
+        del self._pending[key]
+        self.loaded += 1
+        try:
+            asset = future.result()
+        except (pygame.error, OSError):
+            return  # leave it to the normal loader, which reports the error on use
+        if asset is None:
+            return
+        if kind == "image":
+            if self._sprite_cache is not None:
+                self._decoded[name] = asset
+            loader, asset = images, asset.convert_alpha()
+        else:
+            loader = sounds
+        cache_key = loader.cache_key(name, (), {})
+        if cache_key not in loader.cache:  # loaded synchronously meanwhile
+            loader.cache[cache_key] = asset
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+# type: ignore
+# modules/Atlas.py
+import pygame
+from pygame import Rect
+
+
+class TextureAtlas:
+    """A few sheets holding every animation frame and its flipped twin.
+
+    Frames are handed out as subsurfaces of the sheets, so the whole sprite
+    set lives in a handful of pixel allocations and animation swaps only
+    change which region of a sheet gets blitted.
+
+    Each sheet is one shelf: a row of frames of the same height, cut to the
+    width they use. No sheet has slack, so the atlas holds exactly the
+    pixels of the frames, as loose surfaces would.
+
+    Attributes:
+        sheets (list): the packed sheets (pygame.Surface).
+        rects (dict): maps ``(name, flipped)`` to ``(sheet index, Rect in that sheet)``.
+    """
+
+    PADDING = 0  # blits never sample outside the source rect
+
+    def __init__(self, sheets, rects):
+        self.sheets = sheets
+        self.rects = rects
+        self._frames = {}
+
+    @classmethod
+    def pack(cls, frames, max_width=2048):
+        """Pack ``{name: (surface, flipped_surface)}`` into a new atlas.
+
+        Frames are sorted by height (tallest first) and laid left to right;
+        a new sheet starts when the height changes or the row would pass
+        ``max_width``.
+        """
+        items = []
+        for name, (surface, flipped) in frames.items():
+            items.append(((name, False), surface))
+            items.append(((name, True), flipped))
+        items.sort(key=lambda item: (-item[1].get_height(), item[0]))
+
+        shelves = cls._shelf_pack(items, max_width)
+        sheets = []
+        rects = {}
+        for shelf in shelves:
+            width = sum(surface.get_width() + cls.PADDING for _, surface in shelf) - cls.PADDING
+            sheet = pygame.Surface((width, shelf[0][1].get_height()), pygame.SRCALPHA)
+            sheet.fill((0, 0, 0, 0))
+            x = 0
+            for key, surface in shelf:
+                rects[key] = (len(sheets), Rect((x, 0), surface.get_size()))
+                sheet.blit(surface, (x, 0))
+                x += surface.get_width() + cls.PADDING
+            sheets.append(sheet.convert_alpha())
+        return cls(sheets, rects)
+
+    @classmethod
+    def _shelf_pack(cls, items, width):
+        shelves = []
+        x = 0
+        for key, surface in items:
+            w, h = surface.get_size()
+            if not shelves or h != shelves[-1][0][1].get_height() or x + w > width:
+                shelves.append([])
+                x = 0
+            shelves[-1].append((key, surface))
+            x += w + cls.PADDING
+        return shelves
+
+    def frame(self, name, flipped=False):
+        """Return the frame as a subsurface of its sheet (cached)."""
+        key = (name, flipped)
+        surface = self._frames.get(key)
+        if surface is None:
+            sheet, rect = self.rects[key]
+            surface = self._frames[key] = self.sheets[sheet].subsurface(rect)
+        return surface
+
+    def size(self, name):
+        """Width and height of frame ``name``."""
+        return self.rects[(name, False)][1].size
+
+    def names(self):
+        return sorted({name for name, _ in self.rects})
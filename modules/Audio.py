@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+# type: ignore
+# modules/Audio.py
+import atexit
+import os
+import queue
+import threading
+import time
+from collections import deque
+
+import pygame
+from pgzero import loaders
+
+SOUND_EXTENSIONS = (".wav", ".ogg")
+MUSIC_EXTENSIONS = (".ogg", ".mp3", ".wav")
+
+# effect name -> (priority, minimum seconds between two plays, volume)
+EFFECTS = {
+    "attack": (2, 0.05, 1.0),
+    "jump": (1, 0.08, 0.8),
+}
+DEFAULT_EFFECT = (0, 0.05, 1.0)  # any other file in sounds/
+
+
+class Effect:
+    """A pre-decoded sound and how it competes for channels."""
+
+    __slots__ = ("name", "sound", "priority", "min_interval", "last_played")
+
+    def __init__(self, name, sound, priority, min_interval, volume):
+        self.name = name
+        self.sound = sound
+        self.priority = priority
+        self.min_interval = min_interval
+        self.last_played = None
+        sound.set_volume(volume)
+
+
+class AudioEngine:
+    """Sound effects on a fixed pool of mixer channels, fed from a queue.
+
+    ``start`` launches the audio thread. That thread re-opens the mixer
+    with a small buffer, for lower output latency than the Pygame Zero
+    default. It then decodes every file in sounds/ into the mixer's format,
+    so nothing is decoded while playing. None of this holds up the first
+    frame. Game code calls ``play(name)`` or ``play_music``. These only
+    append to a queue and never wait on the mixer. The audio thread takes
+    requests in order. For each effect it:
+
+    * drops a repeat of an effect that played less than its
+      ``min_interval`` ago (a burst of identical sounds is just louder);
+    * plays it on a free channel of the pool, or else steals the channel
+      of the lowest priority (oldest first) voice, if that voice's
+      priority is not higher than the new one's;
+    * records the latency from ``play`` to the channel accepting the
+      sound.
+
+    Without an audio device the engine disables itself and ``play`` does
+    nothing. Effect names are matched without case ("Jump.wav" is "jump").
+
+    Attributes:
+        enabled (bool): False once the mixer failed to open.
+        played (int): effects submitted to the mixer.
+        rate_limited (int): requests dropped by ``min_interval``.
+        stolen (int): voices cut short to make room.
+        dropped (int): requests dropped for lack of a channel (or sound).
+        latencies (deque): last trigger-to-submit latencies, in ms.
+    """
+
+    def __init__(self, root=None, channels=8, frequency=44100, buffer=256, effects=EFFECTS):
+        self.root = root or loaders.root
+        self.channel_count = channels
+        self.frequency = frequency
+        self.buffer = buffer
+        self.effect_table = effects
+        self.effects = {}
+        self.enabled = False
+        self.played = self.rate_limited = self.stolen = self.dropped = 0
+        self.latencies = deque(maxlen=1000)
+        self._channels = []
+        self._voices = []  # per channel: (priority, start time) of what it plays
+        self._queue = queue.SimpleQueue()
+        self._thread = None
+        self._loaded = threading.Event()
+
+    # -------------------------------
+    # SETUP
+    # -------------------------------
+    def start(self):
+        """Start the audio thread, which opens the mixer and preloads the effects."""
+        if self._thread is None:
+            self.enabled = True
+            self._thread = threading.Thread(target=self._run, name="audio", daemon=True)
+            self._thread.start()
+            # never exit while the thread is inside the mixer (pygame's own
+            # exit handler would wait on it forever)
+            atexit.register(self.stop)
+        return self
+
+    def wait_loaded(self, timeout=None):
+        """Block until the mixer is open and the effects decoded (for tools and benchmarks)."""
+        return self._loaded.wait(timeout)
+
+    def _open_mixer(self):
+        try:
+            if pygame.mixer.get_init():
+                pygame.mixer.quit()  # opened by Pygame Zero with its default buffer
+            pygame.mixer.init(self.frequency, -16, 2, self.buffer)
+        except pygame.error as error:
+            print("Audio disabled: %s" % error)
+            return False
+        pygame.mixer.set_num_channels(self.channel_count)
+        self._channels = [pygame.mixer.Channel(i) for i in range(self.channel_count)]
+        self._voices = [(0, 0.0)] * self.channel_count
+        return True
+
+    def _preload(self):
+        directory = os.path.join(self.root, "sounds")
+        if not os.path.isdir(directory):
+            return
+        for filename in sorted(os.listdir(directory)):
+            name, ext = os.path.splitext(filename)
+            if ext.lower() not in SOUND_EXTENSIONS:
+                continue
+            try:
+                sound = pygame.mixer.Sound(os.path.join(directory, filename))
+            except pygame.error as error:
+                print("Could not load sound %s: %s" % (filename, error))
+                continue
+            key = name.lower()
+            self.effects[key] = Effect(key, sound, *self.effect_table.get(key, DEFAULT_EFFECT))
+
+    # -------------------------------
+    # GAME THREAD
+    # -------------------------------
+    def play(self, name):
+        """Queue effect ``name``; returns at once."""
+        if self.enabled:
+            self._queue.put((self._submit, name, time.perf_counter()))
+
+    def stop(self):
+        """Stop the audio thread once the requests already queued are done."""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def play_music(self, name, volume=1.0):
+        """Queue looping music/<name>.* in the background."""
+        if self.enabled:
+            self._queue.put((self._play_music, name, volume))
+
+    def stop_music(self):
+        if self.enabled:
+            self._queue.put((self._stop_music,))
+
+    def latency_stats(self):
+        """``(mean, p99, max)`` trigger-to-submit latency in ms, or None."""
+        if not self.latencies:
+            return None
+        values = sorted(self.latencies)
+        return (sum(values) / len(values), values[int(len(values) * 0.99)], values[-1])
+
+    # -------------------------------
+    # AUDIO THREAD
+    # -------------------------------
+    def _run(self):
+        if not self._open_mixer():
+            self.enabled = False
+            self._loaded.set()
+            return
+        self._preload()
+        self._loaded.set()
+        while True:
+            request = self._queue.get()
+            if request is None:
+                return
+            request[0](*request[1:])
+
+    def _play_music(self, name, volume):
+        directory = os.path.join(self.root, "music")
+        for ext in MUSIC_EXTENSIONS:
+            path = os.path.join(directory, name + ext)
+            if os.path.exists(path):
+                break
+        else:
+            print("No music file for %r" % name)
+            return
+        try:
+            pygame.mixer.music.load(path)
+            pygame.mixer.music.set_volume(volume)
+            pygame.mixer.music.play(-1)
+        except pygame.error as error:
+            print("Could not play music %s: %s" % (path, error))
+
+    def _stop_music(self):
+        pygame.mixer.music.stop()
+
+    def _submit(self, name, triggered):
+        effect = self.effects.get(name.lower())
+        if effect is None:
+            self.dropped += 1
+            return
+        now = time.perf_counter()
+        if effect.last_played is not None and now - effect.last_played < effect.min_interval:
+            self.rate_limited += 1
+            return
+
+        channel = self._pick_channel(effect.priority)
+        if channel is None:
+            self.dropped += 1
+            return
+        self._channels[channel].play(effect.sound)
+        submitted = time.perf_counter()
+        self._voices[channel] = (effect.priority, submitted)
+        effect.last_played = submitted
+        self.played += 1
+        self.latencies.append((submitted - triggered) * 1000)
+
+    def _pick_channel(self, priority):
+        """A free channel, else the one to steal, else None."""
+        victim = None
+        for i, channel in enumerate(self._channels):
+            if not channel.get_busy():
+                return i
+            if victim is None or self._voices[i] < self._voices[victim]:
+                victim = i
+        if victim is not None and self._voices[victim][0] <= priority:
+            self.stolen += 1
+            return victim
+        return None
@@ -0,0 +1,226 @@
+# -*- coding: utf-8 -*-
+# type: ignore
+# modules/Batch.py
+"""Run many headless games across a process pool, for balancing sweeps.
+
+    python -m modules.Batch --set enemy_attack_damage=5,10,20 --runs 20 --out results.jsonl
+    python -m modules.Batch --set hero_jump_strength=-800,-900 --set enemy_speed=100,160 \\
+        --policy random --runs 50 --frames 7200
+
+Every combination of the ``--set`` values is played ``--runs`` times, each
+run with its own seed, by one worker process per CPU core. Each result is
+appended to the ``--out`` file (one JSON object per line) as soon as it
+arrives. At the end, a table reports win rate, time to win and damage
+taken per parameter set, and simulated frames per second per core.
+"""
+import argparse
+import itertools
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+# balancing parameter -> (object it is set on, attribute)
+PARAMETERS = {
+    "score_to_win": ("world", "score_to_win"),
+    "enemy_speed": ("enemies", "base_speed"),
+    "enemy_attack_cooldown": ("enemies", "base_attack_cooldown"),
+    "enemy_attack_damage": ("enemies", "base_attack_damage"),
+    "enemy_health": ("enemies", "base_health"),
+    "hero_speed": ("hero", "speed"),
+    "hero_jump_strength": ("hero", "jump_strength"),
+    "hero_gravity": ("hero", "gravity"),
+}
+OUTCOMES = {"win": "win", "gameover": "death"}  # final game_state -> outcome; else "timeout"
+
+_startup = None  # seconds this worker spent warming up
+
+
+# -------------------------------
+# WORKER
+# -------------------------------
+def warm_up(root=None):
+    """Pool initializer: load pygame, the game modules and the sprites once per worker."""
+    global _startup
+    start = time.perf_counter()
+    # SDL would otherwise catch SIGTERM, and Pool.terminate could not stop the worker
+    os.environ.setdefault("SDL_NO_SIGNAL_HANDLERS", "1")
+    from modules.Headless import ROOT, setup
+    setup(root or ROOT)
+    from modules.Sprite import SpriteManager
+    from modules.World import World
+    SpriteManager.load_disk_cache()
+    World(seed=0)  # touches the level file and every module a run needs
+    _startup = time.perf_counter() - start
+
+
+def apply_parameters(world, params):
+    """Set balancing parameters on a fresh world (see PARAMETERS)."""
+    owners = {"world": world, "hero": world.hero, "enemies": world.enemy_pool}
+    for name, value in params.items():
+        owner, attribute = PARAMETERS[name]
+        setattr(owners[owner], attribute, value)
+    if any(PARAMETERS[name][0] == "enemies" for name in params):
+        world.spawn_all_enemies()  # the first chunks spawned with the defaults
+        world.checkpoint()
+
+
+def simulate(task):
+    """Play one game to a win, a death or ``frames`` ticks; return its metrics."""
+    from modules.Headless import POLICIES
+    from modules.World import World
+    start = time.process_time()
+    world = World(seed=task["seed"])
+    apply_parameters(world, task["params"])
+    world.command("start")
+    policy = POLICIES[task["policy"]](task["seed"])
+    step = world.step
+    for frame in range(task["frames"]):
+        step(policy(world))
+        if world.game_state != "playing":
+            break
+    frames = world.frame
+    return {
+        "params": task["params"],
+        "policy": task["policy"],
+        "seed": task["seed"],
+        "outcome": OUTCOMES.get(world.game_state, "timeout"),
+        "frames": frames,
+        "game_seconds": frames * world.timestep,
+        "score": world.score,
+        "score_to_win": world.score_to_win,
+        "damage_taken": world.hero.damage_taken,
+        "cpu_seconds": time.process_time() - start,
+        "worker": os.getpid(),
+        "worker_startup": _startup,
+    }
+
+
+# -------------------------------
+# RUNNER
+# -------------------------------
+def parameter_sets(assignments):
+    """``["name=v1,v2", ...]`` -> every combination, as a list of dicts."""
+    names, choices = [], []
+    for assignment in assignments:
+        name, _, values = assignment.partition("=")
+        if name not in PARAMETERS:
+            raise ValueError("unknown parameter %r (known: %s)" % (name, ", ".join(PARAMETERS)))
+        names.append(name)
+        choices.append([json.loads(value) for value in values.split(",")])
+    return [dict(zip(names, combo)) for combo in itertools.product(*choices)]
+
+
+def make_tasks(sets, runs, policy, frames, seed=0):
+    """One task per parameter set and run; run n of every set uses seed ``seed + n``."""
+    return [{"params": params, "policy": policy, "frames": frames, "seed": seed + n}
+            for params in sets for n in range(runs)]
+
+
+class BatchRunner:
+    """Runs tasks on a pool of warm worker processes and streams the results.
+
+    The workers are started once and load pygame, the sprites and the level
+    in ``warm_up``; every task after that only builds a World and plays. The
+    pool is ordinary ``multiprocessing``, so results come back in completion
+    order.
+
+    Attributes:
+        workers (int): worker processes (default: one per CPU core).
+        results (list): metrics of every finished task.
+    """
+
+    def __init__(self, workers=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.results = []
+
+    def run(self, tasks, out=None, progress=None):
+        """Run every task; append each result to ``out`` (JSON lines) as it arrives.
+
+        Returns the wall time in seconds, worker startup included.
+        """
+        start = time.perf_counter()
+        with multiprocessing.Pool(self.workers, initializer=warm_up) as pool:
+            for result in pool.imap_unordered(simulate, tasks):
+                self.results.append(result)
+                if out is not None:
+                    out.write(json.dumps(result) + "\n")
+                    out.flush()
+                if progress is not None:
+                    progress(len(self.results), len(tasks))
+            pool.close()
+            pool.join()
+        return time.perf_counter() - start
+
+    def summary(self):
+        """Per parameter set: runs, win rate, mean time to win, mean damage taken."""
+        groups = {}
+        for result in self.results:
+            groups.setdefault(json.dumps(result["params"], sort_keys=True), []).append(result)
+        rows = []
+        for key, results in groups.items():
+            wins = [r for r in results if r["outcome"] == "win"]
+            rows.append({
+                "params": json.loads(key),
+                "runs": len(results),
+                "win_rate": len(wins) / len(results),
+                "deaths": sum(r["outcome"] == "death" for r in results),
+                "time_to_win": sum(r["game_seconds"] for r in wins) / len(wins) if wins else None,
+                "damage_taken": sum(r["damage_taken"] for r in results) / len(results),
+            })
+        return sorted(rows, key=lambda row: json.dumps(row["params"], sort_keys=True))
+
+    def throughput(self, wall):
+        """Simulated frames per second: ``(overall, per core)``.
+
+        Per core counts CPU time spent in tasks, so it does not depend on
+        how many cores there are or on worker startup.
+        """
+        frames = sum(r["frames"] for r in self.results)
+        cpu = sum(r["cpu_seconds"] for r in self.results)
+        return frames / wall, frames / cpu if cpu else float("inf")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--set", action="append", default=[], metavar="NAME=V1,V2",
+                        help="parameter values to sweep (%s)" % ", ".join(PARAMETERS))
+    parser.add_argument("--runs", type=int, default=10, help="games per parameter set")
+    parser.add_argument("--policy", default="hunt", help="idle, random or hunt")
+    parser.add_argument("--frames", type=int, default=3600 * 3, help="tick limit per game")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first run")
+    parser.add_argument("--workers", type=int, default=None, help="default: one per core")
+    parser.add_argument("--out", metavar="PATH", default="batch_results.jsonl")
+    args = parser.parse_args(argv)
+
+    sets = parameter_sets(args.set)
+    tasks = make_tasks(sets, args.runs, args.policy, args.frames, args.seed)
+    runner = BatchRunner(args.workers)
+    print("%d games (%d parameter sets x %d runs) on %d workers, results -> %s" % (
+        len(tasks), len(sets), args.runs, runner.workers, args.out))
+
+    def progress(done, total):
+        sys.stdout.write("\r%d/%d" % (done, total))
+        sys.stdout.flush()
+
+    with open(args.out, "w") as out:
+        wall = runner.run(tasks, out, progress)
+    print()
+
+    print("%-40s %5s %6s %7s %9s %8s" % ("parameters", "runs", "win %", "deaths", "win s", "damage"))
+    for row in runner.summary():
+        params = ", ".join("%s=%s" % item for item in sorted(row["params"].items())) or "(defaults)"
+        time_to_win = "%9.1f" % row["time_to_win"] if row["time_to_win"] is not None else "%9s" % "-"
+        print("%-40s %5d %6.0f %7d %s %8.1f" % (
+            params, row["runs"], row["win_rate"] * 100, row["deaths"], time_to_win,
+            row["damage_taken"]))
+    overall, per_core = runner.throughput(wall)
+    startup = max(r["worker_startup"] for r in runner.results)
+    print("%d frames in %.2f s: %.0f frames/s overall, %.0f frames/s per core "
+          "(worker warm-up %.2f s, once per worker)" % (
+              sum(r["frames"] for r in runner.results), wall, overall, per_core, startup))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+# type: ignore
+# modules/Camera.py
+from pygame import Rect
+
+
+class Camera:
+    """Horizontal viewport of the screen onto the level.
+
+    The world is in level coordinates, from 0 to the level width; the
+    camera's ``x`` is the world x shown at the screen's left edge. ``follow``
+    centres a target on screen without showing past either end of the
+    level, so a level one screen wide never scrolls.
+
+    ``view`` is the world Rect on screen and ``area`` is the view grown by
+    ``margin`` on every side: drawing culls against ``area``, so anything
+    outside it is never touched, however long the level is.
+
+    Attributes:
+        size (tuple): screen size in pixels.
+        world_width (int): level width in pixels.
+        margin (int): extra pixels kept around the view when culling.
+        x (int): world x of the screen's left edge.
+    """
+
+    def __init__(self, size, world_width, margin=64):
+        self.size = size
+        self.world_width = world_width
+        self.margin = margin
+        self.x = 0
+
+    def follow(self, x):
+        """Centre world x on screen, clamped to the level."""
+        width = self.size[0]
+        self.x = min(max(int(round(x - width / 2)), 0), max(self.world_width - width, 0))
+
+    @property
+    def offset(self):
+        """What to add to world coordinates to get screen coordinates."""
+        return (-self.x, 0)
+
+    @property
+    def view(self):
+        return Rect((self.x, 0), self.size)
+
+    @property
+    def area(self):
+        margin = self.margin
+        return self.view.inflate(2 * margin, 2 * margin)
+
+    def to_screen(self, rect):
+        """Return a world Rect moved to screen coordinates."""
+        return rect.move(-self.x, 0)
@@ -1,266 +1,139 @@
 # -*- coding: utf-8 -*-
 # type: ignore
-import random
 from pgzero.builtins import Actor
 from pygame import Rect
-from modules.Sprite import SpriteManager
+from modules.Animation import show_frame
+from modules.EnemyPool import STATE_NAMES, EnemyPool
+from modules.Scheduler import draw_interpolated
 
-class Enemy:
-    def __init__(self, x, y, patrol_width=200):
-        self.actor = Actor("enemy_idle1", (x, y))
-        self.start_x = x
-        self.ground_y = y
-
-    # physics
-        self.vel_y = 0
-        self.gravity = 0.8
-        self.on_ground = True
-
-    # patrol
-        half = patrol_width // 2
-        self.patrol_min_x = x - half
-        self.patrol_max_x = x + half
-        self.speed = 2 + random.random() * 1.5
-        self.direction = random.choice([-1, 1])
-
-    # combat
-        self.health = 50
-        self.is_dead = False
-        self.attack_damage = 10
-        self.detection_radius = 10
-        self.attack_range = 10
-        self.attack_cooldown = 1.5
-        self._time_since_last_attack = 0.0
-
-    # animations
-        self.idle_frames = ["enemy_idle1", "enemy_idle2", "enemy_idle3", "enemy_idle4"]
-        self.run_frames = [
-            "enemy_run1",
-            "enemy_run2",
-            "enemy_run3",
-            "enemy_run4",
-            "enemy_run5",
-        ]
-        self.death_frames = [
-            "enemy_dead1",
-            "enemy_dead2",
-            "enemy_dead3",
-            "enemy_dead4",
-            "enemy_dead5",
-            "enemy_dead6",
-        ]
-        self.attack_frames = [
-            "enemy_attack1",
-            "enemy_attack2",
-            "enemy_attack3",
-            "enemy_attack4",
-            "enemy_attack5",
-            "enemy_attack6",
-        ]
-
-        self.frame_index = 0
-        self.frame_delay = 0.16
-        self._anim_timer = 0.0
-
-        # state
-        self.state = "patrol"
-
-        # Preload all flipped versions of frames into caches
-        self.flipped_idle_frames = SpriteManager.preload_flipped_frames(self.idle_frames)
-        self.flipped_run_frames = SpriteManager.preload_flipped_frames(self.run_frames)
-        self.flipped_death_frames = SpriteManager.preload_flipped_frames(self.death_frames)
-        self.flipped_attack_frames = SpriteManager.preload_flipped_frames(self.attack_frames)
-
-        # Set initial image based on direction/state
-        self._apply_directioned_image()
 
-        # attack control
-        self.is_attacking = False
-        self._attack_timer = 0.0
-        self.has_damaged = False  # Tracks if this attack already damaged the hero
+class _PoolField:
+    """Attribute of an Enemy that reads and writes its slot in the pool."""
 
-    def update(self, dt, hero):
-        if self.is_dead:
-            self._update_death(dt)
-            return
+    def __init__(self, array, cast):
+        self.array = array
+        self.cast = cast
 
-    # timers
-        self._time_since_last_attack += dt
+    def __get__(self, enemy, owner):
+        if enemy is None:
+            return self
+        return self.cast(getattr(enemy.pool, self.array)[enemy.index])
 
-    # simple gravity
-        self.vel_y += self.gravity
-        self.actor.y += self.vel_y
-        if self.actor.y >= self.ground_y:
-            self.actor.y = self.ground_y
-            self.vel_y = 0
-            self.on_ground = True
-        else:
-            self.on_ground = False
+    def __set__(self, enemy, value):
+        getattr(enemy.pool, self.array)[enemy.index] = value
 
-    # behavior
-        dist_to_hero = abs(self.actor.x - hero.actor.x)
-        dist_y = abs(self.actor.y - hero.actor.y)
-        same_height = dist_y <= 20
 
-        if self.is_attacking:
-            # during attack, only run animation
-            self._animate_attack(dt, hero)
-            return
+class Enemy:
+    """A single enemy, stored as one slot of an EnemyPool.
 
-        if dist_to_hero <= self.attack_range and same_height and not hero.is_dead:
-            self.state = "attack"
-            self._attack(hero, dt)
-        elif dist_to_hero <= self.detection_radius and same_height and not hero.is_dead:
-            self.state = "chase"
-            self._chase(hero, dt)
-            self._animate_run(dt)
-        else:
-            self.state = "patrol"
-            self._patrol(dt)
-            self._animate_idle(dt)
+    All state lives in the pool's arrays so a whole level advances in one
+    vectorized ``EnemyPool.update``; this class is a thin view over one slot
+    that keeps the per-enemy API. ``actor`` is synced from the pool each
+    time it is read, so move an enemy through ``x``/``y`` rather than by
+    assigning to ``actor``.
 
-    def draw(self):
-        self.actor.draw()
+    Creating an Enemy without a pool gives it a private one-slot pool;
+    ``owner`` is its world's number in a shared pool.
 
-    # -------------------------------
-    # COMPORTAMENTOS
-    # -------------------------------
-    def _patrol(self, dt):
-        self.actor.x += self.direction * self.speed
-        if self.actor.x < self.patrol_min_x:
-            self.actor.x = self.patrol_min_x
-            self.direction = 1
-        elif self.actor.x > self.patrol_max_x:
-            self.actor.x = self.patrol_max_x
-            self.direction = -1
+    Everything an enemy type shares (frames, clips, stats of new enemies)
+    lives on the EnemyPool class and the pool, so an instance is only its
+    ``__slots__``. The Actor is made the first time ``actor`` is read:
+    the game draws and hit-tests enemies from the pool (``EnemyPool.sprites``
+    and ``EnemyPool.box``), so most enemies never need one.
+    """
 
-    def _chase(self, hero, dt):
-        if hero.actor.x < self.actor.x:
-            self.direction = -1
-            self.actor.x -= self.speed * 1.2
-        else:
-            self.direction = 1
-            self.actor.x += self.speed * 1.2
+    __slots__ = ("pool", "index", "spawn", "_actor")
 
-    def _attack(self, hero, dt):
-        """Start attack (only if cooldown is ready)."""
-        if self._time_since_last_attack >= self.attack_cooldown:
-            self._time_since_last_attack = 0.0
-            self.is_attacking = True
-            self.has_damaged = False
-            self.frame_index = 0
-            self._anim_timer = 0.0
-            self._attack_timer = 0.0
-            # Define a primeira frame de ataque
-            if self.direction == -1:
-                self.actor._surf = self.flipped_attack_frames[self.attack_frames[0]]
-            else:
-                self.actor.image = self.attack_frames[0]
+    idle_frames = EnemyPool.IDLE_FRAMES
+    run_frames = EnemyPool.RUN_FRAMES
+    death_frames = EnemyPool.DEATH_FRAMES
+    attack_frames = EnemyPool.ATTACK_FRAMES
 
-    def _animate_attack(self, dt, hero):
-        """Perform attack animation frame by frame."""
-        self._anim_timer += dt
+    x = _PoolField("x", float)
+    y = _PoolField("y", float)
+    start_x = _PoolField("start_x", float)
+    ground_y = _PoolField("ground_y", float)
 
-        if self._anim_timer >= self.frame_delay:
-            self._anim_timer = 0.0
-            self.frame_index += 1
+    # physics
+    vel_y = _PoolField("vel_y", float)
+    on_ground = _PoolField("on_ground", bool)
 
-            if self.frame_index < len(self.attack_frames):
-                if self.direction == -1:
-                    self.actor._surf = self.flipped_attack_frames[self.attack_frames[self.frame_index]]
-                else:
-                    self.actor.image = self.attack_frames[self.frame_index]
-            else:
-                # fim da animação
-                self.is_attacking = False
-                self.state = "patrol"
-                self.frame_index = 0
-                return
+    # patrol
+    patrol_min_x = _PoolField("patrol_min_x", float)
+    patrol_max_x = _PoolField("patrol_max_x", float)
+    speed = _PoolField("speed", float)
+    direction = _PoolField("direction", int)
 
-    # apply damage roughly in the middle of the animation
-        if not self.has_damaged and 2 < self.frame_index < 4:
-            dx = abs(self.actor.x - hero.actor.x)
-            dy = abs(self.actor.y - hero.actor.y)
-            if dx <= self.attack_range and dy < 50:
-                try:
-                    hero.take_damage(self.attack_damage)
-                    self.has_damaged = True  # impede dano duplo
-                except Exception:
-                    pass
+    # combat
+    health = _PoolField("health", int)
+    is_dead = _PoolField("is_dead", bool)
+    attack_damage = _PoolField("attack_damage", int)
+    detection_radius = _PoolField("detection_radius", float)
+    attack_range = _PoolField("attack_range", float)
+    attack_cooldown = _PoolField("attack_cooldown", float)
+    _time_since_last_attack = _PoolField("since_attack", float)
+    is_attacking = _PoolField("is_attacking", bool)
+    has_damaged = _PoolField("has_damaged", bool)  # Tracks if this attack already damaged the hero
 
-    # -------------------------------
-    # ANIMAÇÕES ESPECÍFICAS
-    # -------------------------------
-    def _animate_idle(self, dt):
-        """Animate idle state."""
-        self._anim_timer += dt
-        if self._anim_timer >= self.frame_delay:
-            self._anim_timer = 0.0
-            self.frame_index = (self.frame_index + 1) % len(self.idle_frames)
-            if self.direction == -1:
-                self.actor._surf = self.flipped_idle_frames[self.idle_frames[self.frame_index]]
-            else:
-                self.actor.image = self.idle_frames[self.frame_index]
+    # animations
+    frame_index = _PoolField("frame_index", int)
+    _anim_timer = _PoolField("anim_timer", float)
+
+    def __init__(self, x, y, patrol_width=200, pool=None, owner=0):
+        if pool is None:
+            pool = EnemyPool(capacity=1)
+        self.pool = pool
+        self.index = pool.spawn(x, y, patrol_width, owner)
+        pool.views.append(self)
+        self.spawn = None  # (chunk, number) of the level spawn it came from
+        self._actor = None
+
+    @property
+    def gravity(self):
+        return self.pool.gravity
+
+    @property
+    def frame_delay(self):
+        return self.pool.frame_delay
+
+    @property
+    def state(self):
+        return STATE_NAMES[self.pool.state[self.index]]
+
+    @property
+    def prev_pos(self):
+        return (float(self.pool.prev_x[self.index]), float(self.pool.prev_y[self.index]))
+
+    @property
+    def actor(self):
+        """The Actor, positioned and imaged from the pool slot."""
+        if self._actor is None:
+            self._actor = Actor("enemy_idle1")
+        self._sync_actor()
+        return self._actor
+
+    def _sync_actor(self):
+        pool, i = self.pool, self.index
+        actor = self._actor
+        clip, index = pool.frame(i)
+        show_frame(actor, clip, index, pool.direction.item(i), (pool.x.item(i), pool.y.item(i)))
 
-    def _animate_run(self, dt):
-        """Animate running state."""
-        self._anim_timer += dt
-        if self._anim_timer >= self.frame_delay:
-            self._anim_timer = 0.0
-            self.frame_index = (self.frame_index + 1) % len(self.run_frames)
-            if self.direction == -1:
-                self.actor._surf = self.flipped_run_frames[self.run_frames[self.frame_index]]
-            else:
-                self.actor.image = self.run_frames[self.frame_index]
+    def update(self, dt, hero):
+        """Advance just this enemy (World advances the whole pool at once)."""
+        self.pool.update(dt, hero, only=self.index)
 
-    def _apply_directioned_image(self):
-        """Apply the correct image based on direction and state."""
-        if self.state == "chase":
-            frames = self.run_frames
-            flipped_cache = self.flipped_run_frames
-        else:
-            frames = self.idle_frames
-            flipped_cache = self.flipped_idle_frames
-        
-        idx = self.frame_index % len(frames)
-        if self.direction == -1:
-            self.actor._surf = flipped_cache[frames[idx]]
-        else:
-            self.actor.image = frames[idx]
+    def draw(self, alpha=1.0, offset=(0, 0)):
+        """Draw the enemy, moved by ``offset``; return the screen Rect drawn."""
+        return draw_interpolated(self.actor, self.prev_pos, alpha, offset)
 
     # -------------------------------
     # DEATH / DAMAGE
     # -------------------------------
     def take_damage(self, amount):
-        if self.is_dead:
-            return
-        self.health -= amount
-        if self.health <= 0:
-            self.health = 0
-            self._die()
-
-    def _die(self):
-        self.is_dead = True
-        self.state = "dead"
-        self.frame_index = 0
-        self._anim_timer = 0.0
-        if self.direction == -1:
-            self.actor._surf = self.flipped_death_frames[self.death_frames[0]]
-        else:
-            self.actor.image = self.death_frames[0]
-
-    def _update_death(self, dt):
-        self._anim_timer += dt
-        if self.frame_index < len(self.death_frames) - 1:
-            if self._anim_timer >= self.frame_delay:
-                self._anim_timer = 0
-                self.frame_index += 1
-                if self.direction == -1:
-                    self.actor._surf = self.flipped_death_frames[self.death_frames[self.frame_index]]
-                else:
-                    self.actor.image = self.death_frames[self.frame_index]
+        self.pool.take_damage(self.index, amount)
 
     def bounding_box(self):
+        actor = self.actor
         return Rect(
-            self.actor.left, self.actor.top, self.actor.width, self.actor.height
-        )
\ No newline at end of file
+            actor.left, actor.top, actor.width, actor.height
+        )
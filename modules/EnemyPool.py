@@ -0,0 +1,450 @@
+# -*- coding: utf-8 -*-
+# type: ignore
+# modules/EnemyPool.py
+import random
+
+import numpy as np
+from pygame import Rect
+
+from modules.Animation import HOLD, LOOP, ONCE, AnimationClip, AnimationSet
+from modules.Sprite import SpriteManager
+
+# behaviour states, stored as small ints in EnemyPool.state
+PATROL, CHASE, ATTACK, DEAD = range(4)
+STATE_NAMES = ("patrol", "chase", "attack", "dead")
+
+# animation clips, by id (see EnemyPool.ANIMATIONS)
+IDLE_CLIP, RUN_CLIP, ATTACK_CLIP, DEATH_CLIP = range(4)
+
+
+class EnemyPool:
+    """Struct-of-arrays storage for every enemy of a level.
+
+    Each enemy is one slot: its position, velocity, patrol bounds, combat
+    stats, state and timers live in contiguous NumPy arrays, and ``update``
+    advances all of them in one vectorized step (gravity and ground clamp,
+    patrol bounce, chase/attack selection by range, cooldowns and animation
+    timers). ``Enemy`` objects are thin views over a slot.
+
+    Animation is data-driven: ``STATE_CLIPS`` maps each behaviour state to
+    a clip of ``ANIMATIONS`` (an attack in progress plays the attack clip),
+    and every enemy's frame and timer advance in one batched
+    ``AnimationSet.advance`` per update.
+
+    Physics values are in pixels per second, like the rest of the game.
+
+    With ``wake_distance`` set, enemies farther than that from the hero
+    (horizontally) sleep: ``update`` leaves them exactly as they are, and
+    they wake up as soon as the hero comes back within range.
+
+    Spawn speeds and directions come from the pool's own ``rng``, so a pool
+    made with the same ``seed`` spawns the same enemies (see modules.Replay).
+
+    A ``shared`` pool holds the enemies of several worlds, which then all
+    advance in the same vectorized ``update`` (see modules.VecEnv). Each
+    enemy records its world's number in ``owner``, each world has its own
+    spawn RNG in ``rngs``, and ``update`` takes the list of heroes, by
+    owner.
+    """
+
+    IDLE_FRAMES = ("enemy_idle1", "enemy_idle2", "enemy_idle3", "enemy_idle4")
+    RUN_FRAMES = ("enemy_run1", "enemy_run2", "enemy_run3", "enemy_run4", "enemy_run5")
+    DEATH_FRAMES = (
+        "enemy_dead1", "enemy_dead2", "enemy_dead3",
+        "enemy_dead4", "enemy_dead5", "enemy_dead6",
+    )
+    ATTACK_FRAMES = (
+        "enemy_attack1", "enemy_attack2", "enemy_attack3",
+        "enemy_attack4", "enemy_attack5", "enemy_attack6",
+    )
+    ANIMATIONS = AnimationSet([
+        AnimationClip("idle", IDLE_FRAMES, 0.16),
+        AnimationClip("run", RUN_FRAMES, 0.16),
+        AnimationClip("attack", ATTACK_FRAMES, 0.16, ONCE, next="idle"),
+        AnimationClip("death", DEATH_FRAMES, 0.16, HOLD),
+    ])
+    # behaviour state -> clip (waiting out an attack cooldown shows idle)
+    STATE_CLIPS = np.array([IDLE_CLIP, RUN_CLIP, IDLE_CLIP, DEATH_CLIP], dtype=np.int64)
+    _state_clips = tuple(STATE_CLIPS.tolist())  # for one slot at a time
+    _sprites = None  # see _sprite_table
+
+    # name -> dtype of every per-enemy array
+    FIELDS = {
+        "x": np.float64, "y": np.float64,
+        "prev_x": np.float64, "prev_y": np.float64,
+        "start_x": np.float64, "ground_y": np.float64,
+        "vel_y": np.float64, "on_ground": np.bool_,
+        "patrol_min_x": np.float64, "patrol_max_x": np.float64,
+        "speed": np.float64, "direction": np.int8,
+        "health": np.int32, "is_dead": np.bool_,
+        "attack_damage": np.int32, "detection_radius": np.float64,
+        "attack_range": np.float64, "attack_cooldown": np.float64,
+        "since_attack": np.float64, "is_attacking": np.bool_,
+        "has_damaged": np.bool_, "state": np.int8,
+        "frame_index": np.int16, "anim_timer": np.float64,
+        "owner": np.int32,
+    }
+
+    def __init__(self, capacity=16, seed=None):
+        self.count = 0
+        self.capacity = capacity
+        for name, dtype in self.FIELDS.items():
+            setattr(self, name, np.zeros(capacity, dtype=dtype))
+        self.views = []  # slot -> Enemy
+
+        # shared by every enemy in the pool
+        self.gravity = 2880
+        self.wake_distance = None  # None: every enemy is always awake
+        self.rngs = [random.Random(seed)]  # spawn RNG of each owner
+
+        # stats of every new enemy (balancing runs change them, see modules.Batch)
+        self.base_speed = 120  # plus a random part, up to speed_spread
+        self.speed_spread = 90
+        self.base_health = 50
+        self.base_attack_damage = 10
+        self.base_attack_cooldown = 1.5
+
+        # conservative bounds for the broad phase: the largest enemy frame
+        frames = self.IDLE_FRAMES + self.RUN_FRAMES + self.DEATH_FRAMES + self.ATTACK_FRAMES
+        sizes = [SpriteManager.frame_size(name) for name in frames]
+        self.half_width = max(w for w, _ in sizes) / 2
+        self.half_height = max(h for _, h in sizes) / 2
+        self._grid_cells = np.zeros((capacity, 4), dtype=np.int64)
+
+    @classmethod
+    def shared(cls, capacity=16):
+        """An empty pool for the enemies of several worlds; add each with ``add_owner``."""
+        pool = cls(capacity)
+        pool.rngs = []
+        return pool
+
+    def add_owner(self, seed=None):
+        """Register one more world; returns its owner number."""
+        self.rngs.append(random.Random(seed))
+        return len(self.rngs) - 1
+
+    def __len__(self):
+        return self.count
+
+    @property
+    def frame_delay(self):
+        return self.ANIMATIONS[IDLE_CLIP].delay
+
+    def spawn(self, x, y, patrol_width=200, owner=0):
+        """Claim a slot for a new enemy of world ``owner`` and return its index."""
+        if self.count == self.capacity:
+            self._grow(self.capacity * 2)
+        i = self.count
+        self.count += 1
+
+        half = patrol_width // 2
+        self.x[i] = self.prev_x[i] = self.start_x[i] = x
+        self.y[i] = self.prev_y[i] = self.ground_y[i] = y
+        self.vel_y[i] = 0
+        self.on_ground[i] = True
+        self.patrol_min_x[i] = x - half
+        self.patrol_max_x[i] = x + half
+        rng = self.rngs[owner]
+        self.speed[i] = self.base_speed + rng.random() * self.speed_spread
+        self.direction[i] = rng.choice([-1, 1])
+        self.health[i] = self.base_health
+        self.is_dead[i] = False
+        self.attack_damage[i] = self.base_attack_damage
+        self.detection_radius[i] = 10
+        self.attack_range[i] = 10
+        self.attack_cooldown[i] = self.base_attack_cooldown
+        self.since_attack[i] = 0.0
+        self.is_attacking[i] = False
+        self.has_damaged[i] = False
+        self.state[i] = PATROL
+        self.frame_index[i] = 0
+        self.anim_timer[i] = 0.0
+        self.owner[i] = owner
+        self._grid_cells[i] = -1  # never registered in a grid
+        return i
+
+    def clear(self):
+        """Forget every enemy (views of the old slots become invalid)."""
+        self.count = 0
+        self.views = []
+
+    def remove(self, i):
+        """Free slot ``i`` by moving the last enemy into it.
+
+        The moved enemy's view is re-pointed at its new slot; the view of
+        the removed enemy becomes invalid.
+        """
+        last = self.count - 1
+        if i != last:
+            for name in self.FIELDS:
+                array = getattr(self, name)
+                array[i] = array[last]
+            self._grid_cells[i] = self._grid_cells[last]
+            moved = self.views[i] = self.views[last]
+            moved.index = i
+        self.views.pop()
+        self.count = last
+
+    def _grow(self, capacity):
+        for name in self.FIELDS:
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+        cells = np.zeros((capacity, 4), dtype=np.int64)
+        cells[:self.count] = self._grid_cells[:self.count]
+        self._grid_cells = cells
+        self.capacity = capacity
+
+    # -------------------------------
+    # SIMULATION
+    # -------------------------------
+    def update(self, dt, hero, only=None):
+        """Advance every awake enemy (or just slot(s) ``only``) by ``dt`` seconds.
+
+        ``hero`` is the Hero, or for a shared pool the list of heroes by owner.
+        """
+        n = self.count
+        if n == 0:
+            return
+        x, y = self.x[:n], self.y[:n]
+        vel_y, frame = self.vel_y[:n], self.frame_index[:n]
+        is_dead, is_attacking = self.is_dead[:n], self.is_attacking[:n]
+        timer, since_attack = self.anim_timer[:n], self.since_attack[:n]
+        hero_x, hero_y, hero_alive = self._heroes(hero, n)
+
+        if only is None:
+            sel = np.ones(n, dtype=bool)
+        else:
+            sel = np.zeros(n, dtype=bool)
+            sel[only] = True
+        if self.wake_distance is not None:
+            sel &= np.abs(x - hero_x) <= self.wake_distance
+
+        np.copyto(self.prev_x[:n], x, where=sel)
+        np.copyto(self.prev_y[:n], y, where=sel)
+
+        dying = sel & is_dead
+        alive = sel & ~is_dead
+        since_attack[alive] += dt
+
+        # simple gravity
+        vel_y[alive] += self.gravity * dt
+        y[alive] += vel_y[alive] * dt
+        ground_y = self.ground_y[:n]
+        landed = alive & (y >= ground_y)
+        y[landed] = ground_y[landed]
+        vel_y[landed] = 0
+        self.on_ground[:n][alive] = landed[alive]
+
+        # behavior
+        dist_to_hero = np.abs(x - hero_x)
+        dist_y = np.abs(y - hero_y)
+        same_height = dist_y <= 20
+
+        attacking = alive & is_attacking
+        free = alive & ~is_attacking
+        in_attack = free & (dist_to_hero <= self.attack_range[:n]) & same_height & hero_alive
+        in_chase = (free & ~in_attack & (dist_to_hero <= self.detection_radius[:n])
+                    & same_height & hero_alive)
+        patrol = free & ~in_attack & ~in_chase
+
+        self._start_attack(in_attack)
+        self._chase(in_chase, dt, hero_x)
+        self._patrol(patrol, dt)
+
+        # every animation in one pass (attacks that just started wait a tick)
+        ended = self.ANIMATIONS.advance(self.clip_ids(), frame, timer,
+                                        dying | attacking | in_chase | patrol, dt)
+        self._attack_hits(attacking, ended, hero, dist_to_hero, dist_y)
+
+    def _heroes(self, hero, n):
+        """Hero x, y and liveness seen by each enemy (scalars for a single hero)."""
+        if not isinstance(hero, list):
+            return hero.actor.x, hero.actor.y, not hero.is_dead
+        owner = self.owner[:n]
+        x = np.array([h.actor.x for h in hero])[owner]
+        y = np.array([h.actor.y for h in hero])[owner]
+        alive = np.array([not h.is_dead for h in hero])[owner]
+        return x, y, alive
+
+    def _start_attack(self, mask):
+        """Start attacks (only where the cooldown is ready)."""
+        n = self.count
+        self.state[:n][mask] = ATTACK
+        ready = mask & (self.since_attack[:n] >= self.attack_cooldown[:n])
+        self.since_attack[:n][ready] = 0.0
+        self.is_attacking[:n][ready] = True
+        self.has_damaged[:n][ready] = False
+        self.frame_index[:n][ready] = 0
+        self.anim_timer[:n][ready] = 0.0
+
+    def _attack_hits(self, mask, ended, hero, dist_to_hero, dist_y):
+        """End finished attacks; deal damage roughly in the middle of the others."""
+        n = self.count
+        frame = self.frame_index[:n]
+        self.is_attacking[:n][ended] = False
+        self.state[:n][ended] = PATROL
+        frame[ended] = 0
+
+        hits = (mask & ~ended & ~self.has_damaged[:n] & (frame > 2) & (frame < 4)
+                & (dist_to_hero <= self.attack_range[:n]) & (dist_y < 50))
+        for i in np.flatnonzero(hits):
+            target = hero[self.owner[i]] if isinstance(hero, list) else hero
+            target.take_damage(int(self.attack_damage[i]))
+            self.has_damaged[i] = True  # impede dano duplo
+
+    def _chase(self, mask, dt, hero_x):
+        n = self.count
+        x = self.x[:n]
+        self.state[:n][mask] = CHASE
+        left = mask & (hero_x < x)
+        right = mask & ~left
+        self.direction[:n][left] = -1
+        self.direction[:n][right] = 1
+        x[mask] += self.direction[:n][mask] * self.speed[:n][mask] * 1.2 * dt
+
+    def _patrol(self, mask, dt):
+        n = self.count
+        x, direction = self.x[:n], self.direction[:n]
+        self.state[:n][mask] = PATROL
+        x[mask] += direction[mask] * self.speed[:n][mask] * dt
+
+        low = mask & (x < self.patrol_min_x[:n])
+        x[low] = self.patrol_min_x[:n][low]
+        direction[low] = 1
+        high = mask & (x > self.patrol_max_x[:n])
+        x[high] = self.patrol_max_x[:n][high]
+        direction[high] = -1
+
+    # -------------------------------
+    # DEATH / DAMAGE
+    # -------------------------------
+    def take_damage(self, i, amount):
+        if self.is_dead[i]:
+            return
+        self.health[i] -= amount
+        if self.health[i] <= 0:
+            self.health[i] = 0
+            self.is_dead[i] = True
+            self.state[i] = DEAD
+            self.frame_index[i] = 0
+            self.anim_timer[i] = 0.0
+
+    # -------------------------------
+    # RENDERING / BROAD PHASE
+    # -------------------------------
+    def clip_ids(self):
+        """Clip id of every enemy, from its state (vectorized)."""
+        n = self.count
+        clip = self.STATE_CLIPS[self.state[:n]]
+        clip[self.is_attacking[:n]] = ATTACK_CLIP
+        clip[self.is_dead[:n]] = DEATH_CLIP
+        return clip
+
+    def frame(self, i):
+        """``(clip, frame index)`` slot ``i`` currently shows."""
+        clips = self.ANIMATIONS.clips
+        if self.is_dead.item(i):
+            clip = clips[DEATH_CLIP]
+        elif self.is_attacking.item(i):
+            clip = clips[ATTACK_CLIP]
+        else:
+            clip = clips[self._state_clips[self.state.item(i)]]
+        return clip, clip.index(self.frame_index.item(i))
+
+    def frame_name(self, i):
+        """Name of the animation frame slot ``i`` currently shows."""
+        clip, index = self.frame(i)
+        return clip.names[index]
+
+    def sprites(self, slots, alpha=1.0, offset=(0, 0)):
+        """``[(surface, (left, top)), ...]`` of the living ``slots``, for Renderer.queue_many.
+
+        Positions are interpolated by ``alpha`` between the last two ticks
+        and moved by ``offset``, as Enemy.draw does, but for every slot in
+        one vectorized pass; the surfaces come from a table of every frame
+        of every clip in both facings.
+        """
+        slots = np.asarray(slots, dtype=np.int64)
+        slots = slots[~self.is_dead[slots]]
+        if len(slots) == 0:
+            return []
+        table, start, half_w, half_h = self._sprite_table()
+        animations = self.ANIMATIONS
+        clip = self.clip_ids()[slots]
+        frame = self.frame_index[slots].astype(np.int64)
+        length = animations.length[clip]
+        frame = np.where(animations.mode[clip] == LOOP, frame % length,
+                         np.minimum(frame, length - 1))
+        code = 2 * (start[clip] + frame) + (self.direction[slots] == -1)
+
+        x, y = self.x[slots], self.y[slots]
+        if alpha < 1.0:
+            prev_x, prev_y = self.prev_x[slots], self.prev_y[slots]
+            x = prev_x + (x - prev_x) * alpha
+            y = prev_y + (y - prev_y) * alpha
+        left = (x + offset[0] - half_w[code]).tolist()
+        top = (y + offset[1] - half_h[code]).tolist()
+        return list(zip(table[code].tolist(), zip(left, top)))
+
+    @classmethod
+    def _sprite_table(cls):
+        """Surfaces of every frame, both facings: ``(table, clip start, half width, half height)``.
+
+        Frame ``f`` of clip ``c`` facing right is ``table[2 * (start[c] + f)]``,
+        facing left the entry after it. Built the first time enemies are drawn.
+        """
+        if cls._sprites is None:
+            surfaces, start = [], []
+            for clip in cls.ANIMATIONS.clips:
+                start.append(len(surfaces) // 2)
+                for right, left in zip(clip.surfaces(1), clip.surfaces(-1)):
+                    surfaces += [right, left]
+            table = np.empty(len(surfaces), dtype=object)
+            table[:] = surfaces
+            sizes = np.array([surface.get_size() for surface in surfaces], dtype=np.float64)
+            cls._sprites = (table, np.array(start, dtype=np.int64), sizes[:, 0] / 2, sizes[:, 1] / 2)
+        return cls._sprites
+
+    def box(self, i):
+        """``(left, top, right, bottom)`` of the frame slot ``i`` shows, where its Actor would be."""
+        clip, index = self.frame(i)
+        width, height = SpriteManager.frame_size(clip.names[index])
+        left, top = self.x[i] - width / 2, self.y[i] - height / 2
+        return (float(left), float(top), float(left + width), float(top + height))
+
+    def bounds(self, i):
+        """Rect enclosing slot ``i`` whatever frame it shows."""
+        hw, hh = self.half_width, self.half_height
+        return Rect(self.x[i] - hw, self.y[i] - hh, 2 * hw, 2 * hh)
+
+    def grid_cells(self, slots, size):
+        """``(n, 4)`` cell ranges of ``bounds(i)`` for ``slots``, in a SpatialHash of ``size``."""
+        x, y = self.x[slots], self.y[slots]
+        hw, hh = self.half_width, self.half_height
+        return np.stack([
+            np.floor_divide(x - hw, size),
+            np.floor_divide(y - hh, size),
+            np.floor_divide(x + hw - 1, size),
+            np.floor_divide(y + hh - 1, size),
+        ], axis=1).astype(np.int64)
+
+    def update_grid(self, grid):
+        """Re-bucket, in ``grid``, only the enemies whose cells changed.
+
+        For a shared pool, ``grid`` is the list of each owner's grid.
+        """
+        n = self.count
+        size = (grid[0] if isinstance(grid, list) else grid).cell_size
+        cells = self.grid_cells(slice(0, n), size)
+        moved = np.flatnonzero((cells != self._grid_cells[:n]).any(axis=1))
+        views = self.views
+        if isinstance(grid, list):
+            owner = self.owner
+            for i in moved:
+                grid[owner[i]].update(views[i], self.bounds(i))
+        else:
+            for i in moved:
+                grid.update(views[i], self.bounds(i))
+        self._grid_cells[:n] = cells
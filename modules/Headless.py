@@ -0,0 +1,246 @@
+# -*- coding: utf-8 -*-
+# type: ignore
+# modules/Headless.py
+"""Run the game simulation without a window.
+
+    python -m modules.Headless --frames 10000 --policy random
+    python -m modules.Headless --frames 600 --trace trace.json
+    python -m modules.Headless --frames 3600 --seed 7 --record run.rpl
+    python -m modules.Headless --replay run.rpl
+
+Used for load-testing game logic, CI regression runs and batch simulations.
+A recorded run (see modules.Replay) replays to the same end state, so it
+is both a regression test and a reproducible workload for profiling.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def setup(root=ROOT):
+    """Prepare pygame and the Pygame Zero loaders without opening a window.
+
+    Must run before any game module is imported: marking the process as
+    started by the pgzrun runner keeps ``import pgzrun`` in the game modules
+    from taking over the calling script.
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    sys._pgzrun = True
+    if root not in sys.path:
+        sys.path.insert(0, root)
+
+    import pygame
+    from pgzero import loaders
+
+    pygame.init()
+    if pygame.display.get_surface() is None:
+        pygame.display.set_mode((1, 1))
+    loaders.set_root(root)
+
+
+def idle_policy(world):
+    """Policy that never presses anything."""
+    from modules.Input import NO_INPUT
+    return NO_INPUT
+
+
+def random_policy(seed=None):
+    """Return a policy that mashes random keys, reproducibly for a seed."""
+    from modules.Input import Controls
+    rng = random.Random(seed)
+
+    def policy(world):
+        return Controls(
+            left=rng.random() < 0.3,
+            right=rng.random() < 0.3,
+            jump=rng.random() < 0.05,
+            attack=rng.random() < 0.1,
+        )
+    return policy
+
+
+def hunt_policy(seed=None):
+    """Return a policy that climbs to the nearest living enemy and shoots it.
+
+    Enemies stand on platforms. To reach one, the hero walks to the edge of
+    the platform it needs next (the enemy's, or a lower one on the way),
+    jumps and steers onto it. On the enemy's level it turns to face it and
+    fires one shot at a time, since projectiles stand still while the hero
+    attacks. With no enemy left in the active chunks it runs right, into
+    the next ones. Random hops keep it from getting stuck, reproducibly for
+    a seed.
+    """
+    from modules.Input import Controls
+    rng = random.Random(seed)
+    reach = 120  # how far above its feet the hero can land
+
+    def policy(world):
+        hero = world.hero
+        actor = hero.actor
+        x, feet = actor.x, actor.bottom
+        hop = rng.random() < 0.01
+        enemies = [enemy for enemy in world.enemies if not enemy.is_dead]
+        if not enemies:
+            return Controls(right=True, jump=hop)
+        enemy = min(enemies, key=lambda e: abs(e.x - x) + abs(e.actor.bottom - feet))
+        dx = enemy.x - x
+        facing = 1 if dx > 0 else -1
+
+        if abs(enemy.actor.bottom - feet) < 4:  # same level: shoot
+            walk = hero.direction != facing or abs(dx) > 250
+            return Controls(left=walk and facing < 0, right=walk and facing > 0, jump=hop,
+                            attack=not walk and abs(dx) < 400 and not hero.projectiles)
+        if enemy.actor.bottom > feet:  # below: walk off the platform toward it
+            side = facing if abs(dx) > 40 else hero.direction
+            return Controls(left=side < 0, right=side > 0, jump=hop)
+
+        # above: land on its platform, or on the reachable one closest to it
+        below = [p for p in world.platform_grid.query(enemy.actor)
+                 if p.left <= enemy.x <= p.right and p.top >= enemy.actor.bottom - 2]
+        goal = min(below, key=lambda p: p.top, default=None)
+        if goal is None or feet - goal.top > reach:
+            steps = [p for p in world.platforms if 10 < feet - p.top <= reach]
+            goal = min(steps, key=lambda p: abs(p.centerx - enemy.x), default=goal)
+        if goal is None:
+            return Controls(jump=True)
+        if not hero.on_ground:  # steer onto it
+            side = 1 if goal.centerx > x else -1
+            return Controls(left=side < 0, right=side > 0)
+        # take off just outside the edge nearer to the hero (without
+        # walking off the platform it stands on)
+        edge = goal.left - 64 if abs(goal.left - x) < abs(goal.right - x) else goal.right + 64
+        stand = [p for p in world.platform_grid.query(actor) if abs(p.top - feet) < 2]
+        if stand:
+            edge = min(max(edge, stand[0].left), stand[0].right)
+        if abs(edge - x) > 12:
+            side = 1 if edge > x else -1
+            return Controls(left=side < 0, right=side > 0, jump=hop)
+        side = 1 if goal.centerx > x else -1
+        return Controls(left=side < 0, right=side > 0, jump=True)
+    return policy
+
+
+POLICIES = {
+    "idle": lambda seed: idle_policy,
+    "random": random_policy,
+    "hunt": hunt_policy,
+}
+
+
+class HeadlessRunner:
+    """Steps a World as fast as the CPU allows, with no display.
+
+    Attributes:
+        world (World): the simulation being stepped.
+        policy (callable): maps the world to the Controls for the next tick.
+        recorder (InputRecorder): logs every tick when set (see modules.Replay).
+    """
+
+    def __init__(self, world=None, policy=idle_policy, seed=None, recorder=None):
+        setup()
+        if world is None:
+            from modules.World import World
+            world = World(seed=seed)
+            world.command("start")
+        self.world = world
+        self.policy = policy
+        self.recorder = recorder
+
+    def run(self, frames):
+        """Step ``frames`` ticks and return timing statistics."""
+        from modules.Profiler import profiler
+        world = self.world
+        policy = self.policy
+        recorder = self.recorder
+        start = time.perf_counter()
+        for _ in range(frames):
+            profiler.next_frame()
+            controls = policy(world)
+            if recorder is not None:
+                recorder.record(controls)
+            world.step(controls)
+        elapsed = time.perf_counter() - start
+        return self.stats(frames, elapsed)
+
+    def stats(self, frames, elapsed):
+        world = self.world
+        return {
+            "frames": frames,
+            "seconds": elapsed,
+            "fps": frames / elapsed if elapsed else float("inf"),
+            "score": world.score,
+            "game_state": world.game_state,
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=10000)
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="random")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--trace", metavar="PATH",
+                        help="write a Chrome/Perfetto trace of the run to PATH")
+    parser.add_argument("--record", metavar="PATH",
+                        help="record the run's seed and input to PATH")
+    parser.add_argument("--replay", metavar="PATH",
+                        help="replay a recording instead of running a policy; "
+                             "exits with 1 if the end state differs")
+    args = parser.parse_args(argv)
+
+    setup()
+    if args.replay:
+        return replay(args.replay, args.trace)
+
+    recorder = None
+    if args.record:
+        from modules.Replay import InputRecorder
+        from modules.World import World
+        world = World(seed=args.seed)
+        recorder = InputRecorder(world)
+        world.command("start")
+        recorder.command("start")
+        runner = HeadlessRunner(world, POLICIES[args.policy](args.seed), recorder=recorder)
+    else:
+        runner = HeadlessRunner(policy=POLICIES[args.policy](args.seed), seed=args.seed)
+    if args.trace:
+        from modules.Profiler import profiler
+        profiler.capture(args.frames + 1, args.trace)  # +1 closes the last frame
+    stats = runner.run(args.frames)
+    if args.trace:
+        profiler.next_frame()
+    print("%(frames)d frames in %(seconds).3f s (%(fps).0f fps), "
+          "score %(score)d, state %(game_state)s" % stats)
+    if recorder is not None:
+        recorder.save(args.record)
+        print("recorded %d frames (seed %d) to %s, state %s" % (
+            recorder.frames, runner.world.seed, args.record, runner.world.state_hash()))
+    return 0
+
+
+def replay(path, trace=None):
+    """Replay a recording at full speed; return 0 if its end state matches."""
+    from modules.Profiler import profiler
+    from modules.Replay import Replay
+    recording = Replay.load(path)
+    if trace:
+        profiler.capture(recording.frames + 1, trace)
+    start = time.perf_counter()
+    matches, world = recording.verify()
+    elapsed = time.perf_counter() - start
+    if trace:
+        profiler.next_frame()
+    stats = HeadlessRunner(world).stats(recording.frames, elapsed)
+    print("replayed %(frames)d frames in %(seconds).3f s (%(fps).0f fps), "
+          "score %(score)d, state %(game_state)s" % stats)
+    print("state %s: %s" % (world.state_hash(), "matches" if matches else
+                            "MISMATCH, recorded " + recording.state_hash))
+    return 0 if matches else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,21 +1,60 @@
 # -*- coding: utf-8 -*-
 # type: ignore
-import pgzrun
-from pgzero.builtins import Actor, keyboard, sounds
+from pgzero.builtins import Actor, keyboard
 from pygame import Rect
 
-from modules.Projectile import Projectile
-from modules.Sprite import SpriteManager
+from modules.Animation import ONCE, AnimationClip, AnimationSet, Animator
+from modules.Input import Controls
+from modules.Profiler import profiler
+from modules.ProjectilePool import ProjectilePool
+from modules.Scheduler import draw_interpolated, interpolated_topleft
+from modules.SpatialHash import SpatialHash
+from modules.Sweep import box_of, first_hit, moved, swept_rect
+
+# clips shared by every Hero; the attack fires its projectile on frame 3
+ANIMATIONS = AnimationSet([
+    AnimationClip("idle", ["hero_idle1", "hero_idle2", "hero_idle3"], 0.15),
+    AnimationClip("attack", [
+        "hero_attack1", "hero_attack2", "hero_attack3",
+        "hero_attack4", "hero_attack5", "hero_attack6",
+        "hero_attack7",
+    ], 0.15, ONCE, next="idle", events={3: "shoot"}),
+    AnimationClip("death", [
+        "hero_death1", "hero_death2", "hero_death3",
+        "hero_death4", "hero_death5", "hero_death6",
+    ], 0.15),
+])
+
 
 class Hero:
+    """The player: movement, jumps, attacks and projectiles.
+
+    The clips (``ANIMATIONS``) are shared by every hero; an instance holds
+    only its own state, in ``__slots__``, which keeps many heroes cheap
+    (one per game instance in modules.VecEnv).
+    """
+
+    __slots__ = (
+        "actor", "prev_pos", "vel_y", "on_ground", "speed", "jump_strength", "gravity",
+        "health", "damage_taken", "ground_y", "direction", "is_dead", "is_attacking",
+        "animation", "projectiles", "projectile_range", "sound_events", "_has_shot",
+    )
+
+    LANDING_SKIN = 5  # see apply_gravity
+    HEAD_SKIN = 10
+
     def __init__(self, x, y):
         self.actor = Actor("hero_idle1", (x, y))  # imagem inicial
+        self.prev_pos = (x, y)  # position at the previous tick, for interpolation
+
+        # physics, in pixels per second (tuned at 60 ticks per second)
         self.vel_y = 0
         self.on_ground = False
-        self.speed = 4
-        self.jump_strength = -15
-        self.gravity = 0.8
+        self.speed = 240
+        self.jump_strength = -900
+        self.gravity = 2880
         self.health = 100
+        self.damage_taken = 0  # total over the hero's lives, for balancing stats
         self.ground_y = 522
         self.direction = 1
 
@@ -23,196 +62,162 @@ class Hero:
         self.is_dead = False
         self.is_attacking = False
 
-        # Animation control
-        self.frame_index = 0
-        self.frame_delay = 0.15
-        self.time_since_last = 0
-        self.idle_frames = ["hero_idle1", "hero_idle2", "hero_idle3"]
-        self.death_frames = [
-            "hero_death1", "hero_death2", "hero_death3",
-            "hero_death4", "hero_death5", "hero_death6",
-        ]
-        self.attack_frames = [
-            "hero_attack1", "hero_attack2", "hero_attack3",
-            "hero_attack4", "hero_attack5", "hero_attack6",
-            "hero_attack7",
-        ]
-
-        self.projectiles = []  # list of active projectiles
-        self._has_shot = False  # control to avoid multiple shots during one attack
-
-        self.flipped_attack_frames = SpriteManager.preload_flipped_frames(self.attack_frames)
-        self.flipped_idle_frames = SpriteManager.preload_flipped_frames(self.idle_frames)
-        self.flipped_death_frames = SpriteManager.preload_flipped_frames(self.death_frames)
-
+        # Animation control: clip, frame and timer (the clips are shared)
+        self.animation = Animator(ANIMATIONS, "idle")
 
-    def update(self, dt, platforms, screen_width=800):
-        """Update position and apply gravity."""
-        if self.is_dead:
-            self.animate_death(dt)
-            return
+        self.projectiles = ProjectilePool()  # active projectiles, recycled in place
+        self.projectile_range = 800  # projectiles die this far from the hero (a screen width)
+        self.sound_events = []  # names of sounds to play, drained by the game loop
+        self._has_shot = False  # control to avoid multiple shots during one attack
 
-        if self.is_attacking:
-            self.animate_attack(dt)
+    def update(self, dt, platforms, world_width=800, controls=None):
+        """Update position and apply gravity.
+
+        ``platforms`` is a list of Rects or a SpatialHash of them; the hero
+        is kept between 0 and ``world_width`` (world coordinates).
+        ``controls`` is the Controls for this tick; when omitted the
+        Pygame Zero keyboard is read directly.
+        """
+        self.prev_pos = self.actor.pos
+        if self.is_dead or self.is_attacking:
+            self.animate(dt)
             return
 
-        self.apply_gravity(platforms)
-        self.handle_input()
-        self.animate_idle(dt)
-
-        # atualiza projéteis
-        for proj in self.projectiles:
-            proj.update(screen_width)
-        # remove projéteis mortos
-        self.projectiles = [p for p in self.projectiles if p.alive]
-
-    def draw(self, screen):
-        """Draw the hero on the screen."""
-        self.actor.draw()
+        self.apply_gravity(platforms, dt)
+        self.handle_input(dt, controls)
+        self.actor.x = min(max(self.actor.x, 0), world_width)
+        self.animate(dt)
+
+        # atualiza projéteis e recicla os mortos (fora do alcance ou do nível)
+        with profiler.scope("projectiles.update"):
+            x = self.actor.x
+            self.projectiles.update(dt, min(x + self.projectile_range, world_width),
+                                    max(x - self.projectile_range, 0))
+
+    def draw(self, screen, alpha=1.0, offset=(0, 0)):
+        """Draw the hero on the screen.
+
+        ``alpha`` interpolates between the previous and the current tick and
+        ``offset`` moves world coordinates to the screen (see Camera).
+        Returns the list of screen Rects that were drawn.
+        """
+        drawn = [draw_interpolated(self.actor, self.prev_pos, alpha, offset)]
         for proj in self.projectiles:
-            proj.draw(screen)
-
-
-    def apply_gravity(self, platforms):
-        """Apply gravity and correct vertical collision."""
-        self.vel_y += self.gravity
-        self.actor.y += self.vel_y
+            drawn.append(proj.draw(screen, alpha, offset))
+        return drawn
+
+    def queue(self, renderer, alpha=1.0, offset=(0, 0)):
+        """Queue the hero and its projectiles on ``renderer``'s layers (see draw)."""
+        actor = self.actor
+        renderer.queue("hero", actor._surf, interpolated_topleft(actor, self.prev_pos, alpha, offset))
+        renderer.queue_many("projectiles", self.projectiles.sprites(alpha, offset))
+
+
+    def apply_gravity(self, platforms, dt):
+        """Apply gravity and stop at the first platform crossed on the way.
+
+        The fall (or jump) of the tick is swept against the platforms (see
+        modules.Sweep), so a fast hero or a long tick cannot pass through
+        one. A landing still counts from up to LANDING_SKIN px inside the
+        top (frames differ in size), a head bump from HEAD_SKIN px inside
+        the bottom.
+        """
+        actor = self.actor
+        self.vel_y += self.gravity * dt
+        dy = self.vel_y * dt
+        start = box_of(actor)
+        actor.y += dy
         self.on_ground = False
 
         # Verifica colisão com o chão
-        if self.actor.y >= self.ground_y:
-            self.actor.y = self.ground_y
+        if actor.y >= self.ground_y:
+            actor.y = self.ground_y
             self.vel_y = 0
             self.on_ground = True
         else:
             self.on_ground = False
 
-        # Verifica colisão com plataformas
-        for p in platforms:
-            # Usa o método colliderect do próprio Actor!
-            if self.actor.colliderect(p):
-                # Colisão enquanto CAI (vel_y positivo)
-                if self.vel_y > 0:
-                    # Verifica se estava acima da plataforma
-                    if self.actor.bottom - self.vel_y <= p.top + 5:
-                        self.actor.bottom = p.top
-                        self.vel_y = 0
-                        self.on_ground = True
-                        
-                # Colisão enquanto SOBE (batendo a cabeça)
-                elif self.vel_y < 0:
-                    if self.actor.top >= p.bottom - 10:
-                        self.actor.top = p.bottom
-                        self.vel_y = 0
+        # Verifica colisão com plataformas (only nearby ones when a grid is given)
+        if dy > 0:
+            # Colisão enquanto CAI: the first top crossed
+            start, dy, face = moved(start, 0, -self.LANDING_SKIN), dy + self.LANDING_SKIN, (0, -1)
+        elif dy < 0:
+            # Colisão enquanto SOBE (batendo a cabeça): the first bottom crossed
+            start, dy, face = moved(start, 0, self.HEAD_SKIN), dy - self.HEAD_SKIN, (0, 1)
+        else:
+            return
+        if isinstance(platforms, SpatialHash):
+            platforms = platforms.query(swept_rect(start, 0, dy))
+        hit = first_hit(start, 0, dy, platforms, face=face)
+        if hit is None:
+            return
+        p = hit[3]
+        if face == (0, -1):
+            actor.bottom = p.top
+            self.vel_y = 0
+            self.on_ground = True
+        else:
+            actor.top = p.bottom
+            self.vel_y = 0
 
     def start_attack(self):
         """Start the attack (animation and state)."""
         self.is_attacking = True
-        self.frame_index = 0
-        self.time_since_last = 0
-        # define a primeira frame de ataque imediatamente
-        # self.actor.image = self.attack_frames[self.frame_index]
-        if self.direction == -1:
-            self.actor._surf = self.flipped_attack_frames[self.attack_frames[0]]
-        else:
-            self.actor.image = self.attack_frames[0]
+        self.animation.play("attack")
+        self.animation.show(self.actor, self.direction)
 
-    def handle_input(self):
+    def handle_input(self, dt, controls=None):
         """Control lateral movement, jump, and start attack."""
-        if keyboard.left:
-            self.actor.x -= self.speed
+        if controls is None:
+            controls = Controls.from_keyboard(keyboard)
+
+        if controls.left:
+            self.actor.x -= self.speed * dt
             self.direction = -1
-        elif keyboard.right:
-            self.actor.x += self.speed
+        elif controls.right:
+            self.actor.x += self.speed * dt
             self.direction = 1
 
-        # Atualiza imagem conforme a direção (idle)
-        if not self.is_attacking:
-            if self.direction == -1:
-                self.actor._surf = self.flipped_idle_frames[self.idle_frames[self.frame_index]]
-            else:
-                self.actor.image = self.idle_frames[self.frame_index]
-
         # pular
-        if keyboard.SPACE and self.on_ground:
+        if controls.jump and self.on_ground:
             self.vel_y = self.jump_strength
             self.on_ground = False
-            sounds.jump.play()
+            self.sound_events.append("jump")
 
         # attack: start only once when the key is pressed
         # (assumes handle_input runs every frame; start_attack is only called if not already attacking)
-        if keyboard.Z and not self.is_attacking and self.on_ground:
+        if controls.attack and not self.is_attacking and self.on_ground:
             self.start_attack()
-            sounds.attack.play()
-
-    def animate_idle(self, dt):
-        """Anima o personagem parado (loop)."""
-        self.time_since_last += dt
-        if self.time_since_last >= self.frame_delay:
-            self.time_since_last = 0
-            self.frame_index = (self.frame_index + 1) % len(self.idle_frames)
-            if self.direction == -1:
-                self.actor._surf = self.flipped_idle_frames[self.idle_frames[self.frame_index]]
-            else:
-                self.actor.image = self.idle_frames[self.frame_index]
-
-    def animate_attack(self, dt):
-        """Anima o ataque frame a frame; termina e volta ao idle."""
-        self.time_since_last += dt
-        if self.time_since_last >= self.frame_delay:
-            self.time_since_last = 0
-            self.frame_index += 1
-
-            if self.frame_index < len(self.attack_frames):
-
-                if self.direction == -1:
-                    # Usa a surface flipada do cache
-                    self.actor._surf = self.flipped_attack_frames[self.attack_frames[self.frame_index]]
-                else:
-                    self.actor.image = self.attack_frames[self.frame_index]
-
-                # dispara o projétil em um frame específico (ex: frame 3)
-                if self.frame_index == 3 and not self._has_shot:
-                    self.shoot_projectile()
-                    self._has_shot = True
-
-            else:
-                # terminou a animação de ataque
-                self.is_attacking = False
-                self.frame_index = 0
-                self.time_since_last = 0
-                self._has_shot = False
-                # volta para frame idle inicial
-                if self.direction == -1:
-                    self.actor._surf = self.flipped_idle_frames[self.idle_frames[0]]
-                else:
-                    self.actor.image = self.idle_frames[0]
-
-    def animate_death(self, dt):
-        """Animation of death (can loop or advance as needed)."""
-        self.time_since_last += dt
-        if self.time_since_last >= self.frame_delay:
-            self.time_since_last = 0
-            self.frame_index = (self.frame_index + 1) % len(self.death_frames)
-            if self.direction == -1:
-                self.actor._surf = self.flipped_death_frames[self.death_frames[self.frame_index]]
-            else:
-                self.actor.image = self.death_frames[self.frame_index]
+            self.sound_events.append("attack")
+
+    def animate(self, dt):
+        """Advance the current clip (idle, attack or death) and show its frame."""
+        event = self.animation.advance(dt)
+        if event == "shoot" and not self._has_shot:
+            # dispara o projétil em um frame específico do ataque
+            self.shoot_projectile()
+            self._has_shot = True
+        elif event == "end":
+            # terminou a animação de ataque: volta ao idle
+            self.is_attacking = False
+            self._has_shot = False
+        self.animation.show(self.actor, self.direction)
 
     def take_damage(self, amount):
         """Aplica dano e verifica morte."""
         if not self.is_dead:
+            self.damage_taken += min(amount, self.health)
             self.health -= amount
             if self.health <= 0:
                 self.health = 0
                 self.is_dead = True
-                self.frame_index = 0
-                self.time_since_last = 0
-                self.actor.image = self.death_frames[0]
+                self.is_attacking = False  # a death interrupts the attack
+                self._has_shot = False
+                self.animation.play("death")
+                self.animation.show(self.actor, self.direction)
 
     def shoot_projectile(self):
-        """Cria e adiciona um novo projétil à lista."""
+        """Lança um projétil a partir do pool."""
         offset_x = 15 * self.direction
-        new_proj = Projectile(self.actor.x + offset_x, self.actor.y - 2, self.direction)
-        self.projectiles.append(new_proj)
+        self.projectiles.spawn(self.actor.x + offset_x, self.actor.y - 2, self.direction)
 
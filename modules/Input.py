@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+# type: ignore
+# modules/Input.py
+
+# bit of each control when packed in an int (recordings, batched actions)
+LEFT, RIGHT, JUMP, ATTACK = 1, 2, 4, 8
+
+
+class Controls:
+    """Snapshot of the player's input for one simulation tick.
+
+    The simulation never polls the keyboard itself: the window loop builds a
+    Controls from ``keyboard`` and headless runners build them from a
+    scripted or random policy, so both drive the exact same code.
+    """
+
+    __slots__ = ("left", "right", "jump", "attack")
+
+    def __init__(self, left=False, right=False, jump=False, attack=False):
+        self.left = left
+        self.right = right
+        self.jump = jump
+        self.attack = attack
+
+    @classmethod
+    def from_keyboard(cls, keyboard):
+        """Read the current state of the Pygame Zero keyboard."""
+        return cls(keyboard.left, keyboard.right, keyboard.SPACE, keyboard.Z)
+
+    @property
+    def bits(self):
+        """The controls packed in an int (LEFT | RIGHT | JUMP | ATTACK)."""
+        return ((LEFT if self.left else 0) | (RIGHT if self.right else 0)
+                | (JUMP if self.jump else 0) | (ATTACK if self.attack else 0))
+
+    def __repr__(self):
+        return "Controls(left=%r, right=%r, jump=%r, attack=%r)" % (
+            self.left, self.right, self.jump, self.attack,
+        )
+
+
+NO_INPUT = Controls()
+# every combination, indexed by its bits (shared: never modify them)
+BY_BITS = tuple(Controls(bool(b & LEFT), bool(b & RIGHT), bool(b & JUMP), bool(b & ATTACK))
+                for b in range(16))
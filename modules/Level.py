@@ -0,0 +1,219 @@
+# -*- coding: utf-8 -*-
+# type: ignore
+# modules/Level.py
+"""Chunked level files: write, read and stream them around the player.
+
+    python -m modules.Level default levels/level1.lvl
+    python -m modules.Level generate levels/long.lvl --screens 300 --seed 1
+    python -m modules.Level info levels/long.lvl
+"""
+import argparse
+import os
+import random
+import struct
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_LEVEL = os.path.join(ROOT, "levels", "level1.lvl")
+
+
+class Chunk:
+    """The contents of one vertical slice of a level.
+
+    Attributes:
+        index (int): position of the chunk, ``x // chunk_width``.
+        platforms (list): ``(x, y, width, height)`` tuples.
+        spawns (list): ``(x, y, patrol_min, patrol_max)`` enemy spawns; the
+            spawn's y is also the enemy's ground line.
+    """
+
+    __slots__ = ("index", "platforms", "spawns")
+
+    def __init__(self, index, platforms=None, spawns=None):
+        self.index = index
+        self.platforms = platforms or []
+        self.spawns = spawns or []
+
+
+class LevelFile:
+    """A level file, read lazily: only the header and chunk index stay in memory.
+
+    File layout (little endian)::
+
+        MAGIC | HEADER | chunk index (offset, size) * chunks | chunk data
+
+    The header holds the version, chunk width, chunk count, level width,
+    ground line and the total number of enemy spawns. Each chunk is
+    zlib-compressed::
+
+        platform count (uint16) | spawn count (uint16)
+        platforms: x, y (int32), width, height (uint16)
+        spawns: x, y, patrol_min, patrol_max (int32)
+
+    A platform or spawn belongs to the chunk holding its left edge / x.
+    """
+
+    MAGIC = b"LVL1"
+    VERSION = 1
+    HEADER = struct.Struct("<HHIIiI")
+    INDEX = struct.Struct("<II")
+    COUNTS = struct.Struct("<HH")
+    PLATFORM = struct.Struct("<iiHH")
+    SPAWN = struct.Struct("<iiii")
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            if f.read(4) != self.MAGIC:
+                raise ValueError("%s is not a level file" % path)
+            (version, self.chunk_width, chunks, self.width,
+             self.ground_y, self.enemy_count) = self.HEADER.unpack(f.read(self.HEADER.size))
+            if version != self.VERSION:
+                raise ValueError("%s: unsupported level version %d" % (path, version))
+            data = f.read(self.INDEX.size * chunks)
+        self.index = [self.INDEX.unpack_from(data, i * self.INDEX.size) for i in range(chunks)]
+
+    def __len__(self):
+        return len(self.index)
+
+    def chunk_at(self, x):
+        """Index of the chunk containing world x (clamped to the level)."""
+        return min(max(int(x // self.chunk_width), 0), len(self.index) - 1)
+
+    def read_chunk(self, i):
+        """Read and decode chunk ``i`` (safe to call from any thread)."""
+        offset, size = self.index[i]
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            data = zlib.decompress(f.read(size))
+        n_platforms, n_spawns = self.COUNTS.unpack_from(data, 0)
+        pos = self.COUNTS.size
+        platforms = []
+        for _ in range(n_platforms):
+            platforms.append(self.PLATFORM.unpack_from(data, pos))
+            pos += self.PLATFORM.size
+        spawns = []
+        for _ in range(n_spawns):
+            spawns.append(self.SPAWN.unpack_from(data, pos))
+            pos += self.SPAWN.size
+        return Chunk(i, platforms, spawns)
+
+    @classmethod
+    def write(cls, path, width, ground_y, platforms, spawns, chunk_width=800):
+        """Write a level; ``platforms`` and ``spawns`` are tuples as in Chunk."""
+        count = max(1, -(-width // chunk_width))
+        chunks = [Chunk(i) for i in range(count)]
+        for plat in platforms:
+            chunks[min(max(plat[0] // chunk_width, 0), count - 1)].platforms.append(tuple(plat))
+        for spawn in spawns:
+            chunks[min(max(spawn[0] // chunk_width, 0), count - 1)].spawns.append(tuple(spawn))
+
+        blobs = []
+        for chunk in chunks:
+            data = [cls.COUNTS.pack(len(chunk.platforms), len(chunk.spawns))]
+            data += [cls.PLATFORM.pack(*plat) for plat in chunk.platforms]
+            data += [cls.SPAWN.pack(*spawn) for spawn in chunk.spawns]
+            blobs.append(zlib.compress(b"".join(data)))
+
+        offset = len(cls.MAGIC) + cls.HEADER.size + cls.INDEX.size * count
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(cls.MAGIC)
+            f.write(cls.HEADER.pack(cls.VERSION, chunk_width, count, width, ground_y, len(spawns)))
+            for blob in blobs:
+                f.write(cls.INDEX.pack(offset, len(blob)))
+                offset += len(blob)
+            for blob in blobs:
+                f.write(blob)
+
+
+class LevelStreamer:
+    """Reads the chunks of a LevelFile on a background thread.
+
+    ``prefetch`` queues reads without waiting; ``get`` returns a chunk,
+    waiting only if its read has not finished yet; ``forget`` drops chunks
+    the world no longer needs, so memory follows the player instead of the
+    level size. Every streamer shares one reader thread, so many worlds
+    (batch runs, modules.VecEnv) do not mean many threads.
+    """
+
+    _executor = None  # created on first use
+
+    def __init__(self, level):
+        self.level = level
+        if LevelStreamer._executor is None:
+            LevelStreamer._executor = ThreadPoolExecutor(1, thread_name_prefix="level")
+        self._chunks = {}  # index -> Future of Chunk
+
+    def prefetch(self, indices):
+        for i in indices:
+            if 0 <= i < len(self.level) and i not in self._chunks:
+                self._chunks[i] = self._executor.submit(self.level.read_chunk, i)
+
+    def get(self, i):
+        self.prefetch((i,))
+        return self._chunks[i].result()
+
+    def forget(self, keep):
+        """Drop every chunk whose index is not in ``keep``."""
+        for i in [i for i in self._chunks if i not in keep]:
+            self._chunks.pop(i).cancel()
+
+    def __len__(self):
+        return len(self._chunks)
+
+
+# -------------------------------
+# LEVEL CONTENT
+# -------------------------------
+def platform_spawn(x, y, width):
+    """Spawn tuple of an enemy patrolling the platform at (x, y, width)."""
+    return (x + width // 2, y - 32, x, x + width - 10)
+
+
+def default_level(path=DEFAULT_LEVEL):
+    """Write the original one-screen level."""
+    platforms = [(100, 450, 150, 20), (350, 380, 200, 20), (600, 300, 150, 20), (200, 250, 120, 20)]
+    spawns = [platform_spawn(*plat[:3]) for plat in platforms[:3]]
+    LevelFile.write(path, 800, 550, platforms, spawns)
+
+
+def generate_level(path, screens, seed=None, chunk_width=800):
+    """Write a random level ``screens`` screens wide, a few platforms per screen."""
+    rng = random.Random(seed)
+    platforms, spawns = [], []
+    for screen in range(screens):
+        for _ in range(rng.randint(3, 5)):
+            width = rng.randrange(100, 220, 10)
+            x = screen * 800 + rng.randrange(0, 800 - width)
+            y = rng.randrange(250, 470, 10)
+            platforms.append((x, y, width, 20))
+            if screen and rng.random() < 0.6:  # the first screen is safe
+                spawns.append(platform_spawn(x, y, width))
+    LevelFile.write(path, screens * 800, 550, platforms, spawns, chunk_width)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("default").add_argument("path", nargs="?", default=DEFAULT_LEVEL)
+    generate = sub.add_parser("generate")
+    generate.add_argument("path")
+    generate.add_argument("--screens", type=int, default=100)
+    generate.add_argument("--seed", type=int, default=None)
+    sub.add_parser("info").add_argument("path")
+    args = parser.parse_args(argv)
+
+    if args.command == "default":
+        default_level(args.path)
+    elif args.command == "generate":
+        generate_level(args.path, args.screens, args.seed)
+    level = LevelFile(args.path)
+    print("%s: %d px wide, %d chunks of %d px, %d enemies, %d bytes" % (
+        args.path, level.width, len(level), level.chunk_width,
+        level.enemy_count, os.path.getsize(args.path)))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,5 @@
 # -*- coding: utf-8 -*-
 # type: ignore
-import pgzrun
-
 from modules.Enemy import Enemy
 from pygame import Rect
 
@@ -21,14 +19,15 @@ class Platform:
         self.patrol_max = x + width - 10
         self.patrol_width = self.patrol_max - self.patrol_min
     
-    def spawn_enemy(self):
+    def spawn_enemy(self, pool=None):
         """Create an enemy at the center of this platform if configured.
 
+        The enemy is stored in ``pool`` (an EnemyPool) when one is given.
         Returns the created Enemy or None if no enemy was spawned.
         """
         if self.has_enemy and self.enemy is None:
             # Cria o enemy no centro da plataforma
-            enemy = Enemy(self.center_x, self.center_y, patrol_width=0)
+            enemy = Enemy(self.center_x, self.center_y, patrol_width=0, pool=pool)
             
             # Configura os limites de patrulha manualmente
             enemy.patrol_min_x = self.patrol_min
@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+# type: ignore
+# modules/Profiler.py
+import json
+import os
+import time
+from collections import deque
+
+
+class _NullScope:
+    """Scope returned while profiling is off: entering it does nothing."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SCOPE = _NullScope()
+
+
+class _Scope:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler._record(self.name, self.start, time.perf_counter_ns())
+        return False
+
+
+class Profiler:
+    """Named-scope frame profiler with rolling stats and trace export.
+
+    Code marks its phases with ``with profiler.scope("hero.update"):``.
+    While ``enabled`` is False, ``scope`` returns a shared do-nothing
+    context, so instrumented code pays one attribute check per scope.
+    When enabled, the time spent in each scope is summed per frame and the
+    last ``window`` frames are kept for ``stats`` and the overlay.
+    ``capture`` additionally records every scope of the next frames as
+    Chrome trace events (loadable in chrome://tracing or Perfetto).
+
+    The game loop calls ``next_frame`` once per frame.
+
+    Attributes:
+        enabled (bool): whether scopes are timed.
+        show_overlay (bool): whether the game draws the overlay.
+        window (int): number of frames kept for the rolling stats.
+    """
+
+    def __init__(self, window=60):
+        self.enabled = False
+        self.show_overlay = False
+        self.window = window
+        self.frame = 0
+        self._totals = {}  # name -> ns spent during the current frame
+        self._history = {}  # name -> deque of per-frame ms
+        self._frame_start = None
+        self._origin = time.perf_counter_ns()
+        self._events = None  # trace events while capturing
+        self._capture_left = 0
+        self._capture_path = None
+
+    def scope(self, name):
+        """Return a context manager timing the enclosed code as ``name``."""
+        if not self.enabled:
+            return _NULL_SCOPE
+        return _Scope(self, name)
+
+    def _record(self, name, start, end):
+        self._totals[name] = self._totals.get(name, 0) + (end - start)
+        if self._events is not None:
+            self._events.append({
+                "name": name, "cat": "game", "ph": "X",
+                "ts": (start - self._origin) / 1000, "dur": (end - start) / 1000,
+                "pid": os.getpid(), "tid": 0,
+            })
+
+    def next_frame(self):
+        """Close the current frame: fold its totals into the rolling stats."""
+        if not self.enabled:
+            return
+        now = time.perf_counter_ns()
+        if self._frame_start is not None:
+            self._record("frame", self._frame_start, now)
+        self._frame_start = now
+        self.frame += 1
+
+        totals = self._totals
+        for name in totals.keys() | self._history.keys():
+            history = self._history.get(name)
+            if history is None:
+                history = self._history[name] = deque(maxlen=self.window)
+            history.append(totals.get(name, 0) / 1e6)
+        totals.clear()
+
+        if self._events is not None:
+            self._events.append({
+                "name": "frame %d" % self.frame, "cat": "game", "ph": "i", "s": "g",
+                "ts": (now - self._origin) / 1000, "pid": os.getpid(), "tid": 0,
+            })
+            self._capture_left -= 1
+            if self._capture_left <= 0:
+                self.export_trace(self._capture_path)
+                self._events = None
+                self.enabled = self.show_overlay
+
+    def stats(self):
+        """Return ``{name: (mean_ms, max_ms)}`` over the rolling window."""
+        return {
+            name: (sum(history) / len(history), max(history))
+            for name, history in sorted(self._history.items())
+        }
+
+    def reset(self):
+        self._totals.clear()
+        self._history.clear()
+        self._frame_start = None
+
+    # -------------------------------
+    # TRACE EXPORT
+    # -------------------------------
+    def capture(self, frames, path):
+        """Record the next ``frames`` frames and write them to ``path``.
+
+        Profiling stays on for the capture, and afterwards only while the
+        overlay is shown.
+        """
+        self.enabled = True
+        self._events = []
+        self._capture_left = frames
+        self._capture_path = path
+
+    @property
+    def capturing(self):
+        return self._events is not None
+
+    def export_trace(self, path):
+        """Write the captured events as Chrome trace JSON."""
+        with open(path, "w") as f:
+            json.dump({"traceEvents": self._events or [], "displayTimeUnit": "ms"}, f)
+
+    # -------------------------------
+    # OVERLAY
+    # -------------------------------
+    def draw_overlay(self, target, text_cache, pos=(540, 40), fontsize=18):
+        """Draw the rolling mean/max per phase; return the drawn Rect."""
+        stats = self.stats()
+        line = fontsize - 4
+        x, y = pos
+        width = 250
+        area = target.fill((0, 0, 0), (x, y, width, line * (len(stats) + 1) + 8))
+        color = (200, 255, 200)
+        text_cache.draw(target, "phase", (x + 4, y + 4), fontsize, color)
+        text_cache.draw(target, "mean / max ms", (x + width - 4, y + 4), fontsize, color,
+                        anchor="topright")
+        for name, (mean, peak) in stats.items():
+            y += line
+            text_cache.draw(target, name, (x + 4, y + 4), fontsize, color)
+            text_cache.draw_counter(target, "", "%.2f / %.2f" % (mean, peak),
+                                    (x + width - 4, y + 4), fontsize, color, anchor="topright")
+        return area
+
+
+profiler = Profiler()  # shared by the game loop and the modules it times
@@ -9,27 +9,55 @@ class Projectile:
     Attributes:
         rect (pygame.Rect): rectangle representing position and size.
         direction (int): 1 for right, -1 for left.
-        speed (int): horizontal speed in pixels per frame.
+        speed (float): horizontal speed in pixels per second.
+        x (float): exact horizontal position; ``rect.x`` is its rounded copy.
+        prev_x (float): position at the previous tick, for interpolation.
         color (tuple): RGB color used to draw the projectile.
         alive (bool): whether the projectile is active.
+        slot (int): index in the owning ProjectilePool, or None.
     """
 
-    def __init__(self, x, y, direction, speed=10, width=10, height=4, color=(255, 255, 0)):
+    __slots__ = ("rect", "x", "prev_x", "direction", "speed", "color", "alive", "slot")
+
+    def __init__(self, x, y, direction, speed=600, width=10, height=4, color=(255, 255, 0)):
         # position and direction
         self.rect = Rect(x, y, width, height)
+        self.color = color
+        self.slot = None
+        self.reset(x, y, direction, speed)
+
+    def reset(self, x, y, direction, speed=600):
+        """Relaunch this projectile in place (used by ProjectilePool)."""
+        rect = self.rect
+        rect.x = x
+        rect.y = y
+        self.x = self.prev_x = float(rect.x)
         self.direction = direction  # 1 = right, -1 = left
         self.speed = speed
-        self.color = color
         self.alive = True
 
-    def update(self, screen_width):
-        """Move the projectile and deactivate it if it leaves the screen."""
-        self.rect.x += self.speed * self.direction
+    def update(self, right, dt, left=0):
+        """Move the projectile and deactivate it once it leaves [left, right].
+
+        The bounds are world x coordinates (the hero passes the stretch of
+        the level a camera following it could show).
+        """
+        self.prev_x = self.x
+        self.x += self.speed * self.direction * dt
+        self.rect.x = round(self.x)
 
-        # deactivate when leaving screen bounds
-        if self.rect.right < 0 or self.rect.left > screen_width:
+        # deactivate once the whole move of the tick is outside the bounds
+        # (what it passed on the way is still hit, see World.projectile_hit)
+        if max(self.prev_x, self.x) + self.rect.width < left or min(self.prev_x, self.x) > right:
             self.alive = False
 
-    def draw(self, screen):
-        """Draw the projectile to the given screen object."""
-        screen.draw.filled_rect(self.rect, self.color)
+    def draw(self, screen, alpha=1.0, offset=(0, 0)):
+        """Draw the projectile, interpolated between the last two ticks.
+
+        ``offset`` moves it from world to screen coordinates.
+        Returns the screen Rect that was drawn.
+        """
+        x = round(self.prev_x + (self.x - self.prev_x) * alpha) + offset[0]
+        rect = self.rect.move(x - self.rect.x, offset[1])
+        screen.draw.filled_rect(rect, self.color)
+        return rect
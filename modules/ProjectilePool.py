@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+# type: ignore
+# modules/ProjectilePool.py
+import pygame
+
+from modules.Projectile import Projectile
+
+
+class ProjectilePool:
+    """Fixed-capacity storage that recycles Projectile objects.
+
+    Every slot holds a ``Projectile`` (a ``__slots__`` object), made the
+    first time that many are in flight; ``spawn`` relaunches a free one in
+    place and ``update`` moves all live projectiles in one pass, compacting
+    the live list in place and pushing expired slots back on the free list.
+    In steady state neither spawning nor expiring allocates. When every
+    slot is in flight, the oldest projectile is recycled.
+
+    Iterating the pool yields the live projectiles in spawn order.
+
+    For drawing, ``sprites`` gives every live projectile as one shared
+    pre-rendered surface and a position, for a batched blit (see
+    Renderer.queue).
+    """
+
+    _surfaces = {}  # (size, color) -> filled Surface, shared by every pool
+
+    def __init__(self, capacity=64):
+        self.capacity = capacity
+        self._slots = []  # made on demand, up to capacity, then reused
+        self._free = []  # stack of free slots
+        self.live = []
+
+    def __iter__(self):
+        return iter(self.live)
+
+    def __len__(self):
+        return len(self.live)
+
+    def spawn(self, x, y, direction, speed=600):
+        """Launch a projectile from a free slot and return it."""
+        if self._free:
+            proj = self._slots[self._free.pop()]
+        elif len(self._slots) < self.capacity:
+            proj = Projectile(0, 0, 1)
+            proj.slot = len(self._slots)
+            self._slots.append(proj)
+        else:
+            proj = self.live.pop(0)  # pool exhausted: recycle the oldest
+        proj.reset(x, y, direction, speed)
+        self.live.append(proj)
+        return proj
+
+    def update(self, dt, right, left=0):
+        """Move every live projectile and reclaim the ones that left [left, right]."""
+        live = self.live
+        free = self._free
+        kept = 0
+        for proj in live:
+            if proj.alive:
+                proj.update(right, dt, left)
+            if proj.alive:
+                live[kept] = proj
+                kept += 1
+            else:
+                free.append(proj.slot)
+        del live[kept:]
+
+    def sprites(self, alpha=1.0, offset=(0, 0)):
+        """``[(surface, (x, y)), ...]`` of the live projectiles, as Projectile.draw places them."""
+        ox, oy = offset
+        sprites = []
+        for proj in self.live:
+            rect = proj.rect
+            key = (rect.size, proj.color)
+            surface = self._surfaces.get(key)
+            if surface is None:
+                surface = self._surfaces[key] = pygame.Surface(rect.size)
+                surface.fill(proj.color)
+            x = round(proj.prev_x + (proj.x - proj.prev_x) * alpha) + ox
+            sprites.append((surface, (x, rect.y + oy)))
+        return sprites
+
+    def clear(self):
+        """Kill every projectile and free all slots."""
+        for proj in self.live:
+            proj.alive = False
+            self._free.append(proj.slot)
+        self.live.clear()
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+# type: ignore
+# modules/Renderer.py
+import pygame
+from pygame import Rect
+
+
+class Renderer:
+    """Layered renderer: a cached static world plus dirty rectangles.
+
+    The static layer (background, ground and platforms) is composited once
+    into a single surface and only rebuilt when what it shows changes: the
+    level, or the camera position, since the rects are in screen
+    coordinates. Rebuilds reuse the same surface. Each
+    frame, ``begin`` restores from that layer just the areas that moving
+    things covered on the previous frame, sprites report the areas they
+    draw through ``mark``, and ``end`` returns every rectangle that changed
+    on screen. A loop that owns the display can present only those with
+    ``pygame.display.update(rects)``; under Pygame Zero, which always flips
+    the whole window, the saving is in the pixels composited per frame.
+
+    Sprites are batched: ``queue`` collects ``(surface, position)`` pairs in
+    one of ``LAYERS``, and ``flush`` draws each layer, bottom to top, with a
+    single ``Surface.blits`` call and marks what it covered. The cost of a
+    sprite is then a tuple in a list rather than a blit call from Python.
+
+    Attributes:
+        size (tuple): size of the target surface.
+        static (pygame.Surface): the composited static layer.
+        dirty (list): rects changed during the last frame.
+    """
+
+    LAYERS = ("enemies", "hero", "projectiles", "effects")  # bottom to top
+
+    def __init__(self, size):
+        self.size = size
+        self._bounds = Rect((0, 0), size)
+        self.static = None
+        self.dirty = []
+        self._static_key = None
+        self._full_redraw = True
+        self._previous = []  # areas covered by moving things last frame
+        self._current = []
+        self._batches = {layer: [] for layer in self.LAYERS}
+
+    def set_static(self, background, background_pos, rects, color):
+        """Composite the static layer, unless this exact level is cached.
+
+        ``background`` is drawn at ``background_pos`` and every rect in
+        ``rects`` (ground and platforms) is filled with ``color``.
+        """
+        key = (id(background), tuple(background_pos), tuple(tuple(r) for r in rects), color)
+        if key == self._static_key:
+            return
+        layer = self.static
+        if layer is None:
+            layer = self.static = pygame.Surface(self.size).convert()
+        layer.blit(background, background_pos)
+        for rect in rects:
+            layer.fill(color, rect)
+        self._static_key = key
+        self._full_redraw = True
+
+    def invalidate(self):
+        """Force a full redraw next frame (e.g. after another screen was shown)."""
+        self._full_redraw = True
+
+    def begin(self, target):
+        """Restore the static layer under last frame's moving things."""
+        if self._full_redraw:
+            target.blit(self.static, (0, 0))
+            self.dirty = [target.get_rect()]
+            self._full_redraw = False
+        else:
+            static = self.static
+            target.blits([(static, rect, rect) for rect in self._previous], False)
+            self.dirty = list(self._previous)
+        self._current = []
+
+    def mark(self, rect):
+        """Record an area drawn this frame (None is ignored)."""
+        if rect:
+            rect = rect.clip(self._bounds)
+            if rect:
+                self._current.append(rect)
+
+    def queue(self, layer, surface, pos):
+        """Add a sprite to ``layer``, drawn at ``pos`` (top-left) by ``flush``."""
+        self._batches[layer].append((surface, pos))
+
+    def queue_many(self, layer, sprites):
+        """Add ``(surface, pos)`` pairs to ``layer``."""
+        self._batches[layer].extend(sprites)
+
+    def flush(self, target):
+        """Draw the queued sprites, one ``blits`` per layer, and mark them."""
+        current = self._current
+        for layer in self.LAYERS:
+            batch = self._batches[layer]
+            if batch:
+                # blits clips the rects it returns to the target
+                current.extend(rect for rect in target.blits(batch) if rect)
+                batch.clear()
+
+    def end(self):
+        """Finish the frame and return the rects that changed on screen."""
+        self.dirty.extend(self._current)
+        self._previous = self._current
+        return self.dirty
+
+    def dirty_area(self):
+        """Pixels touched during the last frame (may double-count overlaps)."""
+        return sum(rect.width * rect.height for rect in self.dirty)
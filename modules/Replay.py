@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+# type: ignore
+# modules/Replay.py
+"""Record the input of a session and replay it deterministically.
+
+    python -m modules.Headless --frames 3600 --seed 7 --record run.rpl
+    python -m modules.Headless --replay run.rpl
+    python -m modules.Headless --replay run.rpl --trace trace.json
+
+A World is fully determined by its seed, timestep and level, plus the
+Controls and menu commands it gets each tick. A replay file stores just
+those, and at the end the state hash of the recorded world. Replaying
+feeds them back through ``World.command`` and ``World.step`` (the code
+path the window uses), with no display and as fast as the CPU allows. It
+then checks that the hash matches.
+"""
+import os
+import struct
+
+from modules.Input import BY_BITS
+from modules.Profiler import profiler
+from modules.World import World
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# commands are stored by their index in World.COMMANDS
+COMMAND_IDS = {name: i for i, name in enumerate(World.COMMANDS)}
+
+
+class InputRecorder:
+    """Logs the Controls and commands a World gets, tick by tick.
+
+    Create it with the world before its first step. Call ``command`` next
+    to every ``World.command``, ``record`` before every ``World.step``, and
+    ``save`` when done. Ticks are stored run-length encoded, as
+    ``(repeat, control bits, commands)`` runs: input held down for a
+    second costs 4 bytes, not 60. Commands are kept in the order they were
+    given, before the first tick of the run they start, so "menu" then
+    "start" within one tick replays as it was played.
+
+    Attributes:
+        frames (int): ticks recorded so far.
+    """
+
+    def __init__(self, world):
+        if world.frame:
+            raise ValueError("start recording before the world's first step")
+        self.world = world
+        self.frames = 0
+        self._runs = []  # [repeat, bits, commands]
+        self._commands = []  # commands given since the last tick, in order
+
+    def command(self, name):
+        """Note a command applied to the world before the next step."""
+        if name not in COMMAND_IDS:
+            raise ValueError("unknown command %r" % name)
+        self._commands.append(name)
+
+    def record(self, controls):
+        """Note the Controls of the step about to run."""
+        bits = controls.bits
+        runs = self._runs
+        if not self._commands and runs and runs[-1][1] == bits and runs[-1][0] < 0xFFFF:
+            runs[-1][0] += 1
+        else:
+            runs.append([1, bits, tuple(self._commands)])
+            self._commands = []
+        self.frames += 1
+
+    def save(self, path):
+        """Write the recording, with the world's current state hash."""
+        world = self.world
+        replay = Replay(world.seed, world.timestep, world.level_path,
+                        [tuple(run) for run in self._runs], world.state_hash(),
+                        tuple(self._commands))
+        replay.save(path)
+        return replay
+
+
+class Replay:
+    """A recorded session: the world's seed, timestep and level, and its input.
+
+    File layout (little endian)::
+
+        MAGIC | HEADER | level path (utf-8)
+        | runs: repeat (uint16), control bits (uint8), command count (uint8),
+          then the ids of the commands given before the run (uint8 each)
+        | ids of the commands given after the last tick (uint8 each)
+
+    The header holds the version, seed, timestep, tick count, run count,
+    the number of commands given after the last tick, the path length and
+    the end state hash. The level path is stored relative to the game
+    folder when it is inside it. Command ids index World.COMMANDS.
+    """
+
+    MAGIC = b"RPL1"
+    VERSION = 2
+    HEADER = struct.Struct("<HQdIIBH16s")
+    RUN = struct.Struct("<HBB")
+
+    def __init__(self, seed, timestep, level_path, runs, state_hash, final_commands=()):
+        self.seed = seed
+        self.timestep = timestep
+        self.level_path = level_path
+        self.runs = runs  # (repeat, control bits, commands before the first tick)
+        self.frames = sum(run[0] for run in runs)
+        self.state_hash = state_hash
+        self.final_commands = final_commands
+
+    def save(self, path):
+        level = os.path.abspath(self.level_path)
+        if level.startswith(ROOT + os.sep):
+            level = os.path.relpath(level, ROOT)
+        level = level.replace(os.sep, "/").encode("utf-8")
+        with open(path, "wb") as f:
+            f.write(self.MAGIC)
+            f.write(self.HEADER.pack(self.VERSION, self.seed, self.timestep, self.frames,
+                                     len(self.runs), len(self.final_commands), len(level),
+                                     bytes.fromhex(self.state_hash)))
+            f.write(level)
+            for repeat, bits, commands in self.runs:
+                f.write(self.RUN.pack(repeat, bits, len(commands)))
+                f.write(bytes(COMMAND_IDS[name] for name in commands))
+            f.write(bytes(COMMAND_IDS[name] for name in self.final_commands))
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        if data[:4] != cls.MAGIC:
+            raise ValueError("%s is not a replay file" % path)
+        (version, seed, timestep, frames, run_count, final_count, path_length,
+         state_hash) = cls.HEADER.unpack_from(data, 4)
+        if version != cls.VERSION:
+            raise ValueError("%s: unsupported replay version %d" % (path, version))
+        offset = 4 + cls.HEADER.size
+        level = data[offset:offset + path_length].decode("utf-8")
+        offset += path_length
+        runs = []
+        for _ in range(run_count):
+            repeat, bits, count = cls.RUN.unpack_from(data, offset)
+            offset += cls.RUN.size
+            runs.append((repeat, bits, cls._commands(data, offset, count)))
+            offset += count
+        final_commands = cls._commands(data, offset, final_count)
+        replay = cls(seed, timestep, os.path.join(ROOT, level), runs, state_hash.hex(),
+                     final_commands)
+        if replay.frames != frames or offset + final_count != len(data):
+            raise ValueError("%s is truncated" % path)
+        return replay
+
+    @staticmethod
+    def _commands(data, offset, count):
+        ids = data[offset:offset + count]
+        if len(ids) != count:
+            raise ValueError("replay is truncated")
+        return tuple(World.COMMANDS[i] for i in ids)
+
+    def ticks(self):
+        """Yield ``(commands, controls)`` for every tick, in order.
+
+        ``commands`` are the ones given before that tick, in the order given.
+        """
+        for repeat, bits, commands in self.runs:
+            controls = BY_BITS[bits]
+            yield commands, controls
+            for _ in range(repeat - 1):
+                yield (), controls
+
+    def play(self, world=None):
+        """Run the recording on a fresh World (or ``world``) and return it."""
+        if world is None:
+            world = World(self.timestep, self.level_path, self.seed)
+        command = world.command
+        step = world.step
+        for commands, controls in self.ticks():
+            profiler.next_frame()
+            for name in commands:
+                command(name)
+            step(controls)
+        for name in self.final_commands:
+            command(name)
+        return world
+
+    def verify(self, world=None):
+        """Replay and return ``(matches, world)``: whether the end state is the recorded one."""
+        world = self.play(world)
+        return world.state_hash() == self.state_hash, world
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+# type: ignore
+# modules/Scheduler.py
+from pygame import Rect
+
+
+class FixedStepScheduler:
+    """Runs physics at a fixed tick rate, independent of the render rate.
+
+    Real frame time is collected in an accumulator; ``advance`` reports how
+    many whole ticks are due. When a frame took so long that more than
+    ``max_steps`` ticks would be needed, the excess time is dropped: the
+    game slows down for that frame instead of spiralling into ever longer
+    catch-up frames.
+
+    Attributes:
+        timestep (float): seconds per physics tick.
+        max_steps (int): cap on catch-up ticks per rendered frame.
+        accumulator (float): simulated time owed, always below one tick after advance.
+    """
+
+    def __init__(self, timestep, max_steps=5):
+        self.timestep = timestep
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+        self.dropped_time = 0.0  # total seconds discarded by the catch-up cap
+
+    def advance(self, dt):
+        """Add ``dt`` seconds of real time and return the number of ticks to run."""
+        self.accumulator += dt
+        steps = int(self.accumulator / self.timestep)
+        if steps > self.max_steps:
+            self.dropped_time += (steps - self.max_steps) * self.timestep
+            steps = self.max_steps
+            self.accumulator = self.accumulator % self.timestep
+        else:
+            self.accumulator -= steps * self.timestep
+        return steps
+
+    @property
+    def alpha(self):
+        """How far rendering is between the last tick and the next, in [0, 1)."""
+        return self.accumulator / self.timestep
+
+
+def lerp(a, b, t):
+    return a + (b - a) * t
+
+
+def draw_interpolated(actor, prev_pos, alpha, offset=(0, 0)):
+    """Draw an Actor at ``alpha`` between ``prev_pos`` and its current position.
+
+    ``offset`` is added to the drawn position (world to screen, see Camera).
+    Returns the screen Rect that was drawn.
+    """
+    pos = actor.pos
+    if alpha >= 1.0 or pos == prev_pos:
+        x, y = pos
+    else:
+        x, y = lerp(prev_pos[0], pos[0], alpha), lerp(prev_pos[1], pos[1], alpha)
+    x += offset[0]
+    y += offset[1]
+    if (x, y) == pos:
+        actor.draw()
+        return Rect(actor.topleft, actor._surf.get_size())
+    actor.pos = (x, y)
+    actor.draw()
+    drawn = Rect(actor.topleft, actor._surf.get_size())
+    actor.pos = pos
+    return drawn
+
+
+def interpolated_topleft(actor, prev_pos, alpha, offset=(0, 0)):
+    """Where ``draw_interpolated`` would put ``actor``'s top-left (for Renderer.queue)."""
+    pos = actor.pos
+    if alpha >= 1.0 or pos == prev_pos:
+        x, y = pos
+    else:
+        x, y = lerp(prev_pos[0], pos[0], alpha), lerp(prev_pos[1], pos[1], alpha)
+    ax, ay = actor._anchor
+    return x + offset[0] - ax, y + offset[1] - ay
@@ -0,0 +1,255 @@
+# -*- coding: utf-8 -*-
+# type: ignore
+# modules/Snapshot.py
+"""Save a World's whole simulation state in one buffer and put it back in place.
+
+    data = world.snapshot()  # bytes, a few KB
+    ...
+    world.restore(data)  # back to that tick: reset, checkpoint, rollback
+
+A snapshot holds everything ``step`` changes: the hero, its projectiles,
+the world's enemies (every EnemyPool field of their slots), score, game
+state, timers, frame, the active chunks, the defeated spawns and the spawn
+RNG. Settings (timestep, hero and enemy tunables) are not state and are
+left alone.
+
+Restoring reuses what is already there. When the world still has the
+snapshot's chunks and enemies (any reset or rollback that stayed near
+the same place), the enemy fields are written back into their slots in a
+few array copies, the projectiles are relaunched from the pool's free
+slots, and no enemy, slot or projectile is made or freed. Only when the
+chunks differ are the missing ones loaded (as level streaming would)
+before the fields are written. A restored world then steps exactly like
+the one that was saved.
+"""
+import struct
+
+import numpy as np
+
+from modules.Animation import show_frame
+from modules.EnemyPool import EnemyPool
+
+STATES = ("menu", "playing", "gameover", "win")
+
+
+class Snapshot:
+    """Binary layout of a world snapshot, and the code that reads and writes it.
+
+    Layout (little endian)::
+
+        MAGIC | HEADER | HERO | RNG | Mersenne Twister state (625 * uint32)
+        | projectiles * PROJECTILE | active chunks (int32)
+        | defeated spawns: chunk, number (int32) | enemies * ENEMY
+
+    ENEMY has one column per EnemyPool field but ``owner``, plus the
+    enemy's spawn (chunk -1 for enemies made with ``spawn_enemy``).
+    Enemies are stored in ``world.enemies`` order, which is also their
+    broad-phase order.
+    """
+
+    MAGIC = b"SNP2"
+    HEADER = struct.Struct("<QiBdiIIII")
+    HERO = struct.Struct("<5d?iibBHdBHb???")
+    RNG = struct.Struct("<i?d")
+    PROJECTILE = np.dtype([
+        ("x", "<f8"), ("prev_x", "<f8"), ("y", "<i4"), ("direction", "i1"), ("speed", "<f8"),
+    ])
+    FIELDS = tuple(name for name in EnemyPool.FIELDS if name != "owner")
+    ENEMY = np.dtype(
+        [("spawn", "<i4", 2)]
+        + [(name, np.dtype(EnemyPool.FIELDS[name]).newbyteorder("<")) for name in FIELDS]
+    )
+
+    # -------------------------------
+    # SAVE
+    # -------------------------------
+    @classmethod
+    def take(cls, world):
+        """The state of ``world`` between two steps, as bytes."""
+        hero = world.hero
+        actor = hero.actor
+        animation = hero.animation
+        pool = world.enemy_pool
+        center = world._center_chunk
+
+        header = cls.HEADER.pack(
+            world.frame, world.score, STATES.index(world.game_state), world.gameover_timer,
+            -1 if center is None else center, len(hero.projectiles), len(world.chunks),
+            len(world.defeated), len(world.enemies))
+        shown = cls._shown(actor, animation.animations)
+        if shown is None:
+            shown = (animation.animations.id(animation.name),
+                     animation.clip.index(animation.frame), hero.direction)
+        hero_data = cls.HERO.pack(
+            actor.x, actor.y, hero.prev_pos[0], hero.prev_pos[1], hero.vel_y,
+            hero.on_ground, hero.health, hero.damage_taken, hero.direction,
+            animation.animations.id(animation.name), animation.frame, animation.timer,
+            shown[0], shown[1], shown[2], hero.is_dead, hero.is_attacking, hero._has_shot)
+
+        version, mt, gauss = pool.rngs[world.owner].getstate()
+        rng = cls.RNG.pack(version, gauss is not None, gauss or 0.0)
+
+        projectiles = np.empty(len(hero.projectiles), dtype=cls.PROJECTILE)
+        for n, proj in enumerate(hero.projectiles):
+            projectiles[n] = (proj.x, proj.prev_x, proj.rect.y, proj.direction, proj.speed)
+
+        defeated = np.array(sorted(world.defeated), dtype="<i4").reshape(-1, 2)
+
+        enemies = np.empty(len(world.enemies), dtype=cls.ENEMY)
+        slots = np.fromiter((enemy.index for enemy in world.enemies), np.int64, len(world.enemies))
+        if world.enemies:
+            enemies["spawn"] = [enemy.spawn or (-1, -1) for enemy in world.enemies]
+        for name in cls.FIELDS:
+            enemies[name] = getattr(pool, name)[slots]
+
+        return b"".join((
+            cls.MAGIC, header, hero_data, rng, np.array(mt, dtype="<u4").tobytes(),
+            projectiles.tobytes(), np.array(sorted(world.chunks), dtype="<i4").tobytes(),
+            defeated.tobytes(), enemies.tobytes(),
+        ))
+
+    @staticmethod
+    def _shown(actor, animations):
+        """``(clip id, frame index, direction)`` of the surface ``actor`` shows, or None."""
+        for clip_id, clip in enumerate(animations.clips):
+            if actor._image_name in clip.names:
+                index = clip.names.index(actor._image_name)
+                left = clip._left is not None and clip._left[index] is actor._surf
+                return clip_id, index, -1 if left else 1
+        return None
+
+    # -------------------------------
+    # RESTORE
+    # -------------------------------
+    @classmethod
+    def restore(cls, world, data):
+        """Put ``world`` back in the state saved in ``data`` (see ``take``)."""
+        if data[:4] != cls.MAGIC:
+            raise ValueError("not a world snapshot")
+        offset = 4
+        (frame, score, state, gameover_timer, center, n_projectiles, n_chunks, n_defeated,
+         n_enemies) = cls.HEADER.unpack_from(data, offset)
+        offset += cls.HEADER.size
+        hero_data = cls.HERO.unpack_from(data, offset)
+        offset += cls.HERO.size
+        version, has_gauss, gauss = cls.RNG.unpack_from(data, offset)
+        offset += cls.RNG.size
+        mt = np.frombuffer(data, "<u4", 625, offset)
+        offset += mt.nbytes
+        projectiles = np.frombuffer(data, cls.PROJECTILE, n_projectiles, offset)
+        offset += projectiles.nbytes
+        chunks = np.frombuffer(data, "<i4", n_chunks, offset)
+        offset += chunks.nbytes
+        defeated = np.frombuffer(data, "<i4", 2 * n_defeated, offset)
+        offset += defeated.nbytes
+        enemies = np.frombuffer(data, cls.ENEMY, n_enemies, offset)
+
+        world.frame = frame
+        world.score = score
+        world.game_state = STATES[state]
+        world.gameover_timer = gameover_timer
+        cls._restore_hero(world.hero, hero_data, projectiles)
+
+        pool = world.enemy_pool
+        defeated = {(int(i), int(n)) for i, n in defeated.reshape(-1, 2)}
+        keys = [None if chunk < 0 else (chunk, n) for chunk, n in enemies["spawn"].tolist()]
+        views = cls._restore_layout(world, chunks.tolist(), defeated, keys)
+        slots = np.fromiter((enemy.index for enemy in views), np.int64, len(views))
+        for name in cls.FIELDS:
+            getattr(pool, name)[slots] = enemies[name]
+        grid = world.enemy_grid
+        cells = pool.grid_cells(slots, grid.cell_size)
+        moved = np.flatnonzero((pool._grid_cells[slots] != cells).any(axis=1))
+        pool._grid_cells[slots] = cells
+        if views is world.enemies:
+            for n in moved.tolist():
+                grid.update(views[n], pool.bounds(slots[n]))
+        else:
+            world.enemies[:] = views
+            grid.clear()
+            for enemy in views:
+                grid.insert(enemy, pool.bounds(enemy.index))
+        world._center_chunk = None if center < 0 else center
+
+        # after the layout: loading chunks draws from the spawn RNG
+        pool.rngs[world.owner].setstate((version, tuple(mt.tolist()), gauss if has_gauss else None))
+
+    @staticmethod
+    def _restore_hero(hero, data, projectiles):
+        (x, y, prev_x, prev_y, vel_y, on_ground, health, damage_taken, direction,
+         clip, frame, timer, shown_clip, shown_index, shown_direction,
+         is_dead, is_attacking, has_shot) = data
+        animation = hero.animation
+        animation.clip = animation.animations[clip]
+        animation.frame = frame
+        animation.timer = timer
+        show_frame(hero.actor, animation.animations[shown_clip], shown_index, shown_direction)
+        hero.actor.pos = (x, y)
+        hero.prev_pos = (prev_x, prev_y)
+        hero.vel_y = vel_y
+        hero.on_ground = on_ground
+        hero.health = health
+        hero.damage_taken = damage_taken
+        hero.direction = direction
+        hero.is_dead = is_dead
+        hero.is_attacking = is_attacking
+        hero._has_shot = has_shot
+
+        pool = hero.projectiles
+        pool.clear()
+        for x, prev_x, y, direction, speed in projectiles.tolist():
+            proj = pool.spawn(0, y, direction, speed)
+            proj.x = x
+            proj.prev_x = prev_x
+            proj.rect.x = round(x)
+
+    @staticmethod
+    def _restore_layout(world, chunks, defeated, keys):
+        """Give ``world`` the snapshot's chunks and enemies; return the enemies in ``keys`` order.
+
+        ``keys`` are the snapshot's enemy spawns (None for enemies made with
+        ``spawn_enemy``). When nothing changed this is ``world.enemies``
+        itself, untouched.
+        """
+        if world.defeated != defeated:
+            world.defeated.clear()
+            world.defeated.update(defeated)
+        same_chunks = len(world.chunks) == len(chunks) and all(i in world.chunks for i in chunks)
+        if same_chunks and len(world.enemies) == len(keys) and all(
+                enemy.spawn == key for enemy, key in zip(world.enemies, keys)):
+            return world.enemies
+
+        for i in [i for i in world.chunks if i not in chunks]:
+            world.unload_chunk(i)
+        for i in chunks:
+            if i not in world.chunks:
+                world.load_chunk(i)
+        world.defeated.clear()  # unloading remembered the enemies dead here
+        world.defeated.update(defeated)
+
+        wanted = set(keys)
+        by_spawn = {}
+        manual = []
+        for enemy in list(world.enemies):
+            if enemy.spawn is None:
+                manual.append(enemy)
+            elif enemy.spawn in wanted and enemy.spawn not in by_spawn:
+                by_spawn[enemy.spawn] = enemy
+            else:  # killed and unloaded after the snapshot, or never there
+                world.chunks[enemy.spawn[0]][2].remove((enemy.spawn, enemy))
+                world.remove_enemy(enemy)
+        for key in wanted:
+            if key is not None and key not in by_spawn:
+                by_spawn[key] = world._spawn_chunk_enemy(*key)
+        needed = keys.count(None)
+        for enemy in manual[needed:]:
+            world.remove_enemy(enemy)
+        manual = manual[:needed]
+        while len(manual) < needed:
+            manual.append(world.spawn_enemy(0, world.ground_y))
+        world.defeated.clear()  # removing dead enemies remembered them
+        world.defeated.update(defeated)
+
+        manual = iter(manual)
+        return [next(manual) if key is None else by_spawn[key] for key in keys]
+
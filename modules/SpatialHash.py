@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+# type: ignore
+# modules/SpatialHash.py
+
+
+class SpatialHash:
+    """Uniform-grid broad phase for rectangle collisions.
+
+    Objects are registered with anything exposing ``left``, ``top``,
+    ``right`` and ``bottom`` (a Rect or an Actor). Each object is stored in
+    every grid cell its bounds overlap; ``query`` returns the objects
+    sharing a cell with a rectangle, so exact ``colliderect`` checks only
+    run on nearby candidates. ``update`` is incremental: an object that
+    moves within the same cells costs one comparison.
+
+    Objects are tracked by identity (Rects are not hashable), and query
+    results come back in registration order so collision resolution stays
+    deterministic.
+    """
+
+    def __init__(self, cell_size=64):
+        self.cell_size = cell_size
+        self._cells = {}  # (cx, cy) -> {id(obj): obj}
+        self._bounds = {}  # id(obj) -> (x0, y0, x1, y1) cell range
+        self._order = {}  # id(obj) -> registration number
+        self._next = 0
+
+    def __len__(self):
+        return len(self._bounds)
+
+    def __contains__(self, obj):
+        return id(obj) in self._bounds
+
+    def _cell_range(self, rect):
+        size = self.cell_size
+        return (
+            int(rect.left // size), int(rect.top // size),
+            int((rect.right - 1) // size), int((rect.bottom - 1) // size),
+        )
+
+    def insert(self, obj, rect):
+        """Register ``obj`` with the given bounds."""
+        key = id(obj)
+        if key in self._bounds:
+            self.update(obj, rect)
+            return
+        self._order[key] = self._next
+        self._next += 1
+        bounds = self._bounds[key] = self._cell_range(rect)
+        self._add(key, obj, bounds)
+
+    def update(self, obj, rect):
+        """Move ``obj`` to new bounds, touching buckets only if its cells changed."""
+        key = id(obj)
+        bounds = self._cell_range(rect)
+        old = self._bounds[key]
+        if bounds == old:
+            return
+        self._discard(key, old)
+        self._bounds[key] = bounds
+        self._add(key, obj, bounds)
+
+    def remove(self, obj):
+        key = id(obj)
+        self._discard(key, self._bounds.pop(key))
+        del self._order[key]
+
+    def clear(self):
+        self._cells.clear()
+        self._bounds.clear()
+        self._order.clear()
+
+    def query(self, rect):
+        """Return candidate objects whose cells overlap ``rect``, in registration order."""
+        x0, y0, x1, y1 = self._cell_range(rect)
+        cells = self._cells
+        found = {}
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    found.update(bucket)
+        if len(found) < 2:
+            return list(found.values())
+        order = self._order
+        return [found[key] for key in sorted(found, key=order.__getitem__)]
+
+    def _add(self, key, obj, bounds):
+        x0, y0, x1, y1 = bounds
+        cells = self._cells
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is None:
+                    bucket = cells[(cx, cy)] = {}
+                bucket[key] = obj
+
+    def _discard(self, key, bounds):
+        x0, y0, x1, y1 = bounds
+        cells = self._cells
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = cells[(cx, cy)]
+                del bucket[key]
+                if not bucket:
+                    del cells[(cx, cy)]
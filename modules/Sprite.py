@@ -1,11 +1,15 @@
 # -*- coding: utf-8 -*-
 # type: ignore
 # modules/Sprite.py
-import pgzrun
-import math
-import random
-from pgzero.builtins import Actor   
-from pygame import Rect
+import os
+import struct
+
+import pygame
+from pgzero import loaders
+from pgzero.builtins import images
+
+from modules.SpriteCache import SpriteCache
+
 
 class SpriteManager:
     """Utility class to manage sprite operations such as generating cached
@@ -13,33 +17,21 @@ class SpriteManager:
     """
 
     _flipped_cache = {}
+    atlas = None  # TextureAtlas, set by load_disk_cache()
     
     @classmethod
     def flip_image_horizontal(cls, image_name):
         """Flip an image horizontally and cache the resulting surface.
 
-        Uses a temporary Actor to access the underlying surface. The result is
-        stored in an internal cache so repeated flips are fast.
+        The whole surface is mirrored in one native ``pygame.transform.flip``
+        call. The result is stored in an internal cache so repeated flips are
+        fast.
         """
         if image_name in cls._flipped_cache:
             return cls._flipped_cache[image_name]
-        
-        # Create a temporary Actor to access the surface
-        temp_actor = Actor(image_name)
-        surface = temp_actor._surf
-        
-        width = surface.get_width()
-        height = surface.get_height()
-        flipped_surface = surface.copy()
-        
-        # Flip horizontal pixel by pixel (safe fallback if other helpers are not
-        # available in the runtime environment).
-        for x in range(width):
-            for y in range(height):
-                mirrored_x = width - 1 - x
-                color = surface.get_at((mirrored_x, y))
-                flipped_surface.set_at((x, y), color)
-        
+
+        flipped_surface = pygame.transform.flip(images.load(image_name), True, False)
+
         # Save in cache
         cls._flipped_cache[image_name] = flipped_surface
         return flipped_surface
@@ -48,13 +40,70 @@ class SpriteManager:
     def preload_flipped_frames(cls, frame_list):
         """Preload all horizontally flipped versions for the given frame list.
 
+        Frames missing from the cache are flipped in a single batch, so a
+        whole animation costs one pass instead of one lookup per call site.
         Returns a dict mapping original frame names to their flipped surfaces.
         """
-        flipped_frames = {}
-        for frame in frame_list:
-            flipped_frames[frame] = cls.flip_image_horizontal(frame)
-        return flipped_frames
+        missing = [frame for frame in frame_list if frame not in cls._flipped_cache]
+        flip = pygame.transform.flip
+        for frame in missing:
+            cls._flipped_cache[frame] = flip(images.load(frame), True, False)
+
+        return {frame: cls._flipped_cache[frame] for frame in frame_list}
+
+    @classmethod
+    def frame_size(cls, name):
+        """Size of an image without decoding it when possible.
+
+        Served from the atlas when loaded, else read from the PNG header.
+        """
+        if cls.atlas is not None and (name, False) in cls.atlas.rects:
+            return cls.atlas.size(name)
+        path = os.path.join(loaders.root, "images", name + ".png")
+        try:
+            with open(path, "rb") as f:
+                head = f.read(24)
+        except OSError:
+            head = b""
+        if head[:8] == b"\x89PNG\r\n\x1a\n" and head[12:16] == b"IHDR":
+            return struct.unpack(">II", head[16:24])
+        return images.load(name).get_size()
+
+    @classmethod
+    def sprite_cache(cls, cache_path=None):
+        """The SpriteCache for the game's images folder."""
+        if cache_path is None:
+            cache_path = os.path.join(loaders.root, ".cache", "sprites.bin")
+        return SpriteCache(os.path.join(loaders.root, "images"), cache_path)
+
+    @classmethod
+    def load_disk_cache(cls, cache_path=None, build=True):
+        """Load the sprite atlas from the on-disk cache and serve frames from it.
+
+        Call once at startup, before any Actor is created. Both the image
+        loader and the flip cache are seeded with subsurfaces of the atlas
+        sheets, so every frame Hero and Enemy display comes from them.
+        The cache file is rebuilt when a PNG in images/ changes; with
+        ``build=False`` a stale cache is left alone (to be rebuilt in the
+        background, see AssetLoader) and 0 is returned. Returns the number
+        of frames loaded.
+        """
+        cache = cls.sprite_cache(cache_path)
+        atlas = cache.load_or_build() if build else cache.load()
+        if atlas is None:
+            return 0
+        return cls.install_atlas(atlas)
+
+    @classmethod
+    def install_atlas(cls, atlas):
+        """Serve every frame (and its flipped twin) from ``atlas``."""
+        cls.atlas = atlas
+        names = atlas.names()
+        for name in names:
+            images.cache[images.cache_key(name, (), {})] = cls.atlas.frame(name)
+            cls._flipped_cache[name] = cls.atlas.frame(name, flipped=True)
+        return len(names)
 
 # Compatibility helper
 def flip_image_horizontal(image_name):
-    return SpriteManager.flip_image_horizontal(image_name)
\ No newline at end of file
+    return SpriteManager.flip_image_horizontal(image_name)
@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+# type: ignore
+# modules/SpriteCache.py
+import json
+import os
+import struct
+
+import pygame
+from pygame import Rect
+
+from modules.Atlas import TextureAtlas
+
+
+class SpriteCache:
+    """Versioned on-disk cache of the packed sprite atlas.
+
+    Every PNG in the images folder and its horizontally flipped twin are
+    packed into one TextureAtlas, and the cache file stores its sheets as
+    raw display-format pixels, so a warm start needs no PNG decoding and no
+    image transforms.
+
+    File layout::
+
+        MAGIC | header length (uint32) | JSON header | pixels of each sheet
+
+    The header records the cache version, the pixel format, the sheet sizes
+    and, for each image, its path, mtime, size, SHA-1 and atlas rects
+    (sheet index first). An entry whose mtime or size changed is re-hashed;
+    any content change rebuilds the whole cache.
+    """
+
+    MAGIC = b"SPRC"
+    VERSION = 3
+    PIXEL_FORMAT = "BGRA"
+
+    def __init__(self, image_dir, cache_path):
+        self.image_dir = image_dir
+        self.cache_path = cache_path
+
+    def load_or_build(self):
+        """Return the cached TextureAtlas, rebuilding it if stale."""
+        atlas = self.load()
+        if atlas is None:
+            atlas = self.build()
+        return atlas
+
+    def load(self):
+        """Read the cache file: the header, then every sheet in one bulk read.
+
+        Returns None when the file is missing, truncated, from another
+        version, or no longer matches the PNGs on disk.
+        """
+        try:
+            with open(self.cache_path, "rb") as f:
+                header = self._read_header(f)
+                if header is None or not self._is_fresh(header["images"]):
+                    return None
+                # only the pixels stay in memory, not the file's header
+                data = bytearray(sum(width * height * 4 for width, height in header["sheets"]))
+                if f.readinto(data) != len(data):
+                    return None
+        except OSError:
+            return None
+
+        # The sheets share the buffer instead of copying it and keep it alive.
+        sheets = []
+        start = 0
+        for width, height in header["sheets"]:
+            pixels = memoryview(data)[start:start + width * height * 4]
+            sheets.append(pygame.image.frombuffer(pixels, (width, height), self.PIXEL_FORMAT))
+            start += width * height * 4
+
+        rects = {}
+        for name, entry in header["images"].items():
+            sheet, *rect = entry["rect"]
+            rects[(name, False)] = (sheet, Rect(rect))
+            sheet, *rect = entry["flipped_rect"]
+            rects[(name, True)] = (sheet, Rect(rect))
+        return TextureAtlas(sheets, rects)
+
+    def build(self, decoded=None):
+        """Decode and flip every PNG, pack the atlas and write the cache file.
+
+        ``decoded`` optionally maps image names to surfaces already decoded
+        elsewhere (e.g. by the AssetLoader's workers); those are not decoded
+        again.
+        """
+        import hashlib  # only needed off the warm path
+
+        decoded = decoded or {}
+        frames = {}
+        images = {}
+        for name, path in self._sources():
+            with open(path, "rb") as f:
+                raw = f.read()
+            surface = decoded.get(name)
+            if surface is None:
+                surface = pygame.image.load(path)
+            surface = surface.convert_alpha()
+            frames[name] = (surface, pygame.transform.flip(surface, True, False))
+
+            stat = os.stat(path)
+            images[name] = {
+                "path": os.path.relpath(path, self.image_dir),
+                "mtime": stat.st_mtime_ns,
+                "bytes": stat.st_size,
+                "sha1": hashlib.sha1(raw).hexdigest(),
+            }
+
+        atlas = TextureAtlas.pack(frames)
+        for name, entry in images.items():
+            sheet, rect = atlas.rects[(name, False)]
+            entry["rect"] = [sheet] + list(rect)
+            sheet, rect = atlas.rects[(name, True)]
+            entry["flipped_rect"] = [sheet] + list(rect)
+
+        header = json.dumps({
+            "version": self.VERSION,
+            "pygame": pygame.version.ver,
+            "masks": self._display_masks(),
+            "sheets": [sheet.get_size() for sheet in atlas.sheets],
+            "images": images,
+        }).encode("utf-8")
+
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            tmp_path = self.cache_path + ".tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(self.MAGIC)
+                f.write(struct.pack("<I", len(header)))
+                f.write(header)
+                for sheet in atlas.sheets:
+                    f.write(pygame.image.tobytes(sheet, self.PIXEL_FORMAT))
+            os.replace(tmp_path, self.cache_path)
+        except OSError:
+            pass  # a read-only install still runs, just without the cache
+
+        return atlas
+
+    def _sources(self):
+        for filename in sorted(os.listdir(self.image_dir)):
+            name, ext = os.path.splitext(filename)
+            if ext.lower() == ".png":
+                yield name, os.path.join(self.image_dir, filename)
+
+    def _read_header(self, f):
+        head = f.read(8)
+        if len(head) < 8 or head[:4] != self.MAGIC:
+            return None
+        (length,) = struct.unpack_from("<I", head, 4)
+        try:
+            header = json.loads(f.read(length).decode("utf-8"))
+        except ValueError:
+            return None
+        if (header.get("version") != self.VERSION
+                or header.get("pygame") != pygame.version.ver
+                or header.get("masks") != self._display_masks()):
+            return None
+        return header
+
+    def _is_fresh(self, entries):
+        sources = dict(self._sources())
+        if set(sources) != set(entries):
+            return False
+
+        for name, entry in entries.items():
+            try:
+                stat = os.stat(sources[name])
+            except OSError:
+                return False
+            if stat.st_mtime_ns == entry["mtime"] and stat.st_size == entry["bytes"]:
+                continue
+            # touched but maybe unchanged: fall back to the content hash
+            import hashlib
+            with open(sources[name], "rb") as f:
+                if hashlib.sha1(f.read()).hexdigest() != entry["sha1"]:
+                    return False
+        return True
+
+    @staticmethod
+    def _display_masks():
+        return list(pygame.Surface((1, 1), pygame.SRCALPHA).convert_alpha().get_masks())
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+# type: ignore
+# modules/Sweep.py
+"""Swept-AABB collision: when, during one tick, a moving box first touches another.
+
+Discrete checks look at where things are at the end of a tick, so a box
+that moves farther than a platform is thick (or an enemy is wide) in one
+tick can pass through it unseen. ``sweep`` instead gives the time of
+impact along the whole move, so collisions hold at any tick rate.
+
+Boxes are ``(left, top, right, bottom)`` tuples in float pixels;
+``box_of`` makes one from anything with those attributes (a Rect or an
+Actor). Touching edges do not collide, as with ``Rect.colliderect``.
+"""
+import math
+
+from pygame import Rect
+
+INF = float("inf")
+
+
+def box_of(obj):
+    """``(left, top, right, bottom)`` of a Rect, an Actor or anything alike."""
+    return (obj.left, obj.top, obj.right, obj.bottom)
+
+
+def moved(box, dx, dy):
+    """``box`` translated by (dx, dy)."""
+    left, top, right, bottom = box
+    return (left + dx, top + dy, right + dx, bottom + dy)
+
+
+def swept_rect(box, dx, dy):
+    """Rect covering ``box`` along its whole move, for broad-phase queries."""
+    left, top, right, bottom = box
+    left, right = min(left, left + dx), max(right, right + dx)
+    top, bottom = min(top, top + dy), max(bottom, bottom + dy)
+    x, y = math.floor(left), math.floor(top)
+    return Rect(x, y, math.ceil(right) - x, math.ceil(bottom) - y)
+
+
+def _axis(low, high, target_low, target_high, delta):
+    """Entry and exit times of [low, high] moving by delta against a fixed span."""
+    if delta > 0:
+        return (target_low - high) / delta, (target_high - low) / delta
+    if delta < 0:
+        return (target_high - low) / delta, (target_low - high) / delta
+    if high <= target_low or low >= target_high:
+        return INF, -INF  # never overlaps on this axis
+    return -INF, INF
+
+
+def sweep(box, dx, dy, target):
+    """Time of impact of ``box`` moving by (dx, dy) against the fixed box ``target``.
+
+    Returns ``(t, nx, ny)``: ``t`` in [0, 1] is the fraction of the move
+    done when the boxes first overlap, and (nx, ny) is the normal of the
+    face of ``target`` that was hit (``(0, -1)``: its top). Boxes that
+    already overlap at the start give ``(0, 0, 0)``. Returns None if they
+    do not meet during the move.
+    """
+    left, top, right, bottom = box
+    t_left, t_top, t_right, t_bottom = target
+    entry_x, exit_x = _axis(left, right, t_left, t_right, dx)
+    entry_y, exit_y = _axis(top, bottom, t_top, t_bottom, dy)
+    entry = max(entry_x, entry_y)
+    exit = min(exit_x, exit_y)
+    if entry >= exit or entry > 1 or exit <= 0:
+        return None
+    if entry < 0:
+        return 0.0, 0, 0
+    if entry_x > entry_y:
+        return entry, (-1 if dx > 0 else 1), 0
+    return entry, 0, (-1 if dy > 0 else 1)
+
+
+def first_hit(box, dx, dy, targets, key=box_of, face=None):
+    """``(t, nx, ny, target)`` of the earliest of ``targets`` hit, or None.
+
+    With ``face`` (a normal, e.g. ``(0, -1)``), only hits on that face of
+    a target count. Ties go to the first one in ``targets``, so results
+    follow the order the broad phase returns.
+    """
+    best = None
+    for target in targets:
+        hit = sweep(box, dx, dy, key(target))
+        if hit is None or (face is not None and hit[1:] != face):
+            continue
+        if best is None or hit[0] < best[0]:
+            best = hit + (target,)
+    return best
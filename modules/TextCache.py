@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+# type: ignore
+# modules/TextCache.py
+from collections import OrderedDict
+
+from pgzero import ptext
+
+# anchor name -> fraction of the text size to shift left/up from the point
+ANCHORS = {
+    "topleft": (0, 0),
+    "center": (0.5, 0.5),
+    "midleft": (0, 0.5),
+    "topright": (1, 0),
+}
+
+
+class TextCache:
+    """LRU cache of rasterized text surfaces with a memory cap.
+
+    Entries are keyed by (string, font size, color, anchor) and hold the
+    surface plus its offset from the anchor point, so a steady-state frame
+    only blits. Counters that change often ("Score: 3/5") are composed from
+    a cached label and per-character glyphs by ``draw_counter``, so a new
+    value never rasterizes anything.
+
+    Text is rasterized with the same ptext renderer as ``screen.draw.text``
+    (but bypassing ptext's own cache), so it looks identical.
+
+    Attributes:
+        max_bytes (int): memory cap for cached surfaces (4 bytes per pixel).
+        hits, misses, evictions (int): running statistics.
+    """
+
+    def __init__(self, max_bytes=4 << 20):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()  # key -> (surface, (dx, dy), advance)
+
+    def get(self, text, fontsize, color, anchor="topleft"):
+        """Return ``(surface, offset, advance)``, rasterizing on a miss.
+
+        ``advance`` is the pen movement after the text, in fractional
+        pixels: unlike the surface width it includes trailing spaces
+        (ptext strips them) and the sub-pixel part of glyph advances, so
+        glyphs placed one after another line up like a whole string.
+        """
+        key = (text, fontsize, color, anchor)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry
+
+        self.misses += 1
+        surface = ptext.getsurf(text, fontsize=fontsize, color=color, cache=False)
+        ax, ay = ANCHORS[anchor]
+        w, h = surface.get_size()
+        advance = ptext.getfont(None, fontsize).size(text * 8)[0] / 8
+        entry = (surface, (-int(round(ax * w)), -int(round(ay * h))), advance)
+        self._entries[key] = entry
+        self.bytes += w * h * 4
+        self._evict()
+        return entry
+
+    def _evict(self):
+        entries = self._entries
+        while self.bytes > self.max_bytes and len(entries) > 1:
+            _, (surface, _, _) = entries.popitem(last=False)
+            w, h = surface.get_size()
+            self.bytes -= w * h * 4
+            self.evictions += 1
+
+    def draw(self, target, text, pos, fontsize, color, anchor="topleft"):
+        """Blit text with its ``anchor`` at ``pos``; return the drawn Rect."""
+        surface, (dx, dy), _ = self.get(text, fontsize, color, anchor)
+        topleft = (int(round(pos[0])) + dx, int(round(pos[1])) + dy)
+        return target.blit(surface, topleft)
+
+    def draw_counter(self, target, label, value, pos, fontsize, color, anchor="topleft"):
+        """Draw ``label`` followed by ``value`` built from cached glyphs.
+
+        ``value`` is any short string of frequently changing characters,
+        typically digits ("42", "3/5"). Returns the drawn Rect.
+        """
+        parts = [self.get(label, fontsize, color)] if label else []
+        parts.extend(self.get(char, fontsize, color) for char in value)
+        width = sum(advance for _, _, advance in parts)
+        height = max(surface.get_height() for surface, _, _ in parts)
+
+        ax, ay = ANCHORS[anchor]
+        x = pos[0] - ax * width
+        y = int(round(pos[1] - ay * height))
+        drawn = None
+        for surface, _, advance in parts:
+            rect = target.blit(surface, (int(round(x)), y))
+            drawn = rect if drawn is None else drawn.union(rect)
+            x += advance
+        return drawn
+
+    def clear(self):
+        self._entries.clear()
+        self.bytes = 0
+
+    def stats(self):
+        """Return hit/miss statistics and memory use as a dict."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+        }
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+# type: ignore
+# modules/VecEnv.py
+"""Many game instances stepped in lockstep, for automated playtesting agents.
+
+    env = VecEnv(1000, seed=0)
+    obs = env.reset()
+    obs, rewards, dones = env.step(actions)  # actions: (1000, 4) left/right/jump/attack
+"""
+import numpy as np
+
+from modules.EnemyPool import EnemyPool
+from modules.Input import ATTACK, BY_BITS, JUMP, LEFT, RIGHT
+from modules.Level import DEFAULT_LEVEL
+from modules.World import World
+
+
+class VecEnv:
+    """``n`` Worlds that step together from one batched action array.
+
+    Each instance is a full World (hero, projectiles, platforms, level
+    streaming), started in "playing", with seed ``seed + i``. Every enemy
+    of every instance lives in one shared EnemyPool, so a step costs one
+    vectorized enemy update for all instances instead of one per instance
+    (that update is most of a single World's step). Only the heroes and
+    projectile hits run per instance, through ``World.begin_step`` and
+    ``World.end_step``.
+
+    ``step`` returns contiguous arrays, overwritten by the next step (copy
+    them to keep them):
+
+    * observations, ``(n, observation_size)`` float32: the hero (x, y,
+      vertical speed, on ground, health, direction, attacking, score
+      progress), then the ``OBS_ENEMIES`` nearest living enemies (dx, dy,
+      present);
+    * rewards, ``(n,)`` float32: score gained plus health change / 100;
+    * dones, ``(n,)`` bool: the hero died, the level was won (``won``) or
+      ``max_steps`` ran out.
+
+    A finished instance is reset at once (``World.reset``: its start state
+    is restored in place, with the same enemies), and its observation is
+    the new episode's first one.
+    """
+
+    OBS_ENEMIES = 3
+    HERO_FEATURES = 8
+
+    def __init__(self, n, seed=0, level_path=DEFAULT_LEVEL, max_steps=3600,
+                 timestep=World.TIMESTEP):
+        self.n = n
+        self.max_steps = max_steps
+        self.timestep = timestep
+        self.pool = EnemyPool.shared(capacity=max(16, n * 4))
+        self.worlds = [World(timestep, level_path, seed + i, enemy_pool=self.pool)
+                       for i in range(n)]
+        for world in self.worlds:
+            world.command("start")
+        self.heroes = [world.hero for world in self.worlds]  # by owner, for the pool
+        self.grids = [world.enemy_grid for world in self.worlds]
+
+        self.observation_size = self.HERO_FEATURES + 3 * self.OBS_ENEMIES
+        self.observations = np.zeros((n, self.observation_size), dtype=np.float32)
+        self.rewards = np.zeros(n, dtype=np.float32)
+        self.dones = np.zeros(n, dtype=bool)
+        self.won = np.zeros(n, dtype=bool)
+        self.steps = np.zeros(n, dtype=np.int64)  # steps into the current episode
+        self._score = np.zeros(n)
+        self._health = np.zeros(n)
+        self._dead = np.zeros(n, dtype=bool)
+        self._win = np.zeros(n, dtype=bool)
+        # hero features are divided by these (x by the level width)
+        self._scale = np.array([self.worlds[0].width if n else 1, 600, 1000, 1, 100, 1, 1, 1])
+
+    def reset(self):
+        """Restart every instance; return the observations."""
+        for world in self.worlds:
+            world.reset()
+        self.steps[:] = 0
+        self._read_worlds()
+        return self._observe()
+
+    def step(self, actions):
+        """Advance every instance by one tick; return ``(observations, rewards, dones)``.
+
+        ``actions`` is ``(n, 4)``: left, right, jump, attack (any truthy value
+        presses), as in Controls and ``Hero.handle_input``.
+        """
+        actions = np.asarray(actions) != 0
+        bits = (actions[:, 0] * LEFT | actions[:, 1] * RIGHT
+                | actions[:, 2] * JUMP | actions[:, 3] * ATTACK).tolist()
+        playing = [world.begin_step(BY_BITS[b]) for world, b in zip(self.worlds, bits)]
+
+        pool = self.pool
+        if all(playing):
+            pool.update(self.timestep, self.heroes)
+        else:
+            owner = pool.owner[:pool.count]
+            pool.update(self.timestep, self.heroes, only=np.flatnonzero(np.array(playing)[owner]))
+        pool.update_grid(self.grids)
+        for world, active in zip(self.worlds, playing):
+            if active:
+                world.end_step()
+
+        score, health = self._score.copy(), self._health.copy()
+        self._read_worlds()
+        np.subtract(self._score, score, out=self.rewards)
+        self.rewards += (self._health - health) / 100
+        self.steps += 1
+        np.copyto(self.won, self._win)
+        self.dones[:] = self._dead | self._win | (self.steps >= self.max_steps)
+        for i in np.flatnonzero(self.dones):
+            self.worlds[i].reset()
+            self.steps[i] = 0
+        if self.dones.any():
+            self._read_worlds()
+        return self._observe(), self.rewards, self.dones
+
+    def _read_worlds(self):
+        for i, world in enumerate(self.worlds):
+            self._score[i] = world.score
+            self._health[i] = world.hero.health
+            self._dead[i] = world.hero.is_dead
+            self._win[i] = world.game_state == "win"
+
+    def _observe(self):
+        obs = self.observations
+        rows = []
+        for world in self.worlds:
+            hero = world.hero
+            x, y = hero.actor.pos
+            rows.append((x, y, hero.vel_y, hero.on_ground, hero.health, hero.direction,
+                         hero.is_attacking, world.score / (world.score_to_win or 1)))
+        heroes = np.array(rows)
+        hero_x, hero_y = heroes[:, 0], heroes[:, 1]
+        obs[:, :self.HERO_FEATURES] = heroes / self._scale
+
+        # nearest living enemies of each instance, in one pass over the pool
+        obs[:, self.HERO_FEATURES:] = 0
+        pool = self.pool
+        count = pool.count
+        if count:
+            owner = pool.owner[:count]
+            dx = pool.x[:count] - hero_x[owner]
+            dy = pool.y[:count] - hero_y[owner]
+            alive = np.flatnonzero(~pool.is_dead[:count])
+            order = alive[np.lexsort((np.abs(dx[alive]), owner[alive]))]
+            owners = owner[order]
+            rank = np.arange(len(order)) - np.searchsorted(owners, owners)
+            keep = rank < self.OBS_ENEMIES
+            order, owners, rank = order[keep], owners[keep], rank[keep]
+            column = self.HERO_FEATURES + 3 * rank
+            obs[owners, column] = dx[order] / 800
+            obs[owners, column + 1] = dy[order] / 600
+            obs[owners, column + 2] = 1.0
+        return obs
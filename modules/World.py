@@ -0,0 +1,351 @@
+# -*- coding: utf-8 -*-
+# type: ignore
+# modules/World.py
+import hashlib
+import random
+
+from modules.Enemy import Enemy
+from modules.EnemyPool import EnemyPool
+from modules.Hero import Hero
+from modules.Level import DEFAULT_LEVEL, LevelFile, LevelStreamer
+from modules.Platform import Platform
+from modules.Profiler import profiler
+from modules.Snapshot import Snapshot
+from modules.SpatialHash import SpatialHash
+from modules.Sweep import moved, sweep, swept_rect
+
+
+class World:
+    """The game simulation: hero, enemies, projectiles, score and game state.
+
+    The world never touches ``screen``; ``step`` advances it by exactly one
+    fixed timestep, and rendering reads its attributes afterwards. This is
+    what main.py drives under the window and what the headless runner drives
+    without one. All movement is scaled by the timestep, so the tick rate can
+    be changed without changing gameplay speed.
+
+    Platforms and enemies come from a chunked level file (see modules.Level).
+    Only the chunks within ``ACTIVE_RADIUS`` of the hero are in the world;
+    the next ones are read ahead on a background thread. Which chunks are
+    active depends only on the hero's position, so runs stay reproducible.
+    Enemies killed in a chunk stay dead when the chunk comes back.
+
+    Within the active chunks, enemies more than ``WAKE_DISTANCE`` from the
+    hero sleep (see EnemyPool): nothing off screen pays for AI or physics.
+
+    Given the same ``seed`` and the same Controls and commands tick by tick,
+    two worlds end in the same state; ``state_hash`` checks that (see
+    modules.Replay). ``snapshot`` saves that state in one buffer and
+    ``restore`` puts it back in place (see modules.Snapshot); ``reset``
+    restores the one ``checkpoint`` took when the world was made.
+
+    Several worlds can share one EnemyPool (``enemy_pool``): ``step`` is
+    then split in ``begin_step`` (hero), one pool update for all of them,
+    and ``end_step`` (collisions, score), as modules.VecEnv does.
+    """
+
+    TIMESTEP = 1 / 60  # seconds per simulation tick
+    WIDTH = 800
+    ACTIVE_RADIUS = 1  # chunks kept on each side of the hero's chunk
+    PREFETCH_RADIUS = 2  # chunks read ahead on each side
+    WAKE_DISTANCE = 800  # enemies farther than this from the hero sleep
+
+    COMMANDS = ("start", "menu")  # see command()
+
+    def __init__(self, timestep=TIMESTEP, level_path=DEFAULT_LEVEL, seed=None, enemy_pool=None):
+        self.timestep = timestep
+        self.frame = 0
+        self.level_path = level_path
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+
+        self.score = 0  # System score
+        self.game_state = "menu"  # menu, playing, gameover, win
+        self.gameover_timer = 0  # Counter for game over delay
+
+        self.hero = Hero(40, 400)
+
+        self.level = LevelFile(level_path)
+        self.width = self.level.width
+        self.ground_y = self.level.ground_y
+        # the hero's y is its center: stand it on the level's ground line
+        self.hero.ground_y = self.ground_y - self.hero.actor.height / 2
+        self.streamer = LevelStreamer(self.level)
+        self.chunks = {}  # active chunk index -> (Chunk, platforms, [(spawn, enemy)])
+        self.defeated = set()  # (chunk index, spawn number) of enemies killed
+        self._center_chunk = None
+
+        # Platforms of the active chunks. Broad phase: platforms are
+        # inserted as chunks arrive, enemies are re-bucketed as they move.
+        self.platform_data = []
+        self.platforms = []
+        self.platform_grid = SpatialHash()
+        self.enemy_grid = SpatialHash()
+
+        # every enemy is a slot of this pool; self.enemies holds their views
+        if enemy_pool is None:
+            self.enemy_pool = EnemyPool(seed=self.seed)
+            self.owner = 0
+        else:
+            self.enemy_pool = enemy_pool  # shared with other worlds
+            self.owner = enemy_pool.add_owner(self.seed)
+        self.enemy_pool.wake_distance = self.WAKE_DISTANCE
+        self.enemies = []
+        self.stream(self.hero.actor.x)
+        self.score_to_win = self.level.enemy_count  # Needed score to win
+        self.checkpoint()
+
+    def reset_hero(self):
+        """Reset hero position and state."""
+        hero = self.hero
+        hero.actor.x = 40
+        hero.actor.y = 400
+        hero.prev_pos = hero.actor.pos  # teleport, don't interpolate
+        hero.vel_y = 0
+        if hero.is_dead:
+            hero.animation.play("idle")
+        hero.is_dead = False
+        hero.health = 100
+
+    def reset(self):
+        """Start the level over from the checkpoint, playing."""
+        self.restore(self._checkpoint)
+        self.game_state = "playing"
+
+    def restart_level(self):
+        """Put the hero, enemies and chunks back as the checkpoint has them, in place.
+
+        Every spawn comes back (``defeated`` is the checkpoint's), so the
+        next round can reach ``score_to_win`` again. The score, frame count
+        and damage taken stay, for the win screen and balancing stats.
+        """
+        kept = self.score, self.frame, self.hero.damage_taken, self.game_state
+        self.restore(self._checkpoint)
+        self.score, self.frame, self.hero.damage_taken, self.game_state = kept
+
+    def snapshot(self):
+        """The whole simulation state as bytes, for ``restore``."""
+        return Snapshot.take(self)
+
+    def restore(self, data):
+        """Go back to a ``snapshot``, reusing the enemies and projectiles in place."""
+        Snapshot.restore(self, data)
+
+    def checkpoint(self):
+        """Make the current state the one ``reset`` goes back to."""
+        self._checkpoint = self.snapshot()
+
+    def command(self, name):
+        """Apply a menu command between two steps: "start" or "menu".
+
+        These are the only changes made to the world outside ``step``, so a
+        recording of the Controls and commands replays a whole session.
+        """
+        if name == "start":
+            self.game_state = "playing"
+        elif name == "menu":
+            if self.game_state == "gameover":
+                self.hero.health = 100
+                self.hero.is_dead = False
+                self.gameover_timer = 0
+            elif self.game_state == "win":
+                self.score = 0
+            self.game_state = "menu"
+        else:
+            raise ValueError("unknown command %r" % name)
+
+    def state_hash(self):
+        """Hex digest of the simulation state (hero, projectiles, enemies, score)."""
+        hero = self.hero
+        animation = hero.animation
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(repr((
+            # as floats: 0 and 0.0 are the same state (see modules.Snapshot)
+            self.frame, self.score, self.game_state, float(self.gameover_timer),
+            hero.actor.pos, float(hero.vel_y), hero.on_ground, hero.health, hero.direction,
+            hero.is_dead, hero.is_attacking, hero._has_shot,
+            animation.name, animation.frame, animation.timer,
+            [(proj.x, proj.rect.y, proj.direction) for proj in hero.projectiles],
+            sorted(self.chunks), sorted(self.defeated),
+        )).encode())
+        pool = self.enemy_pool
+        slots = [enemy.index for enemy in self.enemies]  # this world's, in its order
+        for name in pool.FIELDS:
+            if name != "owner":
+                digest.update(getattr(pool, name)[slots].tobytes())
+        return digest.hexdigest()
+
+    # -------------------------------
+    # LEVEL STREAMING
+    # -------------------------------
+    def stream(self, x):
+        """Bring the chunks around world x in and drop the far ones."""
+        center = self.level.chunk_at(x)
+        if center == self._center_chunk:
+            return
+        self._center_chunk = center
+
+        active = range(center - self.ACTIVE_RADIUS, center + self.ACTIVE_RADIUS + 1)
+        wanted = range(center - self.PREFETCH_RADIUS, center + self.PREFETCH_RADIUS + 1)
+        for i in [i for i in self.chunks if i not in active]:
+            self.unload_chunk(i)
+        for i in active:
+            if 0 <= i < len(self.level) and i not in self.chunks:
+                self.load_chunk(i)
+        self.streamer.prefetch(wanted)
+        self.streamer.forget(wanted)
+
+    def load_chunk(self, i):
+        """Add the platforms and surviving enemies of chunk ``i``."""
+        chunk = self.streamer.get(i)
+        platforms = []
+        for x, y, width, height in chunk.platforms:
+            plat = Platform(x, y, width, height)
+            platforms.append(plat)
+            self.platform_data.append(plat)
+            self.platforms.append(plat.rect)
+            self.platform_grid.insert(plat.rect, plat.rect)
+        self.chunks[i] = (chunk, platforms, [])
+        self._spawn_chunk_enemies(i)
+
+    def unload_chunk(self, i):
+        """Remove chunk ``i``'s platforms and enemies from the world."""
+        chunk, platforms, enemies = self.chunks.pop(i)
+        for plat in platforms:
+            self.platform_data.remove(plat)
+            self.platforms.remove(plat.rect)
+            self.platform_grid.remove(plat.rect)
+        for spawn, enemy in enemies:
+            self.remove_enemy(enemy)
+
+    def _spawn_chunk_enemies(self, i):
+        for n in range(len(self.chunks[i][0].spawns)):
+            if (i, n) not in self.defeated:
+                self._spawn_chunk_enemy(i, n)
+
+    def _spawn_chunk_enemy(self, i, n):
+        chunk, _, enemies = self.chunks[i]
+        x, y, patrol_min, patrol_max = chunk.spawns[n]
+        enemy = Enemy(x, y, patrol_width=0, pool=self.enemy_pool, owner=self.owner)
+        enemy.patrol_min_x = patrol_min
+        enemy.patrol_max_x = patrol_max
+        enemy.ground_y = y
+        enemy.spawn = (i, n)
+        enemies.append(((i, n), self.add_enemy(enemy)))
+        return enemy
+
+    def spawn_all_enemies(self):
+        """Respawn every enemy of the level: the active chunks now, the others when loaded."""
+        for enemy in self.enemies:
+            self.enemy_pool.remove(enemy.index)  # only this world's, if the pool is shared
+        self.enemies = []
+        self.enemy_grid.clear()
+        self.defeated.clear()
+        for i in self.chunks:
+            self.chunks[i][2].clear()
+            self._spawn_chunk_enemies(i)
+
+    # -------------------------------
+    # ENEMIES
+    # -------------------------------
+    def spawn_enemy(self, x, y, patrol_width=200):
+        """Create an enemy in the world's pool and return it."""
+        return self.add_enemy(Enemy(x, y, patrol_width, pool=self.enemy_pool, owner=self.owner))
+
+    def add_enemy(self, enemy):
+        """Add an enemy of this world's pool and register it in the broad phase."""
+        self.enemies.append(enemy)
+        self.enemy_grid.insert(enemy, self.enemy_pool.bounds(enemy.index))
+        return enemy
+
+    def remove_enemy(self, enemy):
+        """Take an enemy out of the world, remembering it if it was killed."""
+        if enemy.spawn is not None and enemy.is_dead:
+            self.defeated.add(enemy.spawn)
+        self.enemies.remove(enemy)
+        self.enemy_grid.remove(enemy)
+        self.enemy_pool.remove(enemy.index)
+
+    def step(self, controls):
+        """Advance the simulation by one timestep using the given Controls.
+
+        Sounds triggered during the step are left in ``hero.sound_events``
+        for the caller to play; they are cleared at the start of each step.
+        """
+        if self.begin_step(controls):
+            with profiler.scope("enemies.update"):
+                self.enemy_pool.update(self.timestep, self.hero)
+                self.enemy_pool.update_grid(self.enemy_grid)
+            self.end_step()
+
+    def begin_step(self, controls):
+        """First part of ``step``: the hero moves. Returns True if the game is playing.
+
+        While playing, the enemies must be updated next, then ``end_step``
+        called.
+        """
+        dt = self.timestep
+        self.frame += 1
+        hero = self.hero
+        hero.sound_events.clear()
+
+        if self.game_state == "playing":
+            with profiler.scope("level.stream"):
+                self.stream(hero.actor.x)
+            with profiler.scope("hero.update"):
+                hero.update(dt, self.platform_grid, self.width, controls)
+            return True
+        return False
+
+    def end_step(self):
+        """Last part of a playing ``step``: death delay, projectile hits, score."""
+        hero = self.hero
+        if hero.is_dead:
+            self.gameover_timer += self.timestep
+            if self.gameover_timer >= 1:  # 1s delay
+                self.game_state = "gameover"
+
+        with profiler.scope("collisions"):
+            for proj in hero.projectiles:
+                if not proj.alive:
+                    continue
+                enemy = self.projectile_hit(proj)
+                if enemy is None:
+                    continue
+                enemy.take_damage(10)
+                proj.alive = False
+
+                # Increment the score when enemy is dead
+                if enemy.is_dead:
+                    self.score += 1
+
+                    # Verify if player won
+                    if self.score >= self.score_to_win:
+                        self.game_state = "win"
+
+        # leaving "playing": set the next round up once, not every tick of the screen
+        if self.game_state == "gameover":
+            self.reset_hero()
+        elif self.game_state == "win":
+            self.restart_level()
+
+    def projectile_hit(self, proj):
+        """The first living enemy ``proj`` met during the tick, or None.
+
+        The projectile's move is swept against each enemy's, relative to
+        the enemy (see modules.Sweep), so neither can skip past the other
+        between two ticks.
+        """
+        rect = proj.rect
+        dx = proj.x - proj.prev_x
+        start = (proj.prev_x, rect.top, proj.prev_x + rect.width, rect.bottom)
+        pool = self.enemy_pool
+        best = None
+        for enemy in self.enemy_grid.query(swept_rect(start, dx, 0)):
+            if enemy.is_dead:
+                continue
+            i = enemy.index
+            moved_x, moved_y = pool.x[i] - pool.prev_x[i], pool.y[i] - pool.prev_y[i]
+            hit = sweep(moved(start, moved_x, moved_y), dx - moved_x, -moved_y, pool.box(i))
+            if hit is not None and (best is None or hit[0] < best[0]):
+                best = (hit[0], enemy)
+        return best[1] if best else None
@@ -0,0 +1,14 @@
+# -*- coding: utf-8 -*-
+# type: ignore
+# tests/conftest.py
+"""Prepare pygame and the loaders without a window before the game modules are imported."""
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from modules.Headless import setup  # noqa: E402
+
+setup(ROOT)
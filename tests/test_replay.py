@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+# type: ignore
+# tests/test_replay.py
+"""A recorded session replays to the same end state (see modules.Replay)."""
+from modules.Headless import random_policy
+from modules.Input import NO_INPUT, Controls
+from modules.Replay import InputRecorder, Replay
+from modules.World import World
+
+SEED = 7
+
+
+def replayed(recorder, path):
+    """Save ``recorder``, load it back and return ``(live hash, replayed world)``."""
+    recorder.save(path)
+    recording = Replay.load(path)
+    matches, world = recording.verify()
+    assert recording.state_hash == recorder.world.state_hash()
+    return matches, world
+
+
+def command(world, recorder, name):
+    world.command(name)
+    recorder.command(name)
+
+
+def test_random_session_replays(tmp_path):
+    world = World(seed=SEED)
+    recorder = InputRecorder(world)
+    command(world, recorder, "start")
+    policy = random_policy(SEED)
+    for frame in range(3000):
+        controls = policy(world)
+        recorder.record(controls)
+        world.step(controls)
+        if world.game_state in ("gameover", "win") and frame % 50 == 0:
+            command(world, recorder, "menu")
+            command(world, recorder, "start")
+
+    matches, replay = replayed(recorder, str(tmp_path / "random.rpl"))
+    assert matches
+    assert replay.frame == world.frame
+
+
+def test_menu_then_start_in_one_tick(tmp_path):
+    world = World(seed=SEED)
+    recorder = InputRecorder(world)
+    command(world, recorder, "start")
+    for _ in range(10):
+        recorder.record(NO_INPUT)
+        world.step(NO_INPUT)
+    command(world, recorder, "menu")
+    command(world, recorder, "start")
+    right = Controls(right=True)
+    for _ in range(30):
+        recorder.record(right)
+        world.step(right)
+    command(world, recorder, "menu")  # after the last tick, then back in
+    command(world, recorder, "start")
+    assert world.game_state == "playing"
+
+    matches, replay = replayed(recorder, str(tmp_path / "order.rpl"))
+    assert matches
+    assert replay.game_state == "playing"
+    assert replay.hero.actor.x == world.hero.actor.x
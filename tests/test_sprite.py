@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+# type: ignore
+# tests/test_sprite.py
+"""The native sprite flip gives the same pixels as the old per-pixel loop."""
+import glob
+import os
+
+import pygame
+import pytest
+from pgzero.builtins import images
+
+from modules.Sprite import SpriteManager
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def legacy_flip(surface):
+    """The original SpriteManager loop: one get_at/set_at per pixel."""
+    width = surface.get_width()
+    height = surface.get_height()
+    flipped_surface = surface.copy()
+    for x in range(width):
+        for y in range(height):
+            mirrored_x = width - 1 - x
+            color = surface.get_at((mirrored_x, y))
+            flipped_surface.set_at((x, y), color)
+    return flipped_surface
+
+
+def frame_names():
+    paths = glob.glob(os.path.join(ROOT, "images", "hero_*.png"))
+    paths += glob.glob(os.path.join(ROOT, "images", "enemy_*.png"))
+    return sorted(os.path.splitext(os.path.basename(p))[0] for p in paths)
+
+
+FRAMES = frame_names()
+
+
+def test_every_frame_is_flipped():
+    flipped = SpriteManager.preload_flipped_frames(FRAMES)
+    assert FRAMES and sorted(flipped) == FRAMES
+
+
+@pytest.mark.parametrize("name", FRAMES)
+def test_flip_matches_the_per_pixel_loop(name):
+    surface = images.load(name)
+    flipped = SpriteManager.preload_flipped_frames([name])[name]
+    assert flipped.get_size() == surface.get_size()
+    old = pygame.image.tobytes(legacy_flip(surface), "RGBA")
+    assert pygame.image.tobytes(flipped, "RGBA") == old
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+# type: ignore
+# tests/test_sweep.py
+"""Swept collisions hold at every speed and tick rate (see modules.Sweep).
+
+One case per (speed, tick rate): a landing hero stops on the platform's
+top, a jumping hero stops under its bottom, and a projectile hits the
+enemy in its way. ``benchmarks/bench_sweep.py`` plays the same cases
+against the old discrete checks and times both.
+"""
+import pytest
+from pygame import Rect
+
+from modules.Hero import Hero
+from modules.World import World
+
+TICK_RATES = [240, 120, 60, 30, 20, 15, 10]
+FALL_SPEEDS = [0, 600, 1200, 2400, 4800]  # px/s, downward
+JUMP_SPEEDS = [600, 900, 1500, 2400, 4800]  # px/s, upward
+PROJECTILE_SPEEDS = [300, 600, 1200, 2400, 4800, 9600]  # px/s
+PLATFORM = Rect(0, 300, 400, 20)
+
+
+@pytest.fixture(scope="module")
+def world():
+    world = World(seed=0)
+    enemy = world.enemies[0]
+    world.enemy_pool.prev_x[enemy.index] = enemy.x  # standing still
+    world.enemy_pool.prev_y[enemy.index] = enemy.y
+    return world
+
+
+@pytest.mark.parametrize("rate", TICK_RATES)
+@pytest.mark.parametrize("speed", FALL_SPEEDS)
+def test_landing(speed, rate):
+    hero = Hero(200, 0)
+    hero.actor.bottom = PLATFORM.top - 150
+    hero.vel_y = speed
+    for _ in range(rate * 3):
+        hero.apply_gravity([PLATFORM], 1 / rate)
+        if hero.on_ground:
+            break
+    assert hero.actor.bottom == PLATFORM.top
+
+
+@pytest.mark.parametrize("rate", TICK_RATES)
+@pytest.mark.parametrize("speed", JUMP_SPEEDS)
+def test_head_bump(speed, rate):
+    hero = Hero(200, 0)
+    hero.actor.top = PLATFORM.bottom + 40
+    hero.vel_y = -speed
+    for _ in range(rate * 3):
+        hero.apply_gravity([PLATFORM], 1 / rate)
+        assert hero.actor.bottom > PLATFORM.top, "went through the platform"
+        if hero.on_ground:
+            break
+
+
+@pytest.mark.parametrize("rate", TICK_RATES)
+@pytest.mark.parametrize("speed", PROJECTILE_SPEEDS)
+def test_projectile_hits(world, speed, rate):
+    enemy = world.enemies[0]
+    x, y = enemy.x, enemy.y
+    proj = world.hero.projectiles.spawn(x - 300, y, 1, speed)
+    try:
+        for _ in range(rate * 3):
+            proj.update(x + 600, 1 / rate, x - 600)
+            assert proj.alive, "expired before reaching the enemy"
+            if world.projectile_hit(proj) is enemy:
+                return
+        pytest.fail("never hit the enemy")
+    finally:
+        world.hero.projectiles.clear()
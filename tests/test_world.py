@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+# type: ignore
+# tests/test_world.py
+"""World rules that span level chunks and game states."""
+import pytest
+
+from modules.Input import NO_INPUT
+from modules.Level import LevelFile, generate_level
+from modules.World import World
+
+
+@pytest.fixture
+def level(tmp_path):
+    path = str(tmp_path / "five.lvl")
+    generate_level(path, 5, seed=1)
+    return path
+
+
+def clear_level(world):
+    """Walk the hero through the chunks and shoot each living enemy once, until a win.
+
+    Each enemy is left with the health of one hit and a still projectile
+    is put on it, so ``end_step`` scores the kill as a normal hit would.
+    """
+    hero = world.hero
+    for chunk in range(len(world.level)):
+        if world.game_state != "playing":
+            return
+        hero.actor.x = (chunk + 0.5) * world.level.chunk_width
+        world.stream(hero.actor.x)
+        for enemy in list(world.enemies):
+            if enemy.is_dead or world.game_state != "playing":
+                continue
+            enemy.health = 10
+            hero.projectiles.spawn(enemy.x - 5, enemy.y - 2, 1, speed=0)
+            world.end_step()
+            hero.projectiles.clear()
+
+
+def test_level_can_be_won_again_after_a_win(level):
+    world = World(level_path=level, seed=1)
+    assert len(world.level) > 1 + 2 * world.ACTIVE_RADIUS  # some chunks unload on the way
+
+    start_count = world.enemy_pool.count
+    world.command("start")
+    clear_level(world)
+    assert world.game_state == "win"
+    assert world.score == world.score_to_win
+    # the start chunks restored in place, not every spawn made again on top
+    assert world.enemy_pool.count == start_count
+
+    world.command("menu")
+    world.command("start")
+    world.step(NO_INPUT)
+    assert world.score == 0
+    assert world.enemy_pool.count == start_count
+    clear_level(world)
+    assert world.game_state == "win"
+    assert world.score == world.score_to_win
+
+
+def test_hero_stands_on_the_level_ground(tmp_path):
+    path = str(tmp_path / "low.lvl")
+    LevelFile.write(path, 1600, 400, [], [])
+    world = World(level_path=path, seed=1)
+    world.command("start")
+    for _ in range(120):
+        world.step(NO_INPUT)
+    assert world.hero.on_ground
+    assert world.hero.actor.bottom == world.ground_y == 400
+
+
+def test_win_near_the_start_reuses_the_enemies():
+    world = World(seed=1)
+    world.command("start")
+    views = list(world.enemies)
+    count = world.enemy_pool.count
+    world.score_to_win = 1
+    clear_level(world)
+    assert world.game_state == "win"
+    assert world.enemies == views  # same objects, revived in their slots
+    assert not any(enemy.is_dead for enemy in world.enemies)
+    assert world.enemy_pool.count == count